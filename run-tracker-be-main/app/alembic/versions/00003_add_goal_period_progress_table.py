@@ -0,0 +1,92 @@
+"""add goal period progress table
+
+Revision ID: 00003
+Revises: 00002
+Create Date: 2026-10-19 10:12:31.518204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "00003"
+down_revision: Union[str, Sequence[str], None] = "00002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "goal_period_progress",
+        sa.Column("goal_uuid", sa.Uuid(), nullable=False),
+        sa.Column("user_uuid", sa.Uuid(), nullable=False),
+        sa.Column(
+            "time_period",
+            postgresql.ENUM(
+                "WEEKLY", "MONTHLY", "YEARLY", name="timeperiod", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "period",
+            sa.String(length=20),
+            nullable=False,
+            comment="Period identifier e.g. 2025-W48, 2025-M11, 2025",
+        ),
+        sa.Column("period_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("period_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "value",
+            sa.Float(),
+            nullable=False,
+            comment="Accumulated distance in km, duration in minutes, or number of runs",
+        ),
+        sa.Column("target", sa.Integer(), nullable=False),
+        sa.Column("is_met", sa.Boolean(), nullable=False),
+        sa.Column("is_closed", sa.Boolean(), nullable=False),
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["goal_uuid"], ["goals.uuid"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_uuid"], ["users.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("uuid"),
+        sa.UniqueConstraint(
+            "goal_uuid", "period_start", name="uq_goal_period_progress_goal_period"
+        ),
+    )
+    op.create_index(
+        op.f("ix_goal_period_progress_created_at"),
+        "goal_period_progress",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_goal_period_progress_user_uuid"),
+        "goal_period_progress",
+        ["user_uuid"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_goal_period_progress_user_uuid"), table_name="goal_period_progress"
+    )
+    op.drop_index(
+        op.f("ix_goal_period_progress_created_at"), table_name="goal_period_progress"
+    )
+    op.drop_table("goal_period_progress")
@@ -0,0 +1,78 @@
+"""add composite indexes
+
+Revision ID: 00004
+Revises: 00003
+Create Date: 2026-10-19 16:40:12.804531
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "00004"
+down_revision: Union[str, Sequence[str], None] = "00003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Replaces ix_runs_user_uuid, which is a prefix of the new index
+    op.create_index(
+        "ix_runs_user_uuid_start_time",
+        "runs",
+        ["user_uuid", "start_time"],
+        unique=False,
+        postgresql_include=["distance", "duration"],
+    )
+    op.drop_index(op.f("ix_runs_user_uuid"), table_name="runs")
+
+    op.create_index(
+        "ix_goals_user_uuid_active",
+        "goals",
+        ["user_uuid"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+    # Concurrent runs could award the same goal completion twice, keep the first
+    op.execute(
+        """
+        DELETE FROM achievements AS a
+        USING achievements AS b
+        WHERE a.achievement_type = 'GOAL_COMPLETION'
+          AND b.achievement_type = 'GOAL_COMPLETION'
+          AND a.user_uuid = b.user_uuid
+          AND a.meta_data ->> 'goal_id' = b.meta_data ->> 'goal_id'
+          AND a.meta_data ->> 'period' = b.meta_data ->> 'period'
+          AND (a.earned_at, a.uuid) > (b.earned_at, b.uuid)
+        """
+    )
+    op.create_index(
+        "uq_achievements_goal_period",
+        "achievements",
+        [
+            "user_uuid",
+            sa.text("(meta_data ->> 'goal_id')"),
+            sa.text("(meta_data ->> 'period')"),
+        ],
+        unique=True,
+        postgresql_where=sa.text("achievement_type = 'GOAL_COMPLETION'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_achievements_goal_period",
+        table_name="achievements",
+        postgresql_where=sa.text("achievement_type = 'GOAL_COMPLETION'"),
+    )
+    op.drop_index(
+        "ix_goals_user_uuid_active",
+        table_name="goals",
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(op.f("ix_runs_user_uuid"), "runs", ["user_uuid"], unique=False)
+    op.drop_index("ix_runs_user_uuid_start_time", table_name="runs")
@@ -0,0 +1,43 @@
+"""add revoked tokens table
+
+Revision ID: 00005
+Revises: 00004
+Create Date: 2026-10-19 09:59:07.569587
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "00005"
+down_revision: Union[str, Sequence[str], None] = "00004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_tokens",
+        sa.Column(
+            "expires_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="Expiry of the token, the row can be deleted after it",
+        ),
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint("uuid"),
+    )
+    op.create_index(
+        op.f("ix_revoked_tokens_expires_at"),
+        "revoked_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_revoked_tokens_expires_at"), table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
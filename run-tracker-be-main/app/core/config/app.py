@@ -1,6 +1,7 @@
-from typing import Annotated
+from typing import Annotated, Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import NoDecode
 
 from app.core.config.base import BaseConfig
@@ -12,7 +13,43 @@ class AppBaseConfig(BaseConfig):
     PORT: int = 8000
     RELOAD: bool = True
     ALLOWED_ORIGINS: Annotated[list[str], NoDecode] = []
+    # Reverse proxies (IPs or networks) whose X-Forwarded-For names the client
+    TRUSTED_PROXIES: Annotated[list[str], NoDecode] = []
+    # Zone in which goal and leaderboard periods start, e.g. weeks on Monday
+    # 00:00, also the time zone of the database sessions
+    TIME_ZONE: str = "UTC"
+    # Sends the request timings in a Server-Timing header, for development only
+    SERVER_TIMING: bool = False
+    # "warn" in development, "raise" in tests and CI
+    QUERY_BUDGET_MODE: Literal["off", "warn", "raise"] = "off"
+    QUERY_BUDGET_MAX_REPEATS: int = 3
+    # Bytes buffered before the log file is written to, 1 writes every line
+    LOG_BUFFER_BYTES: int = 64 * 1024
+    # Share of INFO records kept, e.g. 0.1 logs every tenth request
+    LOG_INFO_SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0)
+    # Bearer token of /api/metrics and the diagnostic health checks, which are
+    # closed while it is empty
+    DIAGNOSTICS_TOKEN: str = ""
+    # Requests sending PROFILING_TOKEN in X-Profile-Token are run under cProfile
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""
+    PROFILING_DIR: str = "profiles"
 
-    @field_validator("ALLOWED_ORIGINS", mode="before")
-    def parse_allowed_origins(cls, value: str) -> list[str]:
-        return value.split(",")
+    @field_validator("ALLOWED_ORIGINS", "TRUSTED_PROXIES", mode="before")
+    def parse_comma_separated(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            return [item for item in value.split(",") if item]
+        return value
+
+    @field_validator("TIME_ZONE")
+    def validate_time_zone(cls, value: str) -> str:
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone: {value}")
+        return value
+
+    @property
+    def zone(self) -> ZoneInfo:
+        """The configured time zone."""
+        return ZoneInfo(self.TIME_ZONE)
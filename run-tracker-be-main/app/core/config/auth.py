@@ -6,6 +6,22 @@ class AuthBaseConfig(BaseConfig):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    # Token buckets for auth requests per client IP, and for failed sign-ins per
+    # email and client IP
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "app.core.rate_limit.InMemoryRateLimitBackend"
+    RATE_LIMIT_IP_BURST: int = 20
+    RATE_LIMIT_IP_PER_MINUTE: int = 30
+    RATE_LIMIT_EMAIL_BURST: int = 5
+    RATE_LIMIT_EMAIL_PER_MINUTE: int = 5
+    # Let read-only endpoints trust the "sub" claim without loading the user
+    TRUST_TOKEN_CLAIMS: bool = False
 
     class Config:
         env_prefix = "AUTH_"
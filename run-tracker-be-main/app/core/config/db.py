@@ -1,3 +1,8 @@
+from typing import Annotated
+
+from pydantic import field_validator
+from pydantic_settings import NoDecode
+
 from app.core.config.base import BaseConfig
 
 
@@ -8,6 +13,46 @@ class DBConfig(BaseConfig):
     PORT: int = 5432
     DB: str = "postgres"
 
+    # Connect through PgBouncer in transaction pooling mode: no local pool and
+    # no reuse of prepared statements, the pool settings below are ignored
+    PGBOUNCER: bool = False
+
+    # Connections kept per engine, i.e. per worker process and database
+    POOL_SIZE: int = 20
+    MAX_OVERFLOW: int = 0
+    # Seconds to wait for a connection before failing the request
+    POOL_TIMEOUT: float = 30.0
+    POOL_RECYCLE: int = 300
+    # Ping on every checkout; by default only idle connections are pinged
+    POOL_PRE_PING: bool = False
+    POOL_PING_AFTER_IDLE_SECONDS: float = 10.0
+
+    # Compiled SQL strings kept by SQLAlchemy, per engine
+    QUERY_CACHE_SIZE: int = 500
+    # Prepared statements kept by asyncpg, per connection
+    PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Statements slower than this are logged, 0 turns the log off
+    SLOW_QUERY_SECONDS: float = 0.5
+    # Also log plans of slow SELECTs, they are run again with EXPLAIN ANALYZE
+    SLOW_QUERY_EXPLAIN: bool = False
+    # Seconds before the plan of the same statement is captured again
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = 300.0
+
+    # Comma separated SQLAlchemy URLs of read replicas used by read-only endpoints
+    REPLICA_URLS: Annotated[list[str], NoDecode] = []
+    # Seconds a replica that failed to connect is skipped
+    REPLICA_RETRY_SECONDS: float = 10.0
+    # Seconds after a client's write during which its reads only use replicas
+    # that have replayed the write
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    @field_validator("REPLICA_URLS", mode="before")
+    def parse_replica_urls(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, list):
+            return value
+        return [url.strip() for url in value.split(",") if url.strip()]
+
     @property
     def url(self) -> str:
         """Constructs the SQLAlchemy URL using the database configuration."""
@@ -0,0 +1,23 @@
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from app.core.read_your_writes import WalFence
+    from app.core.timing import RequestTimings
+
+# Authenticated user of the request being handled, set by the auth dependencies
+request_user_uuid: ContextVar[UUID | None] = ContextVar(
+    "request_user_uuid", default=None
+)
+
+# Timings of the request being handled, set by ServerTimingMiddleware
+request_timings: ContextVar["RequestTimings | None"] = ContextVar(
+    "request_timings", default=None
+)
+
+# WAL positions the reads of the request have to see, set by
+# ReadYourWritesMiddleware
+request_wal_fence: ContextVar["WalFence | None"] = ContextVar(
+    "request_wal_fence", default=None
+)
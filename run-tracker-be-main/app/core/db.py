@@ -1,15 +1,113 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core.pool import InstrumentedPool, add_liveness_check
+from app.core.query_budget import add_query_budget_check
+from app.core.slow_queries import add_slow_query_log
+from app.core.timing import add_query_timing
+
+
+def _get_pool_args(name: str) -> dict[str, Any]:
+    if settings.db.PGBOUNCER:
+        # PgBouncer pools the server connections, holding idle ones here too
+        # would only pin them to this process
+        return {"poolclass": NullPool}
+
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_logging_name": name,
+        "pool_size": settings.db.POOL_SIZE,
+        "max_overflow": settings.db.MAX_OVERFLOW,
+        "pool_timeout": settings.db.POOL_TIMEOUT,
+        "pool_pre_ping": settings.db.POOL_PRE_PING,
+        "pool_recycle": settings.db.POOL_RECYCLE,
+    }
+
+
+def _get_connect_args() -> dict[str, Any]:
+    # date_trunc, date and to_char work in the session time zone
+    server_settings = {"timezone": settings.app.TIME_ZONE}
+    if settings.db.PGBOUNCER:
+        # In transaction mode consecutive transactions may run on different
+        # server connections, so statements prepared on one of them can't be
+        # reused and their names must not collide with other clients' ones
+        return {
+            "server_settings": server_settings,
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "server_settings": server_settings,
+        "prepared_statement_cache_size": settings.db.PREPARED_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        query_cache_size=settings.db.QUERY_CACHE_SIZE,
+        connect_args=_get_connect_args(),
+        **_get_pool_args(name),
+    )
+    if isinstance(engine.sync_engine.pool, InstrumentedPool):
+        add_liveness_check(engine.sync_engine.pool)
+    add_query_timing(engine.sync_engine)
+    add_query_budget_check(engine.sync_engine)
+    add_slow_query_log(engine)
+    return engine
+
+
+class ReplicaSet:
+    """
+    Round-robin over the read replica engines. A replica reported unhealthy is
+    skipped for `retry_after` seconds, after which it is tried again.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], retry_after: float) -> None:
+        self.engines = engines
+        self.retry_after = retry_after
+        self._next = 0
+        self._unhealthy_until: dict[int, float] = {}
+
+    def get_engines(self) -> list[AsyncEngine]:
+        """Returns the healthy replicas, starting with the next one in turn."""
+        if not self.engines:
+            return []
+
+        start = self._next
+        self._next = (self._next + 1) % len(self.engines)
+        now = time.monotonic()
+        return [
+            self.engines[index % len(self.engines)]
+            for index in range(start, start + len(self.engines))
+            if self._unhealthy_until.get(index % len(self.engines), 0) <= now
+        ]
+
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        index = self.engines.index(engine)
+        self._unhealthy_until[index] = time.monotonic() + self.retry_after
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
 
-engine = create_async_engine(
-    settings.db.url,
-    echo=False,
-    future=True,
-    pool_size=20,
-    max_overflow=0,
-    pool_pre_ping=True,
-    pool_recycle=300,
+engine = _create_engine(settings.db.url, "primary")
+replicas = ReplicaSet(
+    [
+        _create_engine(url, f"replica{index}")
+        for index, url in enumerate(settings.db.REPLICA_URLS)
+    ],
+    retry_after=settings.db.REPLICA_RETRY_SECONDS,
 )
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -1,6 +1,8 @@
 from app.core.exc.auth import (
     AuthServiceException,
     InvalidCredentialsException,
+    InvalidDiagnosticsTokenException,
+    PasswordHashQueueFullException,
     UserNotAuthenticatedException,
 )
 from app.core.exc.base import (
@@ -9,17 +11,23 @@ from app.core.exc.base import (
     ObjectAlreadyExistsException,
     ObjectNotFoundException,
     ServerErrorException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
     UnauthorizedException,
 )
 
 __all__ = [
     "AuthServiceException",
     "InvalidCredentialsException",
+    "InvalidDiagnosticsTokenException",
+    "PasswordHashQueueFullException",
     "UserNotAuthenticatedException",
     "BadRequestException",
     "ForbiddenException",
     "ObjectAlreadyExistsException",
     "ObjectNotFoundException",
     "ServerErrorException",
+    "ServiceUnavailableException",
+    "TooManyRequestsException",
     "UnauthorizedException",
 ]
@@ -1,4 +1,8 @@
-from app.core.exc.base import ServerErrorException, UnauthorizedException
+from app.core.exc.base import (
+    ServerErrorException,
+    ServiceUnavailableException,
+    UnauthorizedException,
+)
 
 
 class InvalidCredentialsException(UnauthorizedException):
@@ -13,7 +17,19 @@ class UserNotAuthenticatedException(UnauthorizedException):
         super().__init__(self.message)
 
 
+class InvalidDiagnosticsTokenException(UnauthorizedException):
+    def __init__(self) -> None:
+        self.message = "Invalid diagnostics token"
+        super().__init__(self.message)
+
+
 class AuthServiceException(ServerErrorException):
     def __init__(self) -> None:
         self.message = "Error communicating with authentication service"
         super().__init__(self.message)
+
+
+class PasswordHashQueueFullException(ServiceUnavailableException):
+    def __init__(self) -> None:
+        self.message = "Too many authentication requests, try again later"
+        super().__init__(self.message)
@@ -43,3 +43,16 @@ class ForbiddenException(Exception):
     def __init__(self, message: str) -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class ServiceUnavailableException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+class TooManyRequestsException(Exception):
+    def __init__(self, message: str, retry_after: float) -> None:
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
@@ -1,4 +1,5 @@
 import json
+import math
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
@@ -10,6 +11,8 @@ from app.core.exc.base import (
     ObjectAlreadyExistsException,
     ObjectNotFoundException,
     ServerErrorException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
     UnauthorizedException,
 )
 
@@ -56,3 +59,21 @@ def handle_forbidden(_: Request, e: ForbiddenException) -> JSONResponse:
     return JSONResponse(
         content={"message": str(e)}, status_code=status.HTTP_403_FORBIDDEN
     )
+
+
+def handle_service_unavailable(
+    _: Request, e: ServiceUnavailableException
+) -> JSONResponse:
+    return JSONResponse(
+        content={"message": str(e)},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"},
+    )
+
+
+def handle_too_many_requests(_: Request, e: TooManyRequestsException) -> JSONResponse:
+    return JSONResponse(
+        content={"message": str(e)},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(math.ceil(e.retry_after))},
+    )
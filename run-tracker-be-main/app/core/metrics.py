@@ -0,0 +1,170 @@
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from itertools import accumulate
+
+# Values per label values, as returned by the callback of a metric
+Samples = dict[tuple[str, ...], float]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry: dict[str, "Counter | Gauge | Histogram"] = {}
+
+
+def _register(metric: "Counter | Gauge | Histogram") -> None:
+    if metric.name in registry:
+        raise ValueError(f"Metric {metric.name} is already registered")
+    registry[metric.name] = metric
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing value, optionally split by label values.
+    Updated from the event loop thread only, so it needs no locking. Counts kept
+    elsewhere (e.g. cache hits) are exported by passing a `callback` instead.
+    """
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        callback: Callable[[], Samples] | None = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.callback = callback
+        self.values: dict[tuple[str, ...], float] = defaultdict(float)
+        _register(self)
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] += amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        values = self.callback() if self.callback else self.values
+        for label_values, value in values.items():
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down, like requests in progress, or that is read at
+    scrape time by a `callback`, like the size of a queue.
+    """
+
+    type = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] -= amount
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = value
+
+
+class Histogram:
+    """
+    Distribution of observed values (e.g. durations in seconds) over fixed
+    buckets, optionally split by label values. Updated from the event loop
+    thread only, so it needs no locking.
+    """
+
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: observations per bucket, the last one is +Inf
+        self.counts: dict[tuple[str, ...], list[int]] = {}
+        self.sums: dict[tuple[str, ...], float] = defaultdict(float)
+        _register(self)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts = self.counts.get(label_values)
+        if counts is None:
+            counts = self.counts[label_values] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[label_values] += value
+
+    def count(self, *label_values: str) -> int:
+        return sum(self.counts.get(label_values, ()))
+
+    def sum(self, *label_values: str) -> float:
+        return self.sums.get(label_values, 0.0)
+
+    def cumulative(self, *label_values: str) -> list[tuple[float, int]]:
+        """Returns (upper bound, observations <= bound) pairs, ending with +Inf."""
+        counts = self.counts.get(label_values, [0] * (len(self.buckets) + 1))
+        return list(zip((*self.buckets, float("inf")), accumulate(counts)))
+
+    def samples(self) -> Iterator[str]:
+        bucket_labels = (*self.labels, "le")
+        for label_values in list(self.counts):
+            count = 0
+            for bound, count in self.cumulative(*label_values):
+                labels = _format_labels(
+                    bucket_labels, (*label_values, _format_value(bound))
+                )
+                yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(self.sum(*label_values))}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def render_metrics() -> str:
+    """Renders all registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in registry.values():
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
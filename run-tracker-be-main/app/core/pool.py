@@ -0,0 +1,133 @@
+import time
+from typing import Any
+from weakref import WeakValueDictionary
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+)
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram, Samples
+
+pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    labels=("pool",),
+)
+pool_timeouts = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT seconds",
+    labels=("pool",),
+)
+pool_invalidated = Counter(
+    "db_pool_invalidated_total",
+    "Pooled connections found dead at checkout and replaced",
+    labels=("pool",),
+)
+
+# Current pool of each engine by name, a disposed engine replaces its pool
+_pools: "WeakValueDictionary[str, InstrumentedPool]" = WeakValueDictionary()
+
+
+def _get_pool_connections() -> Samples:
+    samples = {}
+    for pool in list(_pools.values()):
+        samples[(pool.name, "in_use")] = pool.checkedout()
+        samples[(pool.name, "idle")] = pool.checkedin()
+        samples[(pool.name, "overflow")] = max(pool.overflow(), 0)
+    return samples
+
+
+pool_connections = Gauge(
+    "db_pool_connections",
+    "Pooled database connections by state",
+    labels=("pool", "state"),
+    callback=_get_pool_connections,
+)
+pool_size = Gauge(
+    "db_pool_size",
+    "Connections kept open by the pool (DB_POOL_SIZE)",
+    labels=("pool",),
+    callback=lambda: {(pool.name,): pool.size() for pool in list(_pools.values())},
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording checkout wait times and timeouts. Pools are told apart
+    by their `pool_logging_name`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        _pools[self.name] = self
+
+    @property
+    def name(self) -> str:
+        return self.logging_name or "default"
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        record = super()._create_connection()
+        record.record_info["pool"] = self.name
+        return record
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_timeouts.inc(self.name)
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started, self.name)
+
+    def stats(self) -> dict[str, Any]:
+        checkouts = pool_checkout_seconds.count(self.name)
+        wait = pool_checkout_seconds.sum(self.name)
+        return {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "average_wait_seconds": wait / checkouts if checkouts else 0.0,
+            "wait_seconds_buckets": {
+                str(bound): count
+                for bound, count in pool_checkout_seconds.cumulative(self.name)
+            },
+            "timeouts": pool_timeouts.get(self.name),
+            "invalidated": pool_invalidated.get(self.name),
+        }
+
+
+def add_liveness_check(pool: InstrumentedPool) -> None:
+    """Registers the idle ping listeners, they are kept when the pool is recreated."""
+    event.listen(pool, "checkin", _on_checkin)
+    event.listen(pool, "checkout", _on_checkout)
+
+
+def _on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+    record.info["checked_in_at"] = time.monotonic()
+
+
+def _on_checkout(
+    dbapi_connection: Any, record: ConnectionPoolEntry, proxy: PoolProxiedConnection
+) -> None:
+    """
+    Cheaper replacement of pool_pre_ping: only connections idle for longer than
+    DB_POOL_PING_AFTER_IDLE_SECONDS are pinged, busy ones are reused as they are.
+    Raising DisconnectionError makes the pool retry with a fresh connection.
+    """
+    checked_in_at = record.info.get("checked_in_at")
+    idle = time.monotonic() - checked_in_at if checked_in_at else 0.0
+    if idle < settings.db.POOL_PING_AFTER_IDLE_SECONDS:
+        return
+
+    try:
+        dbapi_connection.ping()
+    except Exception as e:
+        pool_invalidated.inc(record.record_info["pool"])
+        raise exc.DisconnectionError(f"Ping failed: {e}") from e
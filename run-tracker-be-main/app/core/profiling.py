@@ -0,0 +1,83 @@
+import asyncio
+import cProfile
+import hmac
+import pstats
+import re
+import uuid
+from pathlib import Path
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+REQUEST_ID_HEADER = "x-request-id"
+
+_REQUEST_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class ProfilingMiddleware:
+    """
+    Runs requests sending the PROFILING_TOKEN in the X-Profile-Token header
+    under cProfile. The stats are stored as PROFILING_DIR/<profile id>.pstats and
+    the id is returned in the X-Profile-Id header. The profile id starts with the
+    X-Request-ID when given, followed by a random suffix so a reused request id
+    doesn't overwrite an earlier profile.
+
+    The profiler sees the whole event loop thread, so code of other requests
+    handled concurrently shows up too; profile on a quiet instance. One request
+    is profiled at a time, others are served as usual.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.directory = Path(settings.app.PROFILING_DIR)
+        self._token = settings.app.PROFILING_TOKEN.encode()
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        token = headers.get(PROFILE_TOKEN_HEADER)
+        if token is None or not hmac.compare_digest(token.encode(), self._token):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get(REQUEST_ID_HEADER, "")
+        if _REQUEST_ID.fullmatch(request_id):
+            profile_id = f"{request_id}-{uuid.uuid4().hex[:8]}"
+        else:
+            profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profiler = cProfile.Profile()
+        self._active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            self._active = False
+            await asyncio.to_thread(self._save, profiler, profile_id, scope["path"])
+
+    def _save(self, profiler: cProfile.Profile, profile_id: str, path: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(self.directory / f"{profile_id}.pstats")
+        logger.info(
+            "Profile of {path} stored as {profile_id}.pstats "
+            "({calls} calls, {seconds:.3f}s)",
+            path=path,
+            profile_id=profile_id,
+            calls=stats.total_calls,
+            seconds=stats.total_tt,
+        )
@@ -0,0 +1,127 @@
+import re
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import ParamSpec, TypeVar
+
+from loguru import logger
+from sqlalchemy import Engine, event
+
+from app.core import metrics
+from app.core.config import settings
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+query_budget_exceeded = metrics.Counter(
+    "query_budget_exceeded_total",
+    "Calls that executed more statements than their query budget allows "
+    "or repeated the same statement",
+    labels=("function",),
+)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# A bind parameter with the cast asyncpg renders, e.g. $1::TIMESTAMP WITH TIME ZONE
+_PARAMETER = (
+    r"\$\d+(?:::\w+(?: (?:WITH|WITHOUT|TIME|ZONE|VARYING|PRECISION)\b)*"
+    r"(?:\(\d+(?:,\s*\d+)?\))?(?:\[\])*)?"
+)
+_PARAMETER_LISTS = re.compile(rf"{_PARAMETER}(?:\s*,\s*{_PARAMETER})*")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements of nested units of work, part of the transaction handling rather
+# than of the work a budget covers
+_SAVEPOINTS = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduces a statement to its shape, so that executions differing only in
+    parameter values (or the length of an IN list) compare equal.
+    """
+    statement = _PARAMETER_LISTS.sub("?", statement)
+    statement = _LITERALS.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryLog:
+    count: int = 0
+    statements: Counter[str] = field(default_factory=Counter)
+
+
+# Logs of the query_budget calls in progress, innermost last
+_query_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised with QUERY_BUDGET_MODE=raise, meant for tests and CI."""
+
+
+def add_query_budget_check(engine: Engine) -> None:
+    """Records the statements executed by the engine into the active query logs."""
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        logs = _query_logs.get()
+        if not logs or statement.startswith(_SAVEPOINTS):
+            return
+
+        normalized = normalize_statement(statement)
+        for log in logs:
+            log.count += 1
+            log.statements[normalized] += 1
+
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _check(name: str, max_queries: int, log: QueryLog) -> None:
+    problems = []
+    if log.count > max_queries:
+        problems.append(f"{log.count} statements executed, budget is {max_queries}")
+    for statement, count in log.statements.items():
+        if count > settings.app.QUERY_BUDGET_MAX_REPEATS:
+            problems.append(f"{count}x {statement}")
+    if not problems:
+        return
+
+    query_budget_exceeded.inc(name)
+    if settings.app.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceededError(f"{name}: " + "; ".join(problems))
+    logger.warning(
+        "Query budget of {name} exceeded: {problems}",
+        name=name,
+        problems="; ".join(problems),
+    )
+
+
+def query_budget(
+    max_queries: int,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """
+    Declares how many statements an endpoint or a service method may execute.
+    With QUERY_BUDGET_MODE=warn a call over the budget, or one repeating the same
+    statement more than QUERY_BUDGET_MAX_REPEATS times (a query per item of a
+    loop), is logged; with QUERY_BUDGET_MODE=raise it fails. Statements run by
+    the dependencies of an endpoint are not counted towards its budget.
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if settings.app.QUERY_BUDGET_MODE == "off":
+                return await func(*args, **kwargs)
+
+            log = QueryLog()
+            token = _query_logs.set((*_query_logs.get(), log))
+            try:
+                result = await func(*args, **kwargs)
+            finally:
+                _query_logs.reset(token)
+            _check(func.__qualname__, max_queries, log)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,129 @@
+import importlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.core.exc import TooManyRequestsException
+from app.core.metrics import Counter
+
+auth_rate_limited = Counter(
+    "auth_rate_limited_total",
+    "Sign-in and sign-up attempts rejected by the rate limiter",
+    labels=("key",),
+)
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of token buckets. The in-memory backend limits per worker process;
+    multi-worker deployments can plug in a shared one via AUTH_RATE_LIMIT_BACKEND.
+    """
+
+    @abstractmethod
+    async def consume(
+        self, key: str, capacity: int, refill_per_second: float, cost: int = 1
+    ) -> float:
+        """
+        Takes `cost` tokens from the bucket of `key`, cost=0 only checks it.
+        Returns 0 when allowed, otherwise seconds until a token is available.
+        """
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(
+        self, key: str, capacity: int, refill_per_second: float, cost: int = 1
+    ) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens = max(tokens - cost, 0.0)
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            # Least recently seen keys are the ones that have refilled the most
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class AuthRateLimiter:
+    """
+    Throttles the auth endpoints per client IP, and sign-ins per email and
+    client IP. Only failed sign-ins are charged to the email bucket, and per
+    IP, so nobody can lock another user out by trying their email.
+    """
+
+    def __init__(self, backend: RateLimitBackend) -> None:
+        self.backend = backend
+
+    async def check(self, ip: str | None, email: str | None = None) -> None:
+        """
+        Raises TooManyRequestsException when the IP is throttled, or when the
+        email has failed too often from this IP. Charges the IP bucket only.
+        """
+        if not settings.auth.RATE_LIMIT_ENABLED:
+            return
+
+        if ip is not None:
+            await self._consume(
+                "ip",
+                f"auth:ip:{ip}",
+                settings.auth.RATE_LIMIT_IP_BURST,
+                settings.auth.RATE_LIMIT_IP_PER_MINUTE,
+            )
+        if email is not None:
+            await self._consume(
+                "email",
+                self._email_key(ip, email),
+                settings.auth.RATE_LIMIT_EMAIL_BURST,
+                settings.auth.RATE_LIMIT_EMAIL_PER_MINUTE,
+                cost=0,
+            )
+
+    async def record_failure(self, ip: str | None, email: str) -> None:
+        """Charges a failed credential check to the email bucket."""
+        if not settings.auth.RATE_LIMIT_ENABLED:
+            return
+
+        await self.backend.consume(
+            self._email_key(ip, email),
+            settings.auth.RATE_LIMIT_EMAIL_BURST,
+            settings.auth.RATE_LIMIT_EMAIL_PER_MINUTE / 60,
+        )
+
+    def _email_key(self, ip: str | None, email: str) -> str:
+        return f"auth:email:{email.lower()}:{ip}"
+
+    async def _consume(
+        self, key_type: str, key: str, burst: int, per_minute: int, cost: int = 1
+    ) -> None:
+        retry_after = await self.backend.consume(key, burst, per_minute / 60, cost)
+        if retry_after:
+            auth_rate_limited.inc(key_type)
+            raise TooManyRequestsException(
+                "Too many authentication attempts, try again later", retry_after
+            )
+
+
+def _create_backend() -> RateLimitBackend:
+    module_name, _, class_name = settings.auth.RATE_LIMIT_BACKEND.rpartition(".")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class()
+
+
+auth_rate_limiter = AuthRateLimiter(_create_backend())
+
+
+def get_auth_rate_limiter() -> AuthRateLimiter:
+    return auth_rate_limiter
@@ -0,0 +1,67 @@
+import math
+import re
+from dataclasses import dataclass
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.context import request_wal_fence
+
+FENCE_COOKIE = "wal_fence"
+
+# pg_lsn text form, e.g. 0/16B3748
+_LSN = re.compile(r"[0-9A-F]{1,8}/[0-9A-F]{1,8}")
+
+
+@dataclass
+class WalFence:
+    """
+    Primary WAL positions a request's reads have to see: the one of the client's
+    last write, sent back in a cookie, and the one of a write of this request.
+    """
+
+    seen: str | None = None
+    written: str | None = None
+
+    @property
+    def lsn(self) -> str | None:
+        return self.written or self.seen
+
+
+class ReadYourWritesMiddleware:
+    """
+    Carries the read-your-writes fence with the client, so it holds across
+    worker processes and instances. After a request that wrote, the response
+    sets the primary's WAL position in a cookie that expires after
+    DB_READ_YOUR_WRITES_SECONDS. Until then, ReadOnlyUnitOfWork only reads from
+    a replica that has replayed up to that position.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seen = HTTPConnection(scope).cookies.get(FENCE_COOKIE)
+        fence = WalFence(seen=seen if seen and _LSN.fullmatch(seen) else None)
+        token = request_wal_fence.set(fence)
+
+        async def send_with_fence(message: Message) -> None:
+            if message["type"] == "http.response.start" and fence.written:
+                max_age = math.ceil(settings.db.READ_YOUR_WRITES_SECONDS)
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{FENCE_COOKIE}={fence.written}; Max-Age={max_age}; Path=/; "
+                    "HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_fence)
+        finally:
+            request_wal_fence.reset(token)
@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import sys
+import time
+from collections.abc import Iterator
+from types import FrameType
+from typing import Any
+
+import greenlet
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.query_budget import normalize_statement
+from app.utils.cache import TTLCache
+
+slow_queries = Counter(
+    "db_slow_queries_total",
+    "Statements slower than DB_SLOW_QUERY_SECONDS by the code that ran them",
+    labels=("caller",),
+)
+
+# Normalized statements explained recently, they are not explained again
+_explained: TTLCache[str, bool] = TTLCache(
+    maxsize=1000, ttl=settings.db.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
+)
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def _describe_parameters(parameters: Any, many: bool) -> str:
+    """Describes the bound parameters by type (and length), leaving out values."""
+    if many:
+        rows = list(parameters)
+        first = _describe_parameters(rows[0], False) if rows else "()"
+        return f"{len(rows)} x {first}"
+
+    def describe(value: Any) -> str:
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return ", ".join(f"{key}: {describe(v)}" for key, v in parameters.items())
+    return "(" + ", ".join(describe(value) for value in parameters or ()) + ")"
+
+
+def _iter_frames() -> Iterator[FrameType]:
+    """
+    Yields the frames of the current stack. Async sessions run statements in a
+    greenlet whose stack ends at the call from the awaiting coroutine, the rest
+    is on the stack of the parent greenlet.
+    """
+    frame: FrameType | None = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return
+        frame = current.gr_frame
+
+
+def _find_caller() -> str:
+    """Returns the innermost service method (or else app function) on the stack."""
+    fallback = "unknown"
+    for frame in _iter_frames():
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith("app.") or module.startswith("app.core."):
+            continue
+
+        caller = f"{module}.{frame.f_code.co_qualname}:{frame.f_lineno}"
+        if module.startswith("app.services."):
+            return caller
+        if fallback == "unknown":
+            fallback = caller
+    return fallback
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters: Any) -> None:
+    try:
+        async with engine.connect() as conn:
+            # ANALYZE executes the statement again, the transaction can't write
+            conn = await conn.execution_options(
+                postgresql_readonly=True, slow_query_log=False
+            )
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            await conn.rollback()
+    except Exception as exc:
+        logger.warning("Could not explain slow query: {exc}", exc=str(exc))
+        return
+
+    logger.warning(
+        "Plan of slow query {statement}\n{plan}",
+        statement=normalize_statement(statement),
+        plan=plan,
+    )
+
+
+def _schedule_explain(engine: AsyncEngine, statement: str, parameters: Any) -> None:
+    """
+    Explains the statement on a separate connection in the background, at most one
+    at a time and once per DB_SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS per statement.
+    """
+    normalized = normalize_statement(statement)
+    if _explain_tasks or _explained.get(normalized):
+        return
+    _explained.set(normalized, True)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    # A fresh context, the plan's statements are not part of the current request
+    task = loop.create_task(
+        _explain(engine, statement, parameters), context=contextvars.Context()
+    )
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+def add_slow_query_log(engine: AsyncEngine) -> None:
+    """
+    Logs statements slower than DB_SLOW_QUERY_SECONDS with their shape, parameter
+    types and caller. With DB_SLOW_QUERY_EXPLAIN the plans of slow SELECTs are
+    logged too.
+    """
+    threshold = settings.db.SLOW_QUERY_SECONDS
+    if threshold <= 0:
+        return
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        duration = time.perf_counter() - started
+        if duration < threshold:
+            return
+        if not conn.get_execution_options().get("slow_query_log", True):
+            return
+
+        caller = _find_caller()
+        slow_queries.inc(caller.rpartition(":")[0])
+        logger.warning(
+            "Slow query ({duration_ms}ms) from {caller}: {statement} {parameters}",
+            duration_ms=round(duration * 1000, 1),
+            caller=caller,
+            statement=normalize_statement(statement),
+            parameters=_describe_parameters(parameters, many),
+        )
+
+        if (
+            settings.db.SLOW_QUERY_EXPLAIN
+            and not many
+            and statement.lstrip()[:6].upper() == "SELECT"
+        ):
+            _schedule_explain(engine, statement, parameters)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
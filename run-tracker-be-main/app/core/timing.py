@@ -0,0 +1,159 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from loguru import logger
+from sqlalchemy import Engine, event
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.context import request_timings
+from app.core.metrics import Gauge, Histogram
+
+request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the whole response",
+    labels=("method", "route", "status_code"),
+)
+requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled",
+    labels=("method",),
+)
+
+
+@dataclass
+class RequestTimings:
+    """Where the time of a request went, durations in seconds."""
+
+    db: float = 0.0
+    queries: int = 0
+    auth: float = 0.0
+    serialization: float = 0.0
+    handler: float = 0.0
+    total: float = 0.0
+    _active: set[str] = field(default_factory=set, repr=False)
+
+    def to_header(self) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+                f"auth;dur={self.auth * 1000:.1f}",
+                f"handler;dur={self.handler * 1000:.1f}",
+                f"serialization;dur={self.serialization * 1000:.1f}",
+                f"total;dur={self.total * 1000:.1f}",
+            ]
+        )
+
+    def to_log_fields(self) -> dict[str, float | int]:
+        return {
+            "db_ms": round(self.db * 1000, 2),
+            "queries": self.queries,
+            "auth_ms": round(self.auth * 1000, 2),
+            "handler_ms": round(self.handler * 1000, 2),
+            "serialization_ms": round(self.serialization * 1000, 2),
+            "total_ms": round(self.total * 1000, 2),
+        }
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """
+    Adds the duration of the block to the `name` timing of the current request.
+    Nested blocks of the same name are counted once.
+    """
+    timings = request_timings.get()
+    if timings is None or name in timings._active:
+        yield
+        return
+
+    timings._active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._active.discard(name)
+        setattr(timings, name, getattr(timings, name) + time.perf_counter() - started)
+
+
+def add_query_timing(engine: Engine) -> None:
+    """Counts the statements executed by the engine and their time per request."""
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None:
+            context._timing_started = time.perf_counter()
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        timings = request_timings.get()
+        started = getattr(context, "_timing_started", None)
+        if timings is None or started is None:
+            return
+
+        timings.db += time.perf_counter() - started
+        timings.queries += 1
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ServerTimingMiddleware:
+    """
+    Collects the timings of each HTTP request, reports them in the Server-Timing
+    header (with SERVER_TIMING on), logs them as structured fields and
+    records the request latency per route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        origin = Headers(scope=scope).get("origin")
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings.total = time.perf_counter() - started
+                if settings.app.SERVER_TIMING:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.to_header())
+                    # Browsers hide the timings of cross-origin responses
+                    # from the frontend without it
+                    if origin in settings.app.ALLOWED_ORIGINS:
+                        headers.append("Timing-Allow-Origin", origin)
+            await send(message)
+
+        requests_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            requests_in_progress.dec(method)
+            request_timings.reset(token)
+            # Includes sending the body, unlike the header value
+            timings.total = time.perf_counter() - started
+            route = scope.get("route")
+            # Unmatched paths are not used as labels, any URL would add a series
+            route_path = getattr(route, "path", "unmatched")
+            request_duration_seconds.observe(
+                timings.total, method, route_path, str(status_code)
+            )
+            # Keyword arguments also end up as fields of the serialized record
+            logger.info(
+                "{method} {route} {status_code} in {total_ms}ms "
+                "({queries} queries, db {db_ms}ms)",
+                method=method,
+                route=getattr(route, "path", scope["path"]),
+                status_code=status_code,
+                **timings.to_log_fields(),
+            )
@@ -2,23 +2,46 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from app.core.config import settings
-from app.core.db import async_session
+from app.core.context import request_wal_fence
+from app.core.db import async_session, replicas
+from app.core.metrics import Counter
 from app.repositories.achievement import AchievementRepository
 from app.repositories.goal import GoalRepository
+from app.repositories.goal_period_progress import GoalPeriodProgressRepository
+from app.repositories.leaderboard import LeaderboardRepository
+from app.repositories.revoked_token import RevokedTokenRepository
 from app.repositories.run import RunRepository
 from app.repositories.user import UserRepository
 
+read_routed = Counter(
+    "db_read_routed_total",
+    "Read-only units of work by the database they were routed to",
+    labels=("target",),
+)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_writes(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["has_writes"] = True
+
 
 class ABCUnitOfWork(ABC):
     session: AsyncSession
 
     user: UserRepository
     goal: GoalRepository
+    goal_progress: GoalPeriodProgressRepository
     run: RunRepository
     achievement: AchievementRepository
+    leaderboard: LeaderboardRepository
+    revoked_token: RevokedTokenRepository
 
     @abstractmethod
     def __init__(self) -> None:
@@ -34,35 +57,167 @@ class ABCUnitOfWork(ABC):
 
 
 class UnitOfWork(ABCUnitOfWork):
+    """
+    Re-entrant unit of work. The outermost `async with` opens the session and
+    commits or rolls back at exit. Nested `async with` blocks (e.g. a service
+    called from another service with the same uow) reuse that session and run
+    in a SAVEPOINT, so a request holds a single pooled connection.
+    Repositories only flush, committing is left to the unit of work.
+    """
+
     def __init__(self) -> None:
         self.session_maker = async_session
+        self._savepoints: list[AsyncSessionTransaction] = []
+        self._depth = 0
 
     async def __aenter__(self) -> "ABCUnitOfWork":
-        self.session = self.session_maker()
+        if self._depth > 0:
+            self._savepoints.append(await self.session.begin_nested())
+            self._depth += 1
+            return self
+
+        self.session = await self._create_session()
 
         self.user = UserRepository(self.session)
         self.goal = GoalRepository(self.session)
+        self.goal_progress = GoalPeriodProgressRepository(self.session)
         self.run = RunRepository(self.session)
         self.achievement = AchievementRepository(self.session)
+        self.leaderboard = LeaderboardRepository(self.session)
+        self.revoked_token = RevokedTokenRepository(self.session)
 
+        self._depth = 1
         return self
 
     async def __aexit__(self, *args: Any) -> None:
         exc_type, exc, tb = args
+        self._depth -= 1
+        if self._depth > 0:
+            savepoint = self._savepoints.pop()
+            if exc:
+                await savepoint.rollback()
+                raise exc
+            await savepoint.commit()
+            return
+
         if exc:
-            log_func = logger.exception if settings.app.RELOAD else logger.error
-            log_func(
-                "An error occurred while processing the request. Rolling back. Error: {exc}",
-                exc=exc,
-            )
+            self._log_error(exc)
             await self.session.rollback()
         else:
             await self.session.commit()
+            await self._fence_writes()
         await self.session.close()
-        await logger.complete()
 
         if exc:
             raise exc
 
     async def rollback(self) -> None:
         await self.session.rollback()
+
+    async def _create_session(self) -> AsyncSession:
+        return self.session_maker()
+
+    def _log_error(self, exc: BaseException) -> None:
+        log_func = logger.exception if settings.app.RELOAD else logger.error
+        log_func(
+            "An error occurred while processing the request. Rolling back. "
+            "Error: {exc}",
+            # Records are pickled for the logging queue, exceptions may not be
+            exc=str(exc),
+        )
+
+    async def _fence_writes(self) -> None:
+        """Makes the response hand the client the WAL position of the write."""
+        fence = request_wal_fence.get()
+        if fence is not None and self.session.info.get("has_writes"):
+            fence.written = await self.session.scalar(
+                text("SELECT pg_current_wal_lsn()::text")
+            )
+
+
+class ReadOnlyUnitOfWork(UnitOfWork):
+    """
+    Unit of work for read-only endpoints, served by a read replica when
+    DB_REPLICA_URLS is set. A client who wrote within DB_READ_YOUR_WRITES_SECONDS
+    is only served by a replica that has replayed the write, else by the primary,
+    to see their own changes despite replication lag.
+    Replicas that can't be connected to are skipped, falling back to the primary.
+
+    Statements run in autocommit mode, so there is no BEGIN/COMMIT round trip
+    and nothing to flush at exit. Nested blocks simply share the session.
+    """
+
+    execution_options: dict[str, Any] = {"isolation_level": "AUTOCOMMIT"}
+
+    async def __aenter__(self) -> "ABCUnitOfWork":
+        if self._depth > 0:
+            self._depth += 1
+            return self
+        return await super().__aenter__()
+
+    async def __aexit__(self, *args: Any) -> None:
+        exc_type, exc, tb = args
+        self._depth -= 1
+        if self._depth > 0:
+            return
+
+        if exc:
+            self._log_error(exc)
+        await self.session.close()
+
+    async def _create_session(self) -> AsyncSession:
+        fence = request_wal_fence.get()
+        lsn = fence and fence.lsn
+        fenced = False
+        for replica in replicas.get_engines():
+            session = self.session_maker(bind=replica)
+            try:
+                await self._connect(session)
+            except (OSError, SQLAlchemyError) as exc:
+                logger.warning(
+                    "Replica {url} unavailable, skipping it: {exc}",
+                    url=replica.url.render_as_string(hide_password=True),
+                    exc=str(exc),
+                )
+                replicas.mark_unhealthy(replica)
+                await session.close()
+                continue
+
+            if lsn and not await self._has_replayed(session, lsn):
+                fenced = True
+                await session.close()
+                continue
+
+            read_routed.inc("replica")
+            return session
+
+        read_routed.inc("fence" if fenced else "primary")
+        return await self._connect(self.session_maker())
+
+    async def _connect(self, session: AsyncSession) -> AsyncSession:
+        await session.connection(execution_options=self.execution_options)
+        return session
+
+    async def _has_replayed(self, session: AsyncSession, lsn: str) -> bool:
+        return bool(
+            await session.scalar(
+                # asyncpg binds pg_lsn as an integer, the text form is cast
+                text(
+                    "SELECT pg_last_wal_replay_lsn() "
+                    ">= CAST(CAST(:lsn AS text) AS pg_lsn)"
+                ),
+                {"lsn": lsn},
+            )
+        )
+
+
+class ReadOnlySnapshotUnitOfWork(ReadOnlyUnitOfWork):
+    """
+    Read-only unit of work for endpoints issuing several queries that have to
+    agree with each other: they share one READ ONLY REPEATABLE READ snapshot.
+    """
+
+    execution_options = {
+        "isolation_level": "REPEATABLE READ",
+        "postgresql_readonly": True,
+    }
@@ -1,10 +1,24 @@
+import hmac
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import Depends
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.core.exc import UserNotAuthenticatedException
-from app.core.unit_of_work import ABCUnitOfWork, UnitOfWork
+from app.core.config import settings
+from app.core.context import request_user_uuid
+from app.core.exc import (
+    InvalidDiagnosticsTokenException,
+    UserNotAuthenticatedException,
+)
+from app.core.rate_limit import AuthRateLimiter, get_auth_rate_limiter
+from app.core.timing import measure
+from app.core.unit_of_work import (
+    ABCUnitOfWork,
+    ReadOnlySnapshotUnitOfWork,
+    ReadOnlyUnitOfWork,
+    UnitOfWork,
+)
 from app.models import User
 from app.services.achievement import AchievementService, get_achievement_service
 from app.services.auth import AuthService, get_auth_service
@@ -16,6 +30,10 @@ from app.services.user import UserService, get_user_service
 from app.utils.security import decode_token
 
 UnitOfWorkDep = Annotated[ABCUnitOfWork, Depends(UnitOfWork)]
+ReadOnlyUnitOfWorkDep = Annotated[ABCUnitOfWork, Depends(ReadOnlyUnitOfWork)]
+ReadOnlySnapshotUnitOfWorkDep = Annotated[
+    ABCUnitOfWork, Depends(ReadOnlySnapshotUnitOfWork)
+]
 
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
@@ -25,30 +43,77 @@ AchievementServiceDep = Annotated[AchievementService, Depends(get_achievement_se
 StatisticsServiceDep = Annotated[StatisticsService, Depends(get_statistics_service)]
 LeaderboardServiceDep = Annotated[LeaderboardService, Depends(get_leaderboard_service)]
 
+AuthRateLimiterDep = Annotated[AuthRateLimiter, Depends(get_auth_rate_limiter)]
+
 bearer_scheme = HTTPBearer()
+diagnostics_bearer_scheme = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
     token: Annotated[str, Depends(bearer_scheme)],
     uow: UnitOfWorkDep,
+    user_service: UserServiceDep,
 ) -> User:
-    try:
-        payload = decode_token(token.credentials)
-        if payload is None:
-            raise UserNotAuthenticatedException()
+    with measure("auth"):
+        try:
+            payload = decode_token(token.credentials)
+            if payload is None:
+                raise UserNotAuthenticatedException()
 
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise UserNotAuthenticatedException()
+            user_id: str = payload.get("sub")
+            if user_id is None:
+                raise UserNotAuthenticatedException()
 
-        async with uow:
-            user = await uow.user.get_one(uuid=user_id)
+            user = await user_service.get_user(uow, UUID(user_id))
             if user is None:
                 raise UserNotAuthenticatedException()
 
-        return user
-    except Exception:
-        raise UserNotAuthenticatedException()
+            request_user_uuid.set(user.uuid)
+            return user
+        except Exception:
+            raise UserNotAuthenticatedException()
 
 
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
+
+
+async def get_current_user_uuid(
+    token: Annotated[str, Depends(bearer_scheme)],
+    uow: UnitOfWorkDep,
+    user_service: UserServiceDep,
+) -> UUID:
+    """
+    Identifies the user of read-only endpoints. With AUTH_TRUST_TOKEN_CLAIMS the
+    signed token alone is enough, otherwise the user is verified to still exist.
+    """
+    with measure("auth"):
+        if not settings.auth.TRUST_TOKEN_CLAIMS:
+            user = await get_current_user(token, uow, user_service)
+            return user.uuid
+
+        try:
+            payload = decode_token(token.credentials)
+            user_uuid = UUID(payload["sub"])
+        except Exception:
+            raise UserNotAuthenticatedException()
+
+        request_user_uuid.set(user_uuid)
+        return user_uuid
+
+
+CurrentUserUUIDDep = Annotated[UUID, Depends(get_current_user_uuid)]
+
+
+async def verify_diagnostics_token(
+    token: Annotated[
+        HTTPAuthorizationCredentials | None, Depends(diagnostics_bearer_scheme)
+    ],
+) -> None:
+    """Guards the metrics and diagnostic endpoints with DIAGNOSTICS_TOKEN."""
+    expected = settings.app.DIAGNOSTICS_TOKEN.encode()
+    if (
+        not expected
+        or token is None
+        or not hmac.compare_digest(token.credentials.encode(), expected)
+    ):
+        raise InvalidDiagnosticsTokenException()
@@ -0,0 +1,224 @@
+"""
+Recomputes goal completion achievements for all users.
+
+The user uuid space is split into equal ranges which are processed by a pool of
+async workers, each partition in its own unit of work. Finished partitions are
+recorded in a checkpoint file so an interrupted run can be resumed. A failing
+partition is logged and skipped, the job then exits with status 1 and the next
+run retries it.
+
+Usage:
+    python -m app.jobs.achievement_backfill --workers 4 --partitions 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+from loguru import logger
+
+from app.core.db import engine
+from app.core.unit_of_work import UnitOfWork
+from app.services.achievement import AchievementService, get_achievement_service
+
+UUID_SPACE = 2**128
+
+
+def get_partitions(count: int) -> list[tuple[UUID | None, UUID | None]]:
+    """Splits the uuid space into `count` half-open [from, to) ranges."""
+    bounds = [UUID(int=i * UUID_SPACE // count) for i in range(1, count)]
+    lower = [None, *bounds]
+    upper = [*bounds, None]
+    return list(zip(lower, upper))
+
+
+class Checkpoint:
+    def __init__(self, path: Path, partitions: int) -> None:
+        self.path = path
+        self.partitions = partitions
+        self.completed: set[int] = set()
+        self.evaluated = 0
+        self.awarded = 0
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+
+        data = json.loads(self.path.read_text())
+        if data["partitions"] != self.partitions:
+            raise ValueError(
+                f"Checkpoint {self.path} was created with {data['partitions']} "
+                f"partitions, got {self.partitions}. Use --reset to start over."
+            )
+        self.completed = set(data["completed"])
+        self.evaluated = data["evaluated"]
+        self.awarded = data["awarded"]
+
+    def mark_done(self, index: int, evaluated: int, awarded: int) -> None:
+        self.completed.add(index)
+        self.evaluated += evaluated
+        self.awarded += awarded
+        self._save()
+
+    def _save(self) -> None:
+        data = {
+            "partitions": self.partitions,
+            "completed": sorted(self.completed),
+            "evaluated": self.evaluated,
+            "awarded": self.awarded,
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+
+
+class AchievementBackfill:
+    def __init__(
+        self,
+        achievement_service: AchievementService,
+        checkpoint: Checkpoint,
+        workers: int,
+    ) -> None:
+        self.achievement_service = achievement_service
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.failed: list[int] = []
+
+        self._pending = 0
+        self._done = 0
+        self._evaluated = 0
+        self._started_at = 0.0
+
+    async def run(self) -> None:
+        partitions = get_partitions(self.checkpoint.partitions)
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(len(partitions)):
+            if index not in self.checkpoint.completed:
+                queue.put_nowait(index)
+
+        self._pending = queue.qsize()
+        self._started_at = time.perf_counter()
+        logger.info(
+            "Recomputing achievements: {pending}/{total} partitions left, "
+            "{workers} workers",
+            pending=self._pending,
+            total=len(partitions),
+            workers=self.workers,
+        )
+
+        # Leaving the group cancels and awaits the other workers if one raises,
+        # so none of them outlives the engine
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(self.workers):
+                task_group.create_task(self._worker(queue, partitions))
+
+        if self.failed:
+            logger.error(
+                "Achievement recompute incomplete: partitions {failed} failed, "
+                "run the job again to retry them",
+                failed=sorted(self.failed),
+            )
+            return
+
+        logger.info(
+            "Achievement recompute finished: {evaluated} goal periods evaluated, "
+            "{awarded} achievements awarded in total",
+            evaluated=self.checkpoint.evaluated,
+            awarded=self.checkpoint.awarded,
+        )
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue[int],
+        partitions: list[tuple[UUID | None, UUID | None]],
+    ) -> None:
+        while not queue.empty():
+            index = queue.get_nowait()
+            user_uuid_from, user_uuid_to = partitions[index]
+            try:
+                counts = await self.achievement_service.recompute_achievements(
+                    UnitOfWork(), user_uuid_from, user_uuid_to
+                )
+            except Exception:
+                # Not checkpointed, the next run retries the partition
+                logger.exception("Partition {index} failed", index=index)
+                self.failed.append(index)
+                continue
+            self.checkpoint.mark_done(index, *counts)
+            self._report(index, *counts)
+
+    def _report(self, index: int, evaluated: int, awarded: int) -> None:
+        self._done += 1
+        self._evaluated += evaluated
+        elapsed = time.perf_counter() - self._started_at
+        rate = self._done / elapsed if elapsed else 0.0
+        eta = (self._pending - self._done) / rate if rate else 0.0
+        logger.info(
+            "Partition {index} done ({done}/{pending}): {evaluated} goal periods, "
+            "{awarded} awarded | {rate:.2f} partitions/s, "
+            "{throughput:.0f} goal periods/s, ETA {eta:.0f}s",
+            index=index,
+            done=self._done,
+            pending=self._pending,
+            evaluated=evaluated,
+            awarded=awarded,
+            rate=rate,
+            throughput=self._evaluated / elapsed if elapsed else 0.0,
+            eta=eta,
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of concurrent workers, keep it below the DB pool size",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=64,
+        help="Number of user uuid ranges the work is split into",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path("achievement_backfill.checkpoint.json"),
+        help="Path of the checkpoint file used for resuming",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Ignore an existing checkpoint and start from scratch",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint, args.partitions)
+    if args.reset:
+        args.checkpoint.unlink(missing_ok=True)
+    checkpoint.load()
+
+    backfill = AchievementBackfill(
+        get_achievement_service(), checkpoint, workers=args.workers
+    )
+    try:
+        await backfill.run()
+    finally:
+        await engine.dispose()
+    if backfill.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
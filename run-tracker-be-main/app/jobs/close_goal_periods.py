@@ -0,0 +1,35 @@
+"""
+Closes finished goal periods.
+
+Meant to run shortly after every period boundary (e.g. hourly from cron). It is
+idempotent: goals without any run in a period that ended since their last closed
+period get an empty progress row, so missed runs of the job are caught up, and
+every period whose end has passed is marked as closed.
+
+Usage:
+    python -m app.jobs.close_goal_periods
+"""
+
+import asyncio
+
+from loguru import logger
+
+from app.core.db import engine
+from app.core.unit_of_work import UnitOfWork
+from app.services.goal import get_goal_service
+
+
+async def main() -> None:
+    try:
+        created, closed = await get_goal_service().close_periods(UnitOfWork())
+        logger.info(
+            "Goal periods closed: {created} missed periods created, {closed} closed",
+            created=created,
+            closed=closed,
+        )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+"""
+Deletes the revocations of refresh tokens that have expired since.
+
+Expired tokens are rejected anyway, so their rows are no longer needed. Meant
+to run periodically (e.g. daily from cron) to keep the table small.
+
+Usage:
+    python -m app.jobs.purge_revoked_tokens
+"""
+
+import asyncio
+
+from loguru import logger
+
+from app.core.db import engine
+from app.core.unit_of_work import UnitOfWork
+from app.services.auth import get_auth_service
+
+
+async def main() -> None:
+    try:
+        deleted = await get_auth_service().delete_expired_revocations(UnitOfWork())
+        logger.info("Expired token revocations deleted: {deleted}", deleted=deleted)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,28 +1,79 @@
+import random
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from pydantic import ValidationError
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from app.core import exc
 from app.core.config import settings
 from app.core.exc import handlers
+from app.core.profiling import ProfilingMiddleware
+from app.core.read_your_writes import ReadYourWritesMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.timing import ServerTimingMiddleware
 from app.routers import router
 
+if TYPE_CHECKING:
+    from loguru import Record
+
+
+class _InfoSampler:
+    """Keeps a `rate` share of INFO records, records of other levels are all kept."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self._info = logger.level("INFO").no
+        self._last_record: "Record | None" = None
+        self._keep_last = True
+
+    def __call__(self, record: "Record") -> bool:
+        if record["level"].no != self._info:
+            return True
+
+        # Every sink is passed the same record, they all keep or drop it
+        if record is not self._last_record:
+            self._last_record = record
+            self._keep_last = random.random() < self.rate
+        return self._keep_last
+
 
 def _configure_logging() -> None:
     """
-    Configures logging for the application using Loguru.
+    Configures logging for the application using Loguru. Records are queued
+    (enqueue=True) and written by a background thread, so requests never wait for
+    the disk; the log file is written in batches of LOG_BUFFER_BYTES.
     """
+    rate = settings.app.LOG_INFO_SAMPLE_RATE
+    sample = _InfoSampler(rate) if rate < 1 else None
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True, filter=sample)
     logger.add(
         "app/app.log",
         rotation="100 MB",
         retention="7 days",
         level="INFO",
         serialize=True,
+        enqueue=True,
+        buffering=settings.app.LOG_BUFFER_BYTES,
+        filter=sample,
     )
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Waits for the queued records, removing the sinks flushes the file buffer
+    await logger.complete()
+    logger.remove()
+
+
 def _add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(
         exc.ObjectAlreadyExistsException, handlers.handle_object_already_exists
@@ -35,6 +86,12 @@ def _add_exception_handlers(app: FastAPI) -> None:
     app.add_exception_handler(exc.ServerErrorException, handlers.handle_server_error)
     app.add_exception_handler(exc.UnauthorizedException, handlers.handle_unauthorized)
     app.add_exception_handler(exc.ForbiddenException, handlers.handle_forbidden)
+    app.add_exception_handler(
+        exc.ServiceUnavailableException, handlers.handle_service_unavailable
+    )
+    app.add_exception_handler(
+        exc.TooManyRequestsException, handlers.handle_too_many_requests
+    )
 
 
 def _add_middleware(app: FastAPI) -> None:
@@ -44,12 +101,26 @@ def _add_middleware(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["X-CAPTCHA-Required"],
+        expose_headers=["X-CAPTCHA-Required", "Server-Timing", "X-Profile-Id"],
     )
+    app.add_middleware(ServerTimingMiddleware)
+    if settings.db.REPLICA_URLS:
+        app.add_middleware(ReadYourWritesMiddleware)
+    if settings.app.PROFILING_ENABLED and settings.app.PROFILING_TOKEN:
+        app.add_middleware(ProfilingMiddleware)
+    # Outermost, so everything sees the client behind the trusted proxies
+    if settings.app.TRUSTED_PROXIES:
+        app.add_middleware(
+            ProxyHeadersMiddleware, trusted_hosts=settings.app.TRUSTED_PROXIES
+        )
 
 
 def create_app() -> FastAPI:
-    _app = FastAPI(title=settings.app.PROJECT_NAME)
+    _app = FastAPI(
+        title=settings.app.PROJECT_NAME,
+        default_response_class=FastJSONResponse,
+        lifespan=_lifespan,
+    )
 
     _app.include_router(router)
     _add_middleware(_app)
@@ -67,4 +138,6 @@ if __name__ == "__main__":
         reload=settings.app.RELOAD,
         host=settings.app.HOST,
         port=settings.app.PORT,
+        # X-Forwarded-For is only trusted from TRUSTED_PROXIES, see _add_middleware
+        proxy_headers=False,
     )
@@ -1,7 +1,17 @@
 from app.models.achievement import Achievement
 from app.models.base import Base
 from app.models.goal import Goal
+from app.models.goal_period_progress import GoalPeriodProgress
+from app.models.revoked_token import RevokedToken
 from app.models.run import Run
 from app.models.user import User
 
-__all__ = ["Base", "User", "Goal", "Run", "Achievement"]
+__all__ = [
+    "Base",
+    "User",
+    "Goal",
+    "GoalPeriodProgress",
+    "Run",
+    "Achievement",
+    "RevokedToken",
+]
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict
 if TYPE_CHECKING:
     from app.models.user import User
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,18 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Achievement(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "achievements"
+    __table_args__ = (
+        # A goal is completed at most once per period; create_many (ON CONFLICT
+        # DO NOTHING) skips completions awarded concurrently
+        Index(
+            "uq_achievements_goal_period",
+            "user_uuid",
+            text("(meta_data ->> 'goal_id')"),
+            text("(meta_data ->> 'period')"),
+            unique=True,
+            postgresql_where=text("achievement_type = 'GOAL_COMPLETION'"),
+        ),
+    )
 
     user_uuid: Mapped[str] = mapped_column(
         ForeignKey("users.uuid", ondelete="CASCADE"),
@@ -2,9 +2,10 @@ from typing import TYPE_CHECKING
 from uuid import UUID
 
 if TYPE_CHECKING:
+    from app.models.goal_period_progress import GoalPeriodProgress
     from app.models.user import User
 
-from sqlalchemy import Enum, ForeignKey, Integer
+from sqlalchemy import Enum, ForeignKey, Index, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.enums.goal import GoalType, TimePeriod
@@ -13,6 +14,12 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Goal(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "goals"
+    __table_args__ = (
+        # Active goals of a user, looked up for every stored run
+        Index(
+            "ix_goals_user_uuid_active", "user_uuid", postgresql_where=text("is_active")
+        ),
+    )
 
     user_uuid: Mapped[UUID] = mapped_column(
         ForeignKey("users.uuid", ondelete="CASCADE"),
@@ -38,3 +45,6 @@ class Goal(Base, UUIDMixin, TimestampMixin):
     )
 
     user: Mapped["User"] = relationship("User", back_populates="goals")
+    period_progress: Mapped[list["GoalPeriodProgress"]] = relationship(
+        "GoalPeriodProgress", back_populates="goal"
+    )
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from app.models.goal import Goal
+
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.enums.goal import TimePeriod
+from app.models.base import Base, TimestampMixin, UUIDMixin
+
+
+class GoalPeriodProgress(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "goal_period_progress"
+    __table_args__ = (
+        UniqueConstraint(
+            "goal_uuid", "period_start", name="uq_goal_period_progress_goal_period"
+        ),
+    )
+
+    goal_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("goals.uuid", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("users.uuid", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    time_period: Mapped[TimePeriod] = mapped_column(
+        Enum(TimePeriod),
+        nullable=False,
+    )
+    period: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Period identifier e.g. 2025-W48, 2025-M11, 2025",
+    )
+    period_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    period_end: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    value: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        default=0.0,
+        comment="Accumulated distance in km, duration in minutes, or number of runs",
+    )
+    target: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    is_met: Mapped[bool] = mapped_column(
+        default=False,
+        nullable=False,
+    )
+    is_closed: Mapped[bool] = mapped_column(
+        default=False,
+        nullable=False,
+    )
+
+    goal: Mapped["Goal"] = relationship("Goal", back_populates="period_progress")
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDMixin
+
+
+class RevokedToken(Base, UUIDMixin):
+    """Refresh tokens that can't be used anymore, by their jti claim."""
+
+    __tablename__ = "revoked_tokens"
+
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+        comment="Expiry of the token, the row can be deleted after it",
+    )
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict, List
 if TYPE_CHECKING:
     from app.models.user import User
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,11 +13,21 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 
 class Run(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "runs"
+    __table_args__ = (
+        # Runs of a user in a time range or by start time, which is what every
+        # list, statistics and goal query asks for. The sums are read from the
+        # index alone.
+        Index(
+            "ix_runs_user_uuid_start_time",
+            "user_uuid",
+            "start_time",
+            postgresql_include=["distance", "duration"],
+        ),
+    )
 
     user_uuid: Mapped[str] = mapped_column(
         ForeignKey("users.uuid", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     name: Mapped[str] = mapped_column(
         String(255),
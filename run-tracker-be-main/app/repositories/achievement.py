@@ -1,3 +1,8 @@
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+
 from app.models.achievement import Achievement
 from app.repositories.base import BaseRepository
 
@@ -5,3 +10,22 @@ from app.repositories.base import BaseRepository
 class AchievementRepository(BaseRepository[Achievement]):
     def __init__(self, session):
         super().__init__(session, Achievement)
+
+    async def get_awarded_goal_periods(
+        self,
+        user_uuid_from: UUID | None = None,
+        user_uuid_to: UUID | None = None,
+        **params: Any,
+    ) -> set[tuple[str, str]]:
+        """Returns (goal_id, period) pairs of already awarded goal completions."""
+        stmt = select(
+            Achievement.meta_data["goal_id"].astext,
+            Achievement.meta_data["period"].astext,
+        ).filter_by(achievement_type="GOAL_COMPLETION", **params)
+        if user_uuid_from is not None:
+            stmt = stmt.where(Achievement.user_uuid >= user_uuid_from)
+        if user_uuid_to is not None:
+            stmt = stmt.where(Achievement.user_uuid < user_uuid_to)
+
+        result = await self.session.execute(stmt)
+        return {(goal_id, period) for goal_id, period in result.all()}
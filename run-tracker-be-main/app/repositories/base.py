@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, Generic, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import Row, Select, delete, func, insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,16 +17,13 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
 
     async def create_one(self, data: dict) -> ModelType:
-        row: ModelType = self.model(**data)
-        self.session.add(row)
-        await self.session.commit()
-        await self.session.refresh(row)
-        return row
+        query = insert(self.model).values(**data).returning(self.model)
+        result = await self.session.execute(query)
+        return result.scalar_one()
 
     async def create_many(self, data: list[dict]) -> None:
         query = pg_insert(self.model).values(data).on_conflict_do_nothing()
         await self.session.execute(query)
-        await self.session.commit()
 
     async def get_one(
         self,
@@ -46,29 +43,43 @@ class BaseRepository(Generic[ModelType]):
         db_row = result.scalar_one_or_none()
         return db_row
 
-    async def get_many(
+    def _paginate(
         self,
-        page: int = 1,
-        limit: int = 10,
-        filters: list | None = None,
-        options: list | None = None,
-        order_by: list | None = None,
-        **params: Any,
-    ) -> tuple[list[ModelType], int]:
+        query: Select,
+        page: int,
+        limit: int,
+        filters: list | None,
+        order_by: list | None,
+        params: dict[str, Any],
+    ) -> tuple[Select, Select]:
+        """Returns the query of the page and the query counting all matches."""
         offset = (page - 1) * limit
 
         # Base query with filter_by for simple equality filters
-        query = select(self.model).filter_by(**params).offset(offset).limit(limit)
+        query = query.filter_by(**params).offset(offset).limit(limit)
         total_query = select(func.count()).select_from(self.model).filter_by(**params)
 
         # Apply advanced filters
         if filters:
-            for condition in filters:
-                query = query.filter(condition)
-                total_query = total_query.filter(condition)
+            query = query.filter(*filters)
+            total_query = total_query.filter(*filters)
         if order_by:
             query = query.order_by(*order_by)
 
+        return query, total_query
+
+    async def get_many(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: list | None = None,
+        options: list | None = None,
+        order_by: list | None = None,
+        **params: Any,
+    ) -> tuple[list[ModelType], int]:
+        query, total_query = self._paginate(
+            select(self.model), page, limit, filters, order_by, params
+        )
         if options:
             query = query.options(*options)
 
@@ -77,6 +88,33 @@ class BaseRepository(Generic[ModelType]):
         db_rows = result.scalars().all()
         return db_rows, total.scalar()
 
+    async def get_many_rows(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: list | None = None,
+        order_by: list | None = None,
+        **params: Any,
+    ) -> tuple[list[Row], int]:
+        """
+        Like get_many, but selects the table columns and returns plain rows,
+        skipping ORM entity construction and the identity map. Meant for list
+        endpoints that only turn the rows into responses, with the schemas'
+        list TypeAdapters: built once at import, they validate a whole page of
+        rows in a single call.
+        """
+        query, total_query = self._paginate(
+            select(*self.model.__table__.columns),
+            page,
+            limit,
+            filters,
+            order_by,
+            params,
+        )
+        result = await self.session.execute(query)
+        total = await self.session.execute(total_query)
+        return list(result.all()), total.scalar()
+
     async def list_all_by_ids(self, uuids: list[UUID]) -> list[ModelType]:
         if not uuids:
             return []
@@ -105,16 +143,23 @@ class BaseRepository(Generic[ModelType]):
         db_rows = result.scalars().all()
         return db_rows
 
-    async def update_one(self, uuid_: UUID, data: dict) -> ModelType:
-        query = select(self.model).where(self.model.uuid == uuid_)
+    async def update_one(
+        self, uuid_: UUID, data: dict, **params: Any
+    ) -> ModelType | None:
+        """
+        Updates the row in a single UPDATE ... RETURNING. Extra `params` scope
+        the update (e.g. user_uuid for ownership); None if no row matched.
+        """
         data["updated_at"] = datetime.now()
+        query = (
+            update(self.model)
+            .where(self.model.uuid == uuid_)
+            .filter_by(**params)
+            .values(**data)
+            .returning(self.model)
+        )
         result = await self.session.execute(query)
-        obj = result.scalar_one()
-        for key, value in data.items():
-            setattr(obj, key, value)
-        await self.session.commit()
-        await self.session.refresh(obj)
-        return obj
+        return result.scalar_one_or_none()
 
     async def update_one_by_id(self, id_: int, data: dict) -> ModelType:
         query = select(self.model).where(self.model.id == id_)
@@ -123,15 +168,19 @@ class BaseRepository(Generic[ModelType]):
         obj = result.scalar_one()
         for key, value in data.items():
             setattr(obj, key, value)
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(obj)
         return obj
 
-    async def delete_one(self, uuid_: UUID) -> ModelType:
-        query = delete(self.model).where(self.model.uuid == uuid_).returning(self.model)
+    async def delete_one(self, uuid_: UUID, **params: Any) -> ModelType | None:
+        query = (
+            delete(self.model)
+            .where(self.model.uuid == uuid_)
+            .filter_by(**params)
+            .returning(self.model)
+        )
         res = await self.session.execute(query)
-        await self.session.commit()
-        return res.scalar_one()
+        return res.scalar_one_or_none()
 
     async def delete_many(self, filters: list | None = None, **params: Any) -> None:
         query = delete(self.model).filter_by(**params)
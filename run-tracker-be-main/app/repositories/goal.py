@@ -1,7 +1,58 @@
+from uuid import UUID
+
+from sqlalchemy import Row, func, select
+
+from app.core.config import settings
+from app.enums.goal import TimePeriod
 from app.models.goal import Goal
+from app.models.run import Run
 from app.repositories.base import BaseRepository
 
+PERIOD_TRUNC = {
+    TimePeriod.WEEKLY: "week",
+    TimePeriod.MONTHLY: "month",
+    TimePeriod.YEARLY: "year",
+}
+
 
 class GoalRepository(BaseRepository[Goal]):
     def __init__(self, session):
         super().__init__(session, Goal)
+
+    async def get_period_totals(
+        self,
+        time_period: TimePeriod,
+        user_uuid_from: UUID | None = None,
+        user_uuid_to: UUID | None = None,
+    ) -> list[Row]:
+        """
+        Aggregates runs per active goal and per period of the goal's time period,
+        for all users whose uuid falls into [user_uuid_from, user_uuid_to).
+        """
+        # Truncated in the configured zone, like AchievementService.get_periods
+        period_start = func.date_trunc(
+            PERIOD_TRUNC[time_period], Run.start_time, settings.app.TIME_ZONE
+        )
+        stmt = (
+            select(
+                Goal.uuid.label("goal_uuid"),
+                Goal.user_uuid,
+                Goal.goal_type,
+                Goal.target,
+                period_start.label("period_start"),
+                func.sum(Run.distance).label("distance"),
+                func.sum(Run.duration).label("duration"),
+                func.count(Run.uuid).label("runs"),
+                func.max(Run.start_time).label("last_run_at"),
+            )
+            .join(Run, Run.user_uuid == Goal.user_uuid)
+            .where(Goal.is_active.is_(True), Goal.time_period == time_period)
+            .group_by(Goal.uuid, period_start)
+        )
+        if user_uuid_from is not None:
+            stmt = stmt.where(Goal.user_uuid >= user_uuid_from)
+        if user_uuid_to is not None:
+            stmt = stmt.where(Goal.user_uuid < user_uuid_to)
+
+        result = await self.session.execute(stmt)
+        return result.all()
@@ -0,0 +1,254 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import (
+    DateTime,
+    String,
+    case,
+    column,
+    func,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.enums.goal import GoalType, TimePeriod
+from app.models.goal import Goal
+from app.models.goal_period_progress import GoalPeriodProgress
+from app.repositories.base import BaseRepository
+
+PeriodRange = tuple[datetime, datetime, str]
+
+# Column order of the INSERT ... SELECT statements below
+INSERT_COLUMNS = [
+    "uuid",
+    "goal_uuid",
+    "user_uuid",
+    "time_period",
+    "period",
+    "period_start",
+    "period_end",
+    "value",
+    "target",
+    "is_met",
+    "is_closed",
+]
+
+
+def _run_value(distance: float, duration: float, runs: int):
+    """What a run counts towards a goal, by the goal's type."""
+    return case(
+        (Goal.goal_type == GoalType.DISTANCE, distance),
+        (Goal.goal_type == GoalType.DURATION, duration),
+        else_=runs,
+    )
+
+
+class GoalPeriodProgressRepository(BaseRepository[GoalPeriodProgress]):
+    def __init__(self, session):
+        super().__init__(session, GoalPeriodProgress)
+
+    async def add_run(
+        self,
+        user_uuid: UUID,
+        periods: dict[TimePeriod, PeriodRange],
+        distance: float,
+        duration: float,
+        runs: int,
+    ) -> None:
+        """
+        Adds the values of a run to the matching period of every active goal of
+        the user in a single INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+        """
+        value = _run_value(distance, duration, runs)
+
+        def for_period(index: int, type_=None):
+            return case(
+                *(
+                    (Goal.time_period == time_period, literal(period[index], type_))
+                    for time_period, period in periods.items()
+                )
+            )
+
+        source = select(
+            func.gen_random_uuid(),
+            Goal.uuid,
+            Goal.user_uuid,
+            Goal.time_period,
+            for_period(2),
+            for_period(0, DateTime(timezone=True)),
+            for_period(1, DateTime(timezone=True)),
+            value,
+            Goal.target,
+            value >= Goal.target,
+            literal(False),
+        ).where(Goal.user_uuid == user_uuid, Goal.is_active.is_(True))
+
+        stmt = pg_insert(self.model).from_select(INSERT_COLUMNS, source)
+        new_value = self.model.value + stmt.excluded.value
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_goal_period_progress_goal_period",
+            set_={
+                "value": new_value,
+                "is_met": new_value >= self.model.target,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def remove_run(
+        self,
+        user_uuid: UUID,
+        periods: dict[TimePeriod, PeriodRange],
+        distance: float,
+        duration: float,
+        runs: int,
+    ) -> None:
+        """
+        Subtracts the values of a deleted run from the matching period of every
+        active goal of the user in a single UPDATE ... FROM goals. Only existing
+        rows are updated: a goal without a row for the period never counted the
+        run, e.g. one created after it.
+        """
+        period_start = case(
+            *(
+                (
+                    Goal.time_period == time_period,
+                    literal(period[0], DateTime(timezone=True)),
+                )
+                for time_period, period in periods.items()
+            )
+        )
+        new_value = func.greatest(
+            self.model.value - _run_value(distance, duration, runs), 0.0
+        )
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.goal_uuid == Goal.uuid,
+                self.model.period_start == period_start,
+                Goal.user_uuid == user_uuid,
+                Goal.is_active.is_(True),
+            )
+            .values(
+                value=new_value,
+                is_met=new_value >= self.model.target,
+                updated_at=func.now(),
+            )
+        )
+        await self.session.execute(stmt)
+
+    async def upsert_many(self, data: list[dict]) -> None:
+        """Inserts period rows, replacing values of already existing periods."""
+        stmt = pg_insert(self.model).values(data)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_goal_period_progress_goal_period",
+            set_={
+                "value": stmt.excluded.value,
+                "target": stmt.excluded.target,
+                "is_met": stmt.excluded.is_met,
+                "is_closed": stmt.excluded.is_closed,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    def _open_since(self):
+        """
+        Start of a goal's periods without a closed row: the end of its last
+        closed period, or its creation.
+        """
+        last_closed_end = (
+            select(func.max(self.model.period_end))
+            .where(self.model.goal_uuid == Goal.uuid, self.model.is_closed.is_(True))
+            .scalar_subquery()
+        )
+        return func.coalesce(last_closed_end, Goal.created_at)
+
+    async def get_open_since(self, time_period: TimePeriod) -> datetime | None:
+        """
+        Earliest start of the periods not closed yet among the active goals of
+        the given time period, None without such goals.
+        """
+        stmt = select(func.min(self._open_since())).where(
+            Goal.is_active.is_(True), Goal.time_period == time_period
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def create_missing_periods(
+        self, time_period: TimePeriod, periods: list[PeriodRange]
+    ) -> int:
+        """
+        Creates empty rows for active goals that had no run in the given
+        periods, so that missed periods show up in the history. Only periods
+        ending after the goal's last closed period (or its creation) are filled.
+        """
+        if not periods:
+            return 0
+
+        period_values = values(
+            column("period_start", DateTime(timezone=True)),
+            column("period_end", DateTime(timezone=True)),
+            column("period", String),
+            name="periods",
+        ).data(periods)
+        goals = (
+            select(
+                Goal.uuid,
+                Goal.user_uuid,
+                Goal.time_period,
+                Goal.target,
+                self._open_since().label("open_since"),
+            )
+            .where(Goal.is_active.is_(True), Goal.time_period == time_period)
+            .subquery()
+        )
+        source = select(
+            func.gen_random_uuid(),
+            goals.c.uuid,
+            goals.c.user_uuid,
+            goals.c.time_period,
+            period_values.c.period,
+            period_values.c.period_start,
+            period_values.c.period_end,
+            literal(0.0),
+            goals.c.target,
+            literal(False),
+            literal(False),
+        ).join_from(
+            goals, period_values, period_values.c.period_end > goals.c.open_since
+        )
+        stmt = (
+            pg_insert(self.model)
+            .from_select(INSERT_COLUMNS, source)
+            .on_conflict_do_nothing(constraint="uq_goal_period_progress_goal_period")
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def close_periods(self, before: datetime) -> int:
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.is_closed.is_(False),
+                self.model.period_end <= literal(before, DateTime(timezone=True)),
+            )
+            .values(is_closed=True, updated_at=func.now())
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def get_history(
+        self, user_uuid: UUID, goal_uuid: UUID, limit: int
+    ) -> list[GoalPeriodProgress]:
+        stmt = (
+            select(self.model)
+            .where(self.model.goal_uuid == goal_uuid, self.model.user_uuid == user_uuid)
+            .order_by(self.model.period_start.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
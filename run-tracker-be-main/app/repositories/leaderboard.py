@@ -1,8 +1,9 @@
 from datetime import datetime
+from functools import cache
 from typing import Any, List, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import Select, and_, bindparam, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.run import Run
@@ -10,6 +11,65 @@ from app.models.user import User
 from app.schemas.leaderboard import LeaderboardMetric
 
 
+def _get_metric_expression(metric: LeaderboardMetric) -> Any:
+    if metric == LeaderboardMetric.DISTANCE:
+        return func.coalesce(func.sum(Run.distance), 0)
+    elif metric == LeaderboardMetric.DURATION:
+        return func.coalesce(func.sum(Run.duration), 0)
+    elif metric == LeaderboardMetric.RUNS:
+        return func.count(Run.uuid)
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
+
+
+@cache
+def _ranking_statement(
+    metric: LeaderboardMetric, has_start_date: bool, has_end_date: bool
+) -> Select:
+    """
+    Ranking of all users by `metric`, with the date range as bind parameters.
+    Built once per shape, so executions skip construction and cache keying.
+    """
+    value_expr = _get_metric_expression(metric)
+
+    # Build join conditions
+    join_conditions = [User.uuid == Run.user_uuid]
+    if has_start_date:
+        join_conditions.append(Run.start_time >= bindparam("start_date"))
+    if has_end_date:
+        join_conditions.append(Run.start_time <= bindparam("end_date"))
+
+    return (
+        select(
+            User.uuid.label("user_uuid"),
+            User.username,
+            value_expr.label("value"),
+            func.rank().over(order_by=desc(value_expr)).label("rank"),
+        )
+        .outerjoin(Run, and_(*join_conditions))
+        .group_by(User.uuid, User.username)
+    )
+
+
+@cache
+def _leaderboard_statement(
+    metric: LeaderboardMetric, has_start_date: bool, has_end_date: bool
+) -> Select:
+    return (
+        _ranking_statement(metric, has_start_date, has_end_date)
+        .order_by(desc("value"))
+        .limit(bindparam("limit"))
+    )
+
+
+@cache
+def _user_entry_statement(
+    metric: LeaderboardMetric, has_start_date: bool, has_end_date: bool
+) -> Select:
+    subquery = _ranking_statement(metric, has_start_date, has_end_date).subquery()
+    return select(subquery).where(subquery.c.user_uuid == bindparam("user_uuid"))
+
+
 class LeaderboardRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -21,29 +81,12 @@ class LeaderboardRepository:
         end_date: Optional[datetime] = None,
         limit: int = 50,
     ) -> List[dict]:
-        value_expr = self._get_metric_expression(metric)
-
-        # Build join conditions
-        join_conditions = [User.uuid == Run.user_uuid]
-        if start_date:
-            join_conditions.append(Run.start_time >= start_date)
-        if end_date:
-            join_conditions.append(Run.start_time <= end_date)
-
-        stmt = (
-            select(
-                User.uuid.label("user_uuid"),
-                User.username,
-                value_expr.label("value"),
-                func.rank().over(order_by=desc(value_expr)).label("rank"),
-            )
-            .outerjoin(Run, and_(*join_conditions))
-            .group_by(User.uuid, User.username)
-            .order_by(desc("value"))
-            .limit(limit)
+        stmt = _leaderboard_statement(
+            metric, start_date is not None, end_date is not None
         )
+        params = {"start_date": start_date, "end_date": end_date, "limit": limit}
 
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(stmt, params)
         return result.all()
 
     async def get_user_entry(
@@ -53,39 +96,14 @@ class LeaderboardRepository:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> Optional[dict]:
-        value_expr = self._get_metric_expression(metric)
-
-        # Build join conditions
-        join_conditions = [User.uuid == Run.user_uuid]
-        if start_date:
-            join_conditions.append(Run.start_time >= start_date)
-        if end_date:
-            join_conditions.append(Run.start_time <= end_date)
-
-        subquery = (
-            select(
-                User.uuid.label("user_uuid"),
-                User.username,
-                value_expr.label("value"),
-                func.rank().over(order_by=desc(value_expr)).label("rank"),
-            )
-            .outerjoin(Run, and_(*join_conditions))
-            .group_by(User.uuid, User.username)
+        stmt = _user_entry_statement(
+            metric, start_date is not None, end_date is not None
         )
+        params = {
+            "user_uuid": user_uuid,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
 
-        subquery = subquery.subquery()
-
-        stmt = select(subquery).where(subquery.c.user_uuid == user_uuid)
-
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(stmt, params)
         return result.one_or_none()
-
-    def _get_metric_expression(self, metric: LeaderboardMetric) -> Any:
-        if metric == LeaderboardMetric.DISTANCE:
-            return func.coalesce(func.sum(Run.distance), 0)
-        elif metric == LeaderboardMetric.DURATION:
-            return func.coalesce(func.sum(Run.duration), 0)
-        elif metric == LeaderboardMetric.RUNS:
-            return func.count(Run.uuid)
-        else:
-            raise ValueError(f"Unknown metric: {metric}")
@@ -0,0 +1,872 @@
+"""
+In-memory counterparts of the repositories, used with InMemoryUnitOfWork to run
+the services without a database, e.g. to measure their pure Python cost.
+
+Rows are model instances kept in dicts by uuid. Tables can also keep them in
+arrays per key sorted by a column (runs per user by start time), which the
+aggregate queries slice with bisect. Naive datetimes are taken as UTC, like
+asyncpg binds them, and the date_trunc/date/to_char results are computed in the
+configured TIME_ZONE, the database session time zone.
+"""
+
+import operator
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Generic, Hashable, NamedTuple, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import (
+    BinaryExpression,
+    BindParameter,
+    BooleanClauseList,
+    ColumnElement,
+    False_,
+    Null,
+    True_,
+    UnaryExpression,
+)
+
+from app.core.config import settings
+from app.core.unit_of_work import ABCUnitOfWork
+from app.enums.goal import GoalType, TimePeriod
+from app.models import (
+    Achievement,
+    Base,
+    Goal,
+    GoalPeriodProgress,
+    RevokedToken,
+    Run,
+    User,
+)
+from app.repositories.goal import PERIOD_TRUNC
+from app.repositories.goal_period_progress import PeriodRange
+from app.schemas.leaderboard import LeaderboardMetric
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+class RunStatistics(NamedTuple):
+    total_distance: float | None
+    total_duration: float | None
+    total_workouts: int
+    longest_distance: float | None
+    longest_duration: float | None
+    fastest_pace: float | None
+
+
+class RunAggregate(NamedTuple):
+    label: str
+    distance: float
+    duration: float
+    count: int
+
+
+class GoalPeriodTotals(NamedTuple):
+    goal_uuid: UUID
+    user_uuid: UUID
+    goal_type: GoalType
+    target: int
+    period_start: datetime
+    distance: float
+    duration: float
+    runs: int
+    last_run_at: datetime
+
+
+class LeaderboardRow(NamedTuple):
+    user_uuid: UUID
+    username: str | None
+    value: float
+    rank: int
+
+
+def _aware(value: Any) -> Any:
+    """Makes naive datetimes aware in UTC, comparable with stored ones."""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _date_trunc(unit: str, value: datetime) -> datetime:
+    local = value.astimezone(settings.app.zone)
+    truncated = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if unit == "week":
+        truncated -= timedelta(days=truncated.weekday())
+    elif unit == "month":
+        truncated = truncated.replace(day=1)
+    elif unit == "year":
+        truncated = truncated.replace(month=1, day=1)
+    elif unit != "day":
+        raise ValueError(f"Unsupported date_trunc unit: {unit}")
+    return truncated
+
+
+def _to_char(value: datetime, fmt: str) -> str:
+    return value.strftime(
+        fmt.replace("YYYY", "%Y").replace("MM", "%m").replace("DD", "%d")
+    )
+
+
+def _sum(values: Iterable[float]) -> float | None:
+    """SUM: None for no rows."""
+    values = list(values)
+    return sum(values) if values else None
+
+
+# Comparisons of filters, NULL never compares true like in SQL
+_COMPARISONS: dict[Any, Callable[[Any, Any], bool]] = {
+    operators.eq: operator.eq,
+    operators.ne: operator.ne,
+    operators.lt: operator.lt,
+    operators.le: operator.le,
+    operators.gt: operator.gt,
+    operators.ge: operator.ge,
+    operators.in_op: lambda value, values: value in values,
+    operators.not_in_op: lambda value, values: value not in values,
+}
+_IDENTITIES: dict[Any, Callable[[Any, Any], bool]] = {
+    operators.is_: operator.eq,
+    operators.is_not: operator.ne,
+}
+
+
+def _compile_operand(element: Any) -> Callable[[Any], Any]:
+    if isinstance(element, BindParameter):
+        value = element.effective_value
+        if isinstance(value, (list, tuple)):
+            value = {_aware(item) for item in value}
+        else:
+            value = _aware(value)
+        return lambda row: value
+    if isinstance(element, (True_, False_, Null)):
+        value = {True_: True, False_: False, Null: None}[type(element)]
+        return lambda row: value
+    if isinstance(element, ColumnElement) and element.key is not None:
+        return attrgetter(element.key)
+    raise NotImplementedError(f"Unsupported expression in memory: {element}")
+
+
+def compile_filter(clause: Any) -> Callable[[Any], bool]:
+    """
+    Turns a filter condition (comparisons of columns with values, IN, IS and
+    their AND/OR) into a predicate on rows.
+    """
+    if isinstance(clause, BooleanClauseList):
+        predicates = [compile_filter(c) for c in clause.clauses]
+        combine = all if clause.operator is operators.and_ else any
+        return lambda row: combine(predicate(row) for predicate in predicates)
+
+    if isinstance(clause, BinaryExpression):
+        left = _compile_operand(clause.left)
+        right = _compile_operand(clause.right)
+        if clause.operator in _IDENTITIES:
+            identity = _IDENTITIES[clause.operator]
+            return lambda row: identity(left(row), right(row))
+        compare = _COMPARISONS.get(clause.operator)
+        if compare is not None:
+
+            def predicate(row: Any) -> bool:
+                a, b = left(row), right(row)
+                return a is not None and b is not None and compare(a, b)
+
+            return predicate
+
+    raise NotImplementedError(f"Unsupported filter in memory: {clause}")
+
+
+def _sort(rows: list, order_by: list) -> list:
+    """Sorts like ORDER BY, NULLs last ascending and first descending."""
+    for clause in reversed(order_by):
+        descending = False
+        if isinstance(clause, UnaryExpression):
+            descending = clause.modifier is operators.desc_op
+            clause = clause.element
+        get = _compile_operand(getattr(clause, "__clause_element__", lambda: clause)())
+        rows.sort(
+            key=lambda row: (get(row) is None, get(row)),
+            reverse=descending,
+        )
+    return rows
+
+
+class InMemoryTable(Generic[ModelType]):
+    """
+    Rows of a table by uuid. With `group_by` rows are also kept in arrays per
+    value of that column, sorted by `sort_by`; `unique` columns are kept in a
+    dict, an insert conflicting with them (or with the uuid) is skipped.
+    """
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        group_by: str | None = None,
+        sort_by: str | None = None,
+        unique: tuple[str, ...] = (),
+    ) -> None:
+        self.model = model
+        self.group_by = group_by
+        self.sort_by = sort_by
+        self.unique = unique
+        self.rows: dict[UUID, ModelType] = {}
+        self._groups: defaultdict[Hashable, list[ModelType]] = defaultdict(list)
+        self._unique: dict[tuple, ModelType] = {}
+        self._sort_key = attrgetter(sort_by) if sort_by else None
+        self._defaults = {
+            column.key: column.default
+            for column in model.__table__.columns
+            if column.default is not None
+        }
+        self._server_defaults = [
+            column.key
+            for column in model.__table__.columns
+            if column.server_default is not None
+        ]
+
+    def insert(self, data: dict) -> ModelType | None:
+        """Stores a row with the column defaults filled in, None on a conflict."""
+        values = {key: _aware(value) for key, value in data.items()}
+        for key, default in self._defaults.items():
+            if values.get(key) is None:
+                values[key] = default.arg(None) if default.is_callable else default.arg
+        now = datetime.now(timezone.utc)
+        for key in self._server_defaults:
+            values.setdefault(key, now)
+
+        unique_key = tuple(values[column] for column in self.unique)
+        if values["uuid"] in self.rows or unique_key in self._unique:
+            return None
+
+        row = self.model(**values)
+        self.rows[row.uuid] = row
+        if self.unique:
+            self._unique[unique_key] = row
+        if self.group_by:
+            self._add_to_group(row)
+        return row
+
+    def update(self, row: ModelType, data: dict) -> ModelType:
+        regroup = self.group_by and ({self.group_by, self.sort_by} & data.keys())
+        if regroup:
+            self._groups[getattr(row, self.group_by)].remove(row)
+        if self.unique:
+            del self._unique[self._unique_key(row)]
+
+        for key, value in data.items():
+            setattr(row, key, _aware(value))
+
+        if self.unique:
+            self._unique[self._unique_key(row)] = row
+        if regroup:
+            self._add_to_group(row)
+        return row
+
+    def delete(self, row: ModelType) -> None:
+        del self.rows[row.uuid]
+        if self.unique:
+            del self._unique[self._unique_key(row)]
+        if self.group_by:
+            self._groups[getattr(row, self.group_by)].remove(row)
+
+    def get_unique(self, *values: Any) -> ModelType | None:
+        return self._unique.get(tuple(_aware(value) for value in values))
+
+    def group(self, key: Hashable) -> list[ModelType]:
+        """Rows whose `group_by` column equals key, sorted by `sort_by`."""
+        return self._groups.get(key, [])
+
+    def range(
+        self,
+        key: Hashable,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        end_inclusive: bool = False,
+    ) -> list[ModelType]:
+        """Rows of the group with `sort_by` in [start, end) (or [start, end])."""
+        rows = self.group(key)
+        low = (
+            0 if start is None else bisect_left(rows, _aware(start), key=self._sort_key)
+        )
+        if end is None:
+            high = len(rows)
+        else:
+            bisect = bisect_right if end_inclusive else bisect_left
+            high = bisect(rows, _aware(end), key=self._sort_key)
+        return rows[low:high]
+
+    def _add_to_group(self, row: ModelType) -> None:
+        group = self._groups[getattr(row, self.group_by)]
+        if self._sort_key:
+            insort(group, row, key=self._sort_key)
+        else:
+            group.append(row)
+
+    def _unique_key(self, row: ModelType) -> tuple:
+        return tuple(getattr(row, column) for column in self.unique)
+
+
+class InMemoryStore:
+    """The tables of the app, deleting a row cascades like the foreign keys."""
+
+    def __init__(self) -> None:
+        self.users = InMemoryTable(User, unique=("email",))
+        self.goals = InMemoryTable(Goal, group_by="user_uuid")
+        self.goal_progress = InMemoryTable(
+            GoalPeriodProgress,
+            group_by="goal_uuid",
+            sort_by="period_start",
+            unique=("goal_uuid", "period_start"),
+        )
+        self.runs = InMemoryTable(Run, group_by="user_uuid", sort_by="start_time")
+        self.achievements = InMemoryTable(Achievement, group_by="user_uuid")
+        self.revoked_tokens = InMemoryTable(RevokedToken)
+
+        tables = [
+            self.users,
+            self.goals,
+            self.goal_progress,
+            self.runs,
+            self.achievements,
+            self.revoked_tokens,
+        ]
+        # Child tables and their columns referencing each table ON DELETE CASCADE
+        self._cascades: dict[InMemoryTable, list[tuple[InMemoryTable, str]]] = {
+            parent: [
+                (child, column.key)
+                for child in tables
+                for column in child.model.__table__.columns
+                for fk in column.foreign_keys
+                if fk.column.table is parent.model.__table__
+                and fk.ondelete == "CASCADE"
+            ]
+            for parent in tables
+        }
+
+    def delete(self, table: InMemoryTable, row: Base) -> None:
+        table.delete(row)
+        for child, column in self._cascades[table]:
+            if child.group_by == column:
+                children = list(child.group(row.uuid))
+            else:
+                children = [
+                    r for r in child.rows.values() if getattr(r, column) == row.uuid
+                ]
+            for child_row in children:
+                self.delete(child, child_row)
+
+
+class InMemoryRepository(Generic[ModelType]):
+    """BaseRepository over an InMemoryTable, filters are evaluated in Python."""
+
+    def __init__(self, store: InMemoryStore, table: InMemoryTable[ModelType]) -> None:
+        self.store = store
+        self.table = table
+        self.model = table.model
+
+    async def create_one(self, data: dict) -> ModelType:
+        row = self.table.insert(data)
+        if row is None:
+            raise ValueError(f"Duplicate {self.model.__name__}: {data}")
+        return row
+
+    async def create_many(self, data: list[dict]) -> None:
+        for values in data:
+            self.table.insert(values)
+
+    async def get_one(
+        self,
+        filters: list | None = None,
+        options: list | None = None,
+        **params: Any,
+    ) -> ModelType | None:
+        rows = self._select(filters, **params)
+        return rows[0] if rows else None
+
+    async def get_many(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: list | None = None,
+        options: list | None = None,
+        order_by: list | None = None,
+        **params: Any,
+    ) -> tuple[list[ModelType], int]:
+        rows = self._select(filters, **params)
+        if order_by:
+            _sort(rows, order_by)
+        offset = (page - 1) * limit
+        return rows[offset : offset + limit], len(rows)
+
+    async def get_many_rows(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: list | None = None,
+        order_by: list | None = None,
+        **params: Any,
+    ) -> tuple[list[ModelType], int]:
+        return await self.get_many(
+            page=page, limit=limit, filters=filters, order_by=order_by, **params
+        )
+
+    async def list_all_by_ids(self, uuids: list[UUID]) -> list[ModelType]:
+        return [self.table.rows[uuid_] for uuid_ in uuids if uuid_ in self.table.rows]
+
+    async def get_all(
+        self,
+        filters: list | None = None,
+        order_by: list | None = None,
+        **params: Any,
+    ) -> list[ModelType]:
+        rows = self._select(filters, **params)
+        return _sort(rows, order_by) if order_by else rows
+
+    async def update_one(
+        self, uuid_: UUID, data: dict, **params: Any
+    ) -> ModelType | None:
+        row = self._get_by_uuid(uuid_, **params)
+        if row is None:
+            return None
+        data["updated_at"] = datetime.now()
+        return self.table.update(row, data)
+
+    async def delete_one(self, uuid_: UUID, **params: Any) -> ModelType | None:
+        row = self._get_by_uuid(uuid_, **params)
+        if row is not None:
+            self.store.delete(self.table, row)
+        return row
+
+    async def delete_many(self, filters: list | None = None, **params: Any) -> None:
+        for row in self._select(filters, **params):
+            self.store.delete(self.table, row)
+
+    def _get_by_uuid(self, uuid_: UUID, **params: Any) -> ModelType | None:
+        row = self.table.rows.get(uuid_)
+        if row is None or any(getattr(row, k) != v for k, v in params.items()):
+            return None
+        return row
+
+    def _select(self, filters: list | None = None, **params: Any) -> list[ModelType]:
+        """Rows matching `filter_by(**params)` and `filters`."""
+        if "uuid" in params:
+            row = self.table.rows.get(params["uuid"])
+            rows = [] if row is None else [row]
+        elif self.table.group_by in params:
+            rows = self.table.group(params[self.table.group_by])
+        else:
+            rows = self.table.rows.values()
+
+        predicates = [compile_filter(condition) for condition in filters or ()]
+        params = {key: _aware(value) for key, value in params.items()}
+        return [
+            row
+            for row in rows
+            if all(getattr(row, key) == value for key, value in params.items())
+            and all(predicate(row) for predicate in predicates)
+        ]
+
+
+class InMemoryUserRepository(InMemoryRepository[User]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.users)
+
+    async def get_by_uuid(self, uuid_: UUID) -> User | None:
+        return self.table.rows.get(uuid_)
+
+    async def get_by_email(self, email: str) -> User | None:
+        return self.table.get_unique(email)
+
+    async def email_exists(self, email: str) -> bool:
+        return self.table.get_unique(email) is not None
+
+
+class InMemoryRunRepository(InMemoryRepository[Run]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.runs)
+
+    async def get_totals_for_ranges(
+        self,
+        user_uuid: UUID,
+        ranges: dict[Hashable, tuple[datetime, datetime]],
+    ) -> dict[Hashable, tuple[float | None, float | None, int]]:
+        totals = {}
+        for key, (start_date, end_date) in ranges.items():
+            runs = self.table.range(user_uuid, start_date, end_date)
+            totals[key] = (
+                _sum(run.distance for run in runs),
+                _sum(run.duration for run in runs),
+                len(runs),
+            )
+        return totals
+
+    async def get_statistics(self, user_uuid: UUID) -> RunStatistics:
+        runs = self.table.group(user_uuid)
+        if not runs:
+            return RunStatistics(None, None, 0, None, None, None)
+        paces = [run.duration / run.distance for run in runs if run.distance > 0]
+        return RunStatistics(
+            total_distance=sum(run.distance for run in runs),
+            total_duration=sum(run.duration for run in runs),
+            total_workouts=len(runs),
+            longest_distance=max(run.distance for run in runs),
+            longest_duration=max(run.duration for run in runs),
+            fastest_pace=min(paces, default=None),
+        )
+
+    async def get_run_dates(self, user_uuid: UUID) -> list[date]:
+        dates = {
+            run.start_time.astimezone(settings.app.zone).date()
+            for run in self.table.group(user_uuid)
+        }
+        return sorted(dates, reverse=True)
+
+    async def get_aggregates(
+        self, user_uuid: UUID, start_date: datetime, group_by: str, label_fmt: str
+    ) -> list[RunAggregate]:
+        groups: defaultdict[str, list[Run]] = defaultdict(list)
+        for run in self.table.range(user_uuid, start_date):
+            label = _to_char(_date_trunc(group_by, run.start_time), label_fmt)
+            groups[label].append(run)
+        return [
+            RunAggregate(
+                label=label,
+                distance=sum(run.distance for run in runs),
+                duration=sum(run.duration for run in runs),
+                count=len(runs),
+            )
+            for label, runs in sorted(groups.items())
+        ]
+
+
+class InMemoryGoalRepository(InMemoryRepository[Goal]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.goals)
+
+    async def get_period_totals(
+        self,
+        time_period: TimePeriod,
+        user_uuid_from: UUID | None = None,
+        user_uuid_to: UUID | None = None,
+    ) -> list[GoalPeriodTotals]:
+        unit = PERIOD_TRUNC[time_period]
+        # Runs of each user by period, shared by the user's goals
+        user_periods: dict[UUID, dict[datetime, list[Run]]] = {}
+        rows = []
+        for goal in self.table.rows.values():
+            if not goal.is_active or goal.time_period != time_period:
+                continue
+            if user_uuid_from is not None and goal.user_uuid < user_uuid_from:
+                continue
+            if user_uuid_to is not None and goal.user_uuid >= user_uuid_to:
+                continue
+
+            periods = user_periods.get(goal.user_uuid)
+            if periods is None:
+                periods = user_periods[goal.user_uuid] = defaultdict(list)
+                for run in self.store.runs.group(goal.user_uuid):
+                    periods[_date_trunc(unit, run.start_time)].append(run)
+            rows.extend(
+                GoalPeriodTotals(
+                    goal_uuid=goal.uuid,
+                    user_uuid=goal.user_uuid,
+                    goal_type=goal.goal_type,
+                    target=goal.target,
+                    period_start=period_start,
+                    distance=sum(run.distance for run in runs),
+                    duration=sum(run.duration for run in runs),
+                    runs=len(runs),
+                    last_run_at=runs[-1].start_time,
+                )
+                for period_start, runs in periods.items()
+            )
+        return rows
+
+
+class InMemoryGoalPeriodProgressRepository(InMemoryRepository[GoalPeriodProgress]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.goal_progress)
+
+    async def add_run(
+        self,
+        user_uuid: UUID,
+        periods: dict[TimePeriod, PeriodRange],
+        distance: float,
+        duration: float,
+        runs: int,
+    ) -> None:
+        values = {
+            GoalType.DISTANCE: distance,
+            GoalType.DURATION: duration,
+            GoalType.NUMBER_OF_RUNS: runs,
+        }
+        for goal in self.store.goals.group(user_uuid):
+            if not goal.is_active:
+                continue
+            value = values[goal.goal_type]
+            period_start, period_end, period = periods[goal.time_period]
+            row = self.table.get_unique(goal.uuid, period_start)
+            if row is not None:
+                new_value = row.value + value
+                self.table.update(
+                    row,
+                    {
+                        "value": new_value,
+                        "is_met": new_value >= row.target,
+                        "updated_at": datetime.now(),
+                    },
+                )
+                continue
+
+            self.table.insert(
+                {
+                    "goal_uuid": goal.uuid,
+                    "user_uuid": goal.user_uuid,
+                    "time_period": goal.time_period,
+                    "period": period,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "value": value,
+                    "target": goal.target,
+                    "is_met": value >= goal.target,
+                    "is_closed": False,
+                }
+            )
+
+    async def remove_run(
+        self,
+        user_uuid: UUID,
+        periods: dict[TimePeriod, PeriodRange],
+        distance: float,
+        duration: float,
+        runs: int,
+    ) -> None:
+        values = {
+            GoalType.DISTANCE: distance,
+            GoalType.DURATION: duration,
+            GoalType.NUMBER_OF_RUNS: runs,
+        }
+        for goal in self.store.goals.group(user_uuid):
+            if not goal.is_active:
+                continue
+            row = self.table.get_unique(goal.uuid, periods[goal.time_period][0])
+            if row is None:
+                continue
+            new_value = max(row.value - values[goal.goal_type], 0.0)
+            self.table.update(
+                row,
+                {
+                    "value": new_value,
+                    "is_met": new_value >= row.target,
+                    "updated_at": datetime.now(),
+                },
+            )
+
+    async def upsert_many(self, data: list[dict]) -> None:
+        for values in data:
+            row = self.table.get_unique(values["goal_uuid"], values["period_start"])
+            if row is None:
+                self.table.insert(values)
+                continue
+            self.table.update(
+                row,
+                {
+                    "value": values["value"],
+                    "target": values["target"],
+                    "is_met": values["is_met"],
+                    "is_closed": values["is_closed"],
+                    "updated_at": datetime.now(),
+                },
+            )
+
+    def _open_since(self, goal: Goal) -> datetime:
+        closed_ends = [
+            row.period_end for row in self.table.group(goal.uuid) if row.is_closed
+        ]
+        return max(closed_ends, default=goal.created_at)
+
+    async def get_open_since(self, time_period: TimePeriod) -> datetime | None:
+        return min(
+            (
+                self._open_since(goal)
+                for goal in self.store.goals.rows.values()
+                if goal.is_active and goal.time_period == time_period
+            ),
+            default=None,
+        )
+
+    async def create_missing_periods(
+        self, time_period: TimePeriod, periods: list[PeriodRange]
+    ) -> int:
+        created = 0
+        for goal in list(self.store.goals.rows.values()):
+            if not goal.is_active or goal.time_period != time_period:
+                continue
+            open_since = self._open_since(goal)
+            for start_date, end_date, period_identifier in periods:
+                if _aware(end_date) <= open_since:
+                    continue
+                row = self.table.insert(
+                    {
+                        "goal_uuid": goal.uuid,
+                        "user_uuid": goal.user_uuid,
+                        "time_period": goal.time_period,
+                        "period": period_identifier,
+                        "period_start": start_date,
+                        "period_end": end_date,
+                        "value": 0.0,
+                        "target": goal.target,
+                        "is_met": False,
+                        "is_closed": False,
+                    }
+                )
+                created += row is not None
+        return created
+
+    async def close_periods(self, before: datetime) -> int:
+        before = _aware(before)
+        rows = [
+            row
+            for row in self.table.rows.values()
+            if not row.is_closed and row.period_end <= before
+        ]
+        for row in rows:
+            self.table.update(row, {"is_closed": True, "updated_at": datetime.now()})
+        return len(rows)
+
+    async def get_history(
+        self, user_uuid: UUID, goal_uuid: UUID, limit: int
+    ) -> list[GoalPeriodProgress]:
+        rows = [
+            row for row in self.table.group(goal_uuid) if row.user_uuid == user_uuid
+        ]
+        return rows[::-1][:limit]
+
+
+class InMemoryAchievementRepository(InMemoryRepository[Achievement]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.achievements)
+
+    async def get_awarded_goal_periods(
+        self,
+        user_uuid_from: UUID | None = None,
+        user_uuid_to: UUID | None = None,
+        **params: Any,
+    ) -> set[tuple[str, str]]:
+        awarded = set()
+        for row in self._select(achievement_type="GOAL_COMPLETION", **params):
+            if user_uuid_from is not None and row.user_uuid < user_uuid_from:
+                continue
+            if user_uuid_to is not None and row.user_uuid >= user_uuid_to:
+                continue
+            awarded.add((str(row.meta_data["goal_id"]), str(row.meta_data["period"])))
+        return awarded
+
+
+METRIC_VALUES: dict[LeaderboardMetric, Callable[[list[Run]], float]] = {
+    LeaderboardMetric.DISTANCE: lambda runs: sum(run.distance for run in runs),
+    LeaderboardMetric.DURATION: lambda runs: sum(run.duration for run in runs),
+    LeaderboardMetric.RUNS: len,
+}
+
+
+class InMemoryLeaderboardRepository:
+    def __init__(self, store: InMemoryStore) -> None:
+        self.store = store
+
+    async def get_leaderboard(
+        self,
+        metric: LeaderboardMetric,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        limit: int = 50,
+    ) -> list[LeaderboardRow]:
+        return self._ranking(metric, start_date, end_date)[:limit]
+
+    async def get_user_entry(
+        self,
+        user_uuid: UUID,
+        metric: LeaderboardMetric,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> LeaderboardRow | None:
+        for row in self._ranking(metric, start_date, end_date):
+            if row.user_uuid == user_uuid:
+                return row
+        return None
+
+    def _ranking(
+        self,
+        metric: LeaderboardMetric,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> list[LeaderboardRow]:
+        """All users by `metric` descending, ranked like rank() (ties share a rank)."""
+        value = METRIC_VALUES.get(metric)
+        if value is None:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        values = sorted(
+            (
+                (
+                    value(
+                        self.store.runs.range(
+                            user.uuid, start_date, end_date, end_inclusive=True
+                        )
+                    ),
+                    user,
+                )
+                for user in self.store.users.rows.values()
+            ),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+
+        ranking = []
+        rank = 0
+        for position, (user_value, user) in enumerate(values, start=1):
+            if position == 1 or user_value != values[position - 2][0]:
+                rank = position
+            ranking.append(LeaderboardRow(user.uuid, user.username, user_value, rank))
+        return ranking
+
+
+class InMemoryRevokedTokenRepository(InMemoryRepository[RevokedToken]):
+    def __init__(self, store: InMemoryStore) -> None:
+        super().__init__(store, store.revoked_tokens)
+
+    async def revoke(self, jti: UUID, expires_at: datetime) -> bool:
+        return self.table.insert({"uuid": jti, "expires_at": expires_at}) is not None
+
+    async def delete_expired(self, before: datetime) -> int:
+        before = _aware(before)
+        rows = [row for row in self.table.rows.values() if row.expires_at <= before]
+        for row in rows:
+            self.table.delete(row)
+        return len(rows)
+
+
+class InMemoryUnitOfWork(ABCUnitOfWork):
+    """
+    Unit of work over an InMemoryStore, running the services without a database
+    (e.g. to benchmark their pure Python cost). Changes apply immediately, there
+    is no transaction to commit or roll back.
+    """
+
+    def __init__(self, store: InMemoryStore | None = None) -> None:
+        self.store = store or InMemoryStore()
+        self.user = InMemoryUserRepository(self.store)
+        self.goal = InMemoryGoalRepository(self.store)
+        self.goal_progress = InMemoryGoalPeriodProgressRepository(self.store)
+        self.run = InMemoryRunRepository(self.store)
+        self.achievement = InMemoryAchievementRepository(self.store)
+        self.leaderboard = InMemoryLeaderboardRepository(self.store)
+        self.revoked_token = InMemoryRevokedTokenRepository(self.store)
+
+    async def __aenter__(self) -> "ABCUnitOfWork":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
@@ -0,0 +1,33 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models.revoked_token import RevokedToken
+from app.repositories.base import BaseRepository
+
+
+class RevokedTokenRepository(BaseRepository[RevokedToken]):
+    def __init__(self, session):
+        super().__init__(session, RevokedToken)
+
+    async def revoke(self, jti: UUID, expires_at: datetime) -> bool:
+        """
+        Revokes the token in a single INSERT ... ON CONFLICT DO NOTHING.
+        Returns False if it was revoked already, so of concurrent revocations
+        of the same token only one succeeds.
+        """
+        stmt = (
+            pg_insert(self.model)
+            .values(uuid=jti, expires_at=expires_at)
+            .on_conflict_do_nothing()
+            .returning(self.model.uuid)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def delete_expired(self, before: datetime) -> int:
+        stmt = delete(self.model).where(self.model.expires_at <= before)
+        result = await self.session.execute(stmt)
+        return result.rowcount
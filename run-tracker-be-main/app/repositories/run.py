@@ -1,7 +1,107 @@
+from datetime import date, datetime
+from functools import cache
+from typing import Any, Hashable
+from uuid import UUID
+
+from sqlalchemy import Row, Select, and_, bindparam, desc, func, select
+
 from app.models.run import Run
 from app.repositories.base import BaseRepository
 
+# Statement templates of the statistics queries. They are built once, so each
+# execution skips constructing the statement and generating its cache key.
+# Runs are counted with count(*): the columns used are all in the
+# ix_runs_user_uuid_start_time index, which answers them without the table.
+STATISTICS = select(
+    func.sum(Run.distance).label("total_distance"),
+    func.sum(Run.duration).label("total_duration"),
+    func.count().label("total_workouts"),
+    func.max(Run.distance).label("longest_distance"),
+    func.max(Run.duration).label("longest_duration"),
+    func.min(Run.duration / Run.distance)
+    .filter(Run.distance > 0)
+    .label("fastest_pace"),
+).where(Run.user_uuid == bindparam("user_uuid"))
+
+RUN_DATES = (
+    select(func.date(Run.start_time))
+    .where(Run.user_uuid == bindparam("user_uuid"))
+    .distinct()
+    .order_by(desc(func.date(Run.start_time)))
+)
+
+
+@cache
+def _aggregates_statement(group_by: str, label_fmt: str) -> Select:
+    date_trunc = func.date_trunc(group_by, Run.start_time)
+    return (
+        select(
+            func.to_char(date_trunc, label_fmt).label("label"),
+            func.sum(Run.distance).label("distance"),
+            func.sum(Run.duration).label("duration"),
+            func.count().label("count"),
+        )
+        .where(
+            Run.user_uuid == bindparam("user_uuid"),
+            Run.start_time >= bindparam("start_date"),
+        )
+        .group_by("label")
+        .order_by("label")
+    )
+
 
 class RunRepository(BaseRepository[Run]):
     def __init__(self, session):
         super().__init__(session, Run)
+
+    async def get_totals_for_ranges(
+        self,
+        user_uuid: UUID,
+        ranges: dict[Hashable, tuple[datetime, datetime]],
+    ) -> dict[Hashable, tuple[float | None, float | None, int]]:
+        """
+        Sums distance, duration and number of runs of a user for several
+        [start, end) ranges at once, using one FILTERed aggregate per range.
+        """
+        columns: list[Any] = []
+        for start_date, end_date in ranges.values():
+            in_range = and_(Run.start_time >= start_date, Run.start_time < end_date)
+            columns.extend(
+                [
+                    func.sum(Run.distance).filter(in_range),
+                    func.sum(Run.duration).filter(in_range),
+                    func.count().filter(in_range),
+                ]
+            )
+
+        stmt = select(*columns).where(
+            Run.user_uuid == user_uuid,
+            Run.start_time >= min(start for start, _ in ranges.values()),
+            Run.start_time < max(end for _, end in ranges.values()),
+        )
+        result = await self.session.execute(stmt)
+        row = result.one()
+        return {key: tuple(row[i * 3 : i * 3 + 3]) for i, key in enumerate(ranges)}
+
+    async def get_statistics(self, user_uuid: UUID) -> Row:
+        """Totals and personal records of a user in a single query."""
+        result = await self.session.execute(STATISTICS, {"user_uuid": user_uuid})
+        return result.one()
+
+    async def get_run_dates(self, user_uuid: UUID) -> list[date]:
+        """Distinct days with a run, newest first."""
+        result = await self.session.execute(RUN_DATES, {"user_uuid": user_uuid})
+        return list(result.scalars().all())
+
+    async def get_aggregates(
+        self, user_uuid: UUID, start_date: datetime, group_by: str, label_fmt: str
+    ) -> list[Row]:
+        """
+        Sums of runs since `start_date` grouped by `group_by` (a date_trunc
+        unit), labeled with the `label_fmt` to_char format.
+        """
+        result = await self.session.execute(
+            _aggregates_statement(group_by, label_fmt),
+            {"user_uuid": user_uuid, "start_date": start_date},
+        )
+        return list(result.all())
@@ -1,14 +1,28 @@
+from uuid import UUID
+
+from sqlalchemy import bindparam, select
+
 from app.models.user import User
 from app.repositories.base import BaseRepository
 
+# Templates of the lookups done on every sign-in and authenticated request,
+# built once so each execution skips statement construction and cache keying
+GET_BY_UUID = select(User).where(User.uuid == bindparam("uuid"))
+GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, session):
         super().__init__(session, User)
 
+    async def get_by_uuid(self, uuid_: UUID) -> User | None:
+        result = await self.session.execute(GET_BY_UUID, {"uuid": uuid_})
+        return result.scalar_one_or_none()
+
     async def get_by_email(self, email: str) -> User | None:
-        return await self.get_one(email=email)
+        result = await self.session.execute(GET_BY_EMAIL, {"email": email})
+        return result.scalar_one_or_none()
 
     async def email_exists(self, email: str) -> bool:
-        user = await self.get_one(email=email)
+        user = await self.get_by_email(email)
         return user is not None
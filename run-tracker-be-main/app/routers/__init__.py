@@ -5,6 +5,7 @@ from app.routers.auth import router as auth
 from app.routers.goals import router as goals
 from app.routers.health_check import router as healthcheck
 from app.routers.leaderboard import router as leaderboard
+from app.routers.metrics import router as metrics
 from app.routers.runs import router as runs
 from app.routers.statistics import router as statistics
 from app.routers.users import router as users
@@ -14,6 +15,7 @@ __all__ = ["router"]
 router = APIRouter(prefix="/api")
 
 router.include_router(healthcheck, prefix="/health-check", tags=["Health Check"])
+router.include_router(metrics, prefix="/metrics", tags=["Metrics"])
 router.include_router(auth, prefix="/auth", tags=["Auth"])
 router.include_router(users, prefix="/users", tags=["Users"])
 router.include_router(goals, prefix="/goals", tags=["Goals"])
@@ -2,22 +2,29 @@ from typing import Annotated
 
 from fastapi import APIRouter, Query
 
-from app.dependencies import AchievementServiceDep, CurrentUserDep, UnitOfWorkDep
+from app.core.query_budget import query_budget
+from app.core.responses import JSONRoute
+from app.dependencies import (
+    AchievementServiceDep,
+    CurrentUserUUIDDep,
+    ReadOnlyUnitOfWorkDep,
+)
 from app.schemas.achievements import AchievementListResponse
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.get("/", response_model=AchievementListResponse)
+@query_budget(2)
 async def list_achievements(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     achievement_service: AchievementServiceDep,
-    uow: UnitOfWorkDep,
+    uow: ReadOnlyUnitOfWorkDep,
     page: Annotated[int, Query(ge=1, description="Page number")] = 1,
     limit: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 10,
 ) -> AchievementListResponse:
     achievements, total = await achievement_service.list_achievements(
-        uow, current_user.uuid, page=page, limit=limit
+        uow, current_user_uuid, page=page, limit=limit
     )
     total_pages = (total + limit - 1) // limit
 
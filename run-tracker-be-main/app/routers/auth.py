@@ -1,6 +1,8 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, status
 
-from app.dependencies import AuthServiceDep, UnitOfWorkDep
+from app.core.exc import InvalidCredentialsException
+from app.core.responses import JSONRoute
+from app.dependencies import AuthRateLimiterDep, AuthServiceDep, UnitOfWorkDep
 from app.schemas.auth import (
     RefreshTokenRequest,
     SignInRequest,
@@ -9,33 +11,60 @@ from app.schemas.auth import (
 )
 from app.schemas.users import UserResponse
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.post(
     "/sign-up", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
 async def sign_up(
+    request: Request,
     data: SignUpRequest,
     uow: UnitOfWorkDep,
     auth_service: AuthServiceDep,
+    rate_limiter: AuthRateLimiterDep,
 ) -> UserResponse:
+    # Sign-up has no credentials to fail, it is throttled per IP only
+    await rate_limiter.check(request.client and request.client.host)
     return await auth_service.sign_up(uow, data)
 
 
 @router.post("/sign-in", response_model=TokenResponse)
 async def sign_in(
+    request: Request,
     data: SignInRequest,
     uow: UnitOfWorkDep,
     auth_service: AuthServiceDep,
+    rate_limiter: AuthRateLimiterDep,
 ) -> TokenResponse:
-    return await auth_service.sign_in(uow, data)
+    client_ip = request.client and request.client.host
+    await rate_limiter.check(client_ip, data.email)
+    try:
+        return await auth_service.sign_in(uow, data)
+    except InvalidCredentialsException:
+        await rate_limiter.record_failure(client_ip, data.email)
+        raise
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
+    request: Request,
     data: RefreshTokenRequest,
     uow: UnitOfWorkDep,
     auth_service: AuthServiceDep,
+    rate_limiter: AuthRateLimiterDep,
 ) -> TokenResponse:
+    await rate_limiter.check(request.client and request.client.host)
     return await auth_service.refresh(uow, data)
+
+
+@router.post("/sign-out", status_code=status.HTTP_204_NO_CONTENT)
+async def sign_out(
+    request: Request,
+    data: RefreshTokenRequest,
+    uow: UnitOfWorkDep,
+    auth_service: AuthServiceDep,
+    rate_limiter: AuthRateLimiterDep,
+) -> None:
+    await rate_limiter.check(request.client and request.client.host)
+    await auth_service.sign_out(uow, data)
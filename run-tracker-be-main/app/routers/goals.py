@@ -3,14 +3,22 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query
 
-from app.dependencies import CurrentUserDep, GoalServiceDep, UnitOfWorkDep
+from app.core.query_budget import query_budget
+from app.core.responses import JSONRoute
+from app.dependencies import (
+    CurrentUserDep,
+    CurrentUserUUIDDep,
+    GoalServiceDep,
+    UnitOfWorkDep,
+)
 from app.schemas.goals import (
     GoalCreateRequest,
+    GoalHistoryResponse,
     GoalListResponse,
     GoalResponse,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.post("/", response_model=GoalResponse, status_code=201)
@@ -24,15 +32,19 @@ async def create_goal(
 
 
 @router.get("/", response_model=GoalListResponse)
+@query_budget(3)
 async def list_goals(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     goal_service: GoalServiceDep,
     uow: UnitOfWorkDep,
     page: Annotated[int, Query(ge=1, description="Page number")] = 1,
     limit: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 10,
+    with_progress: Annotated[
+        bool, Query(description="Include progress in the current period")
+    ] = False,
 ) -> GoalListResponse:
     goals, total = await goal_service.list_goals(
-        uow, current_user.uuid, page=page, limit=limit
+        uow, current_user_uuid, page=page, limit=limit, with_progress=with_progress
     )
     total_pages = (total + limit - 1) // limit
 
@@ -43,12 +55,27 @@ async def list_goals(
 
 @router.get("/{goal_uuid}", response_model=GoalResponse)
 async def get_goal(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     goal_uuid: UUID,
     goal_service: GoalServiceDep,
     uow: UnitOfWorkDep,
 ) -> GoalResponse:
-    return await goal_service.get_goal(uow, current_user.uuid, goal_uuid)
+    return await goal_service.get_goal(uow, current_user_uuid, goal_uuid)
+
+
+@router.get("/{goal_uuid}/history", response_model=GoalHistoryResponse)
+async def get_goal_history(
+    current_user_uuid: CurrentUserUUIDDep,
+    goal_uuid: UUID,
+    goal_service: GoalServiceDep,
+    uow: UnitOfWorkDep,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Number of most recent periods")
+    ] = 12,
+) -> GoalHistoryResponse:
+    return await goal_service.get_goal_history(
+        uow, current_user_uuid, goal_uuid, limit=limit
+    )
 
 
 @router.delete("/{goal_uuid}", response_model=GoalResponse)
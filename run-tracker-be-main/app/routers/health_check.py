@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import select
 
-from app.core.db import engine
+from app.core.db import engine, replicas
+from app.core.pool import InstrumentedPool
+from app.core.rate_limit import auth_rate_limited
+from app.core.responses import JSONRoute
+from app.core.unit_of_work import read_routed
+from app.dependencies import verify_diagnostics_token
+from app.services.user import user_cache
+from app.utils.security import password_hasher, token_cache
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.get("", description="Check App availability.")
@@ -25,3 +32,74 @@ async def database_healthcheck() -> JSONResponse:
         )
 
     return JSONResponse(content="Database works")
+
+
+@router.get(
+    "/db/pool",
+    description="Connection pool usage and wait times.",
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def pool_healthcheck() -> JSONResponse:
+    pools = [e.sync_engine.pool for e in (engine, *replicas.engines)]
+    return JSONResponse(
+        content={
+            pool.name: pool.stats()
+            for pool in pools
+            if isinstance(pool, InstrumentedPool)
+        }
+    )
+
+
+@router.get(
+    "/db/replicas",
+    description="Check read replicas and read routing.",
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def replicas_healthcheck() -> JSONResponse:
+    available = {}
+    for replica in replicas.engines:
+        url = replica.url.render_as_string(hide_password=True)
+        try:
+            async with replica.connect() as conn:
+                await conn.execute(select(1))
+            available[url] = True
+        except Exception:
+            available[url] = False
+
+    return JSONResponse(
+        content={
+            "replicas": available,
+            "routed": {
+                target: read_routed.get(target)
+                for target in ("replica", "primary", "fence")
+            },
+        }
+    )
+
+
+@router.get(
+    "/auth",
+    description="Authentication throttling and cache stats.",
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def auth_healthcheck() -> JSONResponse:
+    return JSONResponse(
+        content={
+            "rate_limited": {
+                "ip": auth_rate_limited.get("ip"),
+                "email": auth_rate_limited.get("email"),
+            },
+            "password_hash_queue": {
+                "pending": password_hasher.pending,
+                "max_pending": password_hasher.max_pending,
+            },
+            "token_cache": {
+                "size": len(token_cache),
+                "hit_rate": token_cache.hit_rate,
+            },
+            "user_cache": {
+                "size": len(user_cache),
+                "hit_rate": user_cache.hit_rate,
+            },
+        }
+    )
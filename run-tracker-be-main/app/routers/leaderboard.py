@@ -1,23 +1,30 @@
 from fastapi import APIRouter, Query
 
-from app.dependencies import CurrentUserDep, LeaderboardServiceDep, UnitOfWorkDep
+from app.core.query_budget import query_budget
+from app.core.responses import JSONRoute
+from app.dependencies import (
+    CurrentUserUUIDDep,
+    LeaderboardServiceDep,
+    ReadOnlyUnitOfWorkDep,
+)
 from app.schemas.leaderboard import (
     LeaderboardMetric,
     LeaderboardPeriod,
     LeaderboardResponse,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.get("/", response_model=LeaderboardResponse)
+@query_budget(2)
 async def get_leaderboard(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     leaderboard_service: LeaderboardServiceDep,
-    uow: UnitOfWorkDep,
+    uow: ReadOnlyUnitOfWorkDep,
     metric: LeaderboardMetric = Query(LeaderboardMetric.DISTANCE),
     period: LeaderboardPeriod = Query(LeaderboardPeriod.WEEK),
 ) -> LeaderboardResponse:
     return await leaderboard_service.get_leaderboard(
-        uow, metric, period, current_user.uuid
+        uow, metric, period, current_user_uuid
     )
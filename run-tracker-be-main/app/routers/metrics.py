@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from app.core.metrics import CONTENT_TYPE, render_metrics
+from app.core.responses import JSONRoute
+from app.dependencies import verify_diagnostics_token
+
+router = APIRouter(route_class=JSONRoute)
+
+
+@router.get(
+    "",
+    description="Metrics in the Prometheus text exposition format.",
+    dependencies=[Depends(verify_diagnostics_token)],
+)
+async def metrics() -> Response:
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
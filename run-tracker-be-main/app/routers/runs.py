@@ -3,7 +3,15 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query
 
-from app.dependencies import CurrentUserDep, RunServiceDep, UnitOfWorkDep
+from app.core.query_budget import query_budget
+from app.core.responses import JSONRoute
+from app.dependencies import (
+    CurrentUserDep,
+    CurrentUserUUIDDep,
+    ReadOnlyUnitOfWorkDep,
+    RunServiceDep,
+    UnitOfWorkDep,
+)
 from app.enums.run import RunSortBy, SortOrder
 from app.enums.statistics import StatisticsPeriod
 from app.schemas.runs import (
@@ -13,10 +21,11 @@ from app.schemas.runs import (
     RunUpdateRequest,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.post("/", response_model=RunResponse, status_code=201)
+@query_budget(6)
 async def create_run(
     current_user: CurrentUserDep,
     data: RunCreateRequest,
@@ -27,10 +36,11 @@ async def create_run(
 
 
 @router.get("/", response_model=RunListResponse)
+@query_budget(2)
 async def list_runs(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     run_service: RunServiceDep,
-    uow: UnitOfWorkDep,
+    uow: ReadOnlyUnitOfWorkDep,
     page: Annotated[int, Query(ge=1, description="Page number")] = 1,
     limit: Annotated[int, Query(ge=1, le=100000, description="Items per page")] = 10,
     period: Annotated[
@@ -47,7 +57,7 @@ async def list_runs(
 ) -> RunListResponse:
     runs, total = await run_service.list_runs(
         uow,
-        current_user.uuid,
+        current_user_uuid,
         page=page,
         limit=limit,
         period=period,
@@ -64,13 +74,14 @@ async def list_runs(
 
 
 @router.get("/{run_uuid}", response_model=RunResponse)
+@query_budget(1)
 async def get_run(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     run_uuid: UUID,
     run_service: RunServiceDep,
     uow: UnitOfWorkDep,
 ) -> RunResponse:
-    return await run_service.get_run(uow, current_user.uuid, run_uuid)
+    return await run_service.get_run(uow, current_user_uuid, run_uuid)
 
 
 @router.patch("/{run_uuid}", response_model=RunResponse)
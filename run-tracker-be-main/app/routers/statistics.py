@@ -1,29 +1,38 @@
 from fastapi import APIRouter
 
-from app.dependencies import CurrentUserDep, StatisticsServiceDep, UnitOfWorkDep
+from app.core.query_budget import query_budget
+from app.core.responses import JSONRoute
+from app.dependencies import (
+    CurrentUserUUIDDep,
+    ReadOnlySnapshotUnitOfWorkDep,
+    ReadOnlyUnitOfWorkDep,
+    StatisticsServiceDep,
+)
 from app.enums.statistics import StatisticsPeriod
 from app.schemas.statistics import UserStatisticsResponse, VisualizationResponse
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.get("/", response_model=UserStatisticsResponse)
+@query_budget(2)
 async def get_user_statistics(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     statistics_service: StatisticsServiceDep,
-    uow: UnitOfWorkDep,
+    uow: ReadOnlySnapshotUnitOfWorkDep,
 ) -> UserStatisticsResponse:
-    return await statistics_service.get_user_statistics(uow, current_user.uuid)
+    return await statistics_service.get_user_statistics(uow, current_user_uuid)
 
 
 @router.get("/visualization", response_model=VisualizationResponse)
+@query_budget(1)
 async def get_visualization_data(
-    current_user: CurrentUserDep,
+    current_user_uuid: CurrentUserUUIDDep,
     statistics_service: StatisticsServiceDep,
-    uow: UnitOfWorkDep,
+    uow: ReadOnlyUnitOfWorkDep,
     period: StatisticsPeriod,
 ) -> VisualizationResponse:
     data = await statistics_service.get_visualization_data(
-        uow, current_user.uuid, period
+        uow, current_user_uuid, period
     )
     return VisualizationResponse(data=data)
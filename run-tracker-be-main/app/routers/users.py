@@ -2,10 +2,11 @@ from typing import Annotated
 
 from fastapi import APIRouter, Query
 
+from app.core.responses import JSONRoute
 from app.dependencies import CurrentUserDep, UnitOfWorkDep, UserServiceDep
 from app.schemas.users import UserListResponse, UserResponse, UserUpdateRequest
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -25,6 +26,15 @@ async def update_current_user_info(
     return await user_service.update_current_user(uow, current_user.uuid, update_data)
 
 
+@router.delete("/me", response_model=UserResponse)
+async def delete_current_user(
+    current_user: CurrentUserDep,
+    user_service: UserServiceDep,
+    uow: UnitOfWorkDep,
+) -> UserResponse:
+    return await user_service.delete_user(uow, current_user.uuid)
+
+
 @router.get("/", response_model=UserListResponse)
 async def list_users(
     user_service: UserServiceDep,
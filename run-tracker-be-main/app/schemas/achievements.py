@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class AchievementResponse(BaseModel):
@@ -19,6 +19,9 @@ class AchievementResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+achievement_responses_adapter = TypeAdapter(list[AchievementResponse])
+
+
 class AchievementListResponse(BaseModel):
     achievements: list[AchievementResponse]
     total: int
@@ -1,11 +1,22 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.enums.goal import GoalType, TimePeriod
 
 
+class GoalProgress(BaseModel):
+    period: str
+    period_start: datetime
+    period_end: datetime
+    current: float
+    target: int
+    percentage: float
+    is_met: bool
+
+
 class GoalResponse(BaseModel):
     uuid: UUID
     user_uuid: UUID
@@ -15,16 +26,39 @@ class GoalResponse(BaseModel):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+    progress: Optional[GoalProgress] = None
 
     model_config = {"from_attributes": True}
 
 
+goal_responses_adapter = TypeAdapter(list[GoalResponse])
+
+
 class GoalCreateRequest(BaseModel):
     goal_type: GoalType
     target: int = Field(..., gt=0, description="Target value")
     time_period: TimePeriod
 
 
+class GoalPeriodProgressResponse(BaseModel):
+    period: str
+    period_start: datetime
+    period_end: datetime
+    value: float
+    target: int
+    is_met: bool
+    is_closed: bool
+
+    model_config = {"from_attributes": True}
+
+
+class GoalHistoryResponse(BaseModel):
+    goal_uuid: UUID
+    periods: list[GoalPeriodProgressResponse]
+    met: int
+    total: int
+
+
 class GoalListResponse(BaseModel):
     goals: list[GoalResponse]
     total: int
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class RunResponse(BaseModel):
@@ -21,6 +21,9 @@ class RunResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+run_responses_adapter = TypeAdapter(list[RunResponse])
+
+
 class RunCreateRequest(BaseModel):
     name: Optional[str] = Field(None, max_length=255)
     start_time: datetime
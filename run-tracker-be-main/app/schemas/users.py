@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class UserResponse(BaseModel):
@@ -19,6 +19,9 @@ class UserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+user_responses_adapter = TypeAdapter(list[UserResponse])
+
+
 class UserUpdateRequest(BaseModel):
     username: Optional[str] = Field(None, max_length=255)
     age: Optional[int] = Field(None, ge=1, le=150)
@@ -1,129 +1,289 @@
-from datetime import datetime, timedelta
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Row
 
+from app.core.config import settings
+from app.core.metrics import Histogram
+from app.core.query_budget import query_budget
 from app.core.unit_of_work import ABCUnitOfWork
 from app.enums.goal import GoalType, TimePeriod
-from app.models.run import Run
-from app.schemas.achievements import AchievementResponse
+from app.models.goal import Goal
+from app.schemas.achievements import (
+    AchievementResponse,
+    achievement_responses_adapter,
+)
+from app.schemas.goals import GoalProgress
+
+# Rows per multi-row INSERT, keeps the statement below the bind parameter limit
+BATCH_SIZE = 1000
+
+achievement_lag_seconds = Histogram(
+    "achievement_lag_seconds",
+    "Time from storing a run to having the achievements it completes awarded",
+)
 
 
 class AchievementService:
+    @query_budget(4)
     async def check_and_award_achievements(
         self, uow: ABCUnitOfWork, user_uuid: UUID
     ) -> None:
         async with uow:
             # 1. Fetch active goals
-            goals, total = await uow.goal.get_many(user_uuid=user_uuid, is_active=True)
+            goals = await uow.goal.get_all(user_uuid=user_uuid, is_active=True)
+            if not goals:
+                return
+
+            # 2. Determine time period ranges and progress once for all goals
+            periods = self.get_periods()
+            totals = await uow.run.get_totals_for_ranges(
+                user_uuid,
+                {period: (start, end) for period, (start, end, _) in periods.items()},
+            )
 
+            awarded = None
+            new_achievements = []
             for goal in goals:
-                # 2. Determine time period range
-                start_date, end_date, period_identifier = self._get_period_range(
-                    goal.time_period
+                _, _, period_identifier = periods[goal.time_period]
+                progress = self._get_progress_value(
+                    goal.goal_type, *totals[goal.time_period]
                 )
 
-                # 3. Calculate progress
-                progress = await self._calculate_progress(
-                    uow, user_uuid, goal.goal_type, start_date, end_date
+                # 3. Check if goal is met
+                if progress < goal.target:
+                    continue
+
+                # 4. Check if it was already awarded for this period
+                if awarded is None:
+                    awarded = await uow.achievement.get_awarded_goal_periods(
+                        user_uuid=user_uuid
+                    )
+                if (str(goal.uuid), period_identifier) in awarded:
+                    continue
+
+                new_achievements.append(
+                    self._build_goal_achievement(
+                        user_uuid=user_uuid,
+                        goal_uuid=goal.uuid,
+                        goal_type=goal.goal_type,
+                        time_period=goal.time_period,
+                        target=goal.target,
+                        period_identifier=period_identifier,
+                        progress=progress,
+                        earned_at=datetime.now(timezone.utc),
+                    )
                 )
 
-                # 4. Check if goal is met
-                if progress >= goal.target:
-                    achievements, _ = await uow.achievement.get_many(
-                        user_uuid=user_uuid, achievement_type="GOAL_COMPLETION"
+            # 5. Award the achievements in a single INSERT
+            if new_achievements:
+                await uow.achievement.create_many(new_achievements)
+
+    async def get_goals_progress(
+        self, uow: ABCUnitOfWork, user_uuid: UUID, goals: Sequence[Goal | Row]
+    ) -> dict[UUID, GoalProgress]:
+        """Calculates current period progress of all given goals with one query."""
+        if not goals:
+            return {}
+
+        periods = self.get_periods()
+        totals = await uow.run.get_totals_for_ranges(
+            user_uuid,
+            {period: (start, end) for period, (start, end, _) in periods.items()},
+        )
+
+        progress = {}
+        for goal in goals:
+            start_date, end_date, period_identifier = periods[goal.time_period]
+            current = self._get_progress_value(
+                goal.goal_type, *totals[goal.time_period]
+            )
+            progress[goal.uuid] = GoalProgress(
+                period=period_identifier,
+                period_start=start_date,
+                period_end=end_date,
+                current=current,
+                target=goal.target,
+                percentage=min(current / goal.target * 100, 100.0),
+                is_met=current >= goal.target,
+            )
+        return progress
+
+    async def recompute_achievements(
+        self,
+        uow: ABCUnitOfWork,
+        user_uuid_from: UUID | None = None,
+        user_uuid_to: UUID | None = None,
+    ) -> tuple[int, int]:
+        """
+        Re-evaluates every period of every active goal for users in the given uuid
+        range, rebuilds their period progress and awards the missing goal
+        completions.
+        Returns the number of evaluated goal periods and of awarded achievements.
+        """
+        async with uow:
+            awarded = await uow.achievement.get_awarded_goal_periods(
+                user_uuid_from, user_uuid_to
+            )
+
+            now = datetime.now(timezone.utc)
+            evaluated = 0
+            new_achievements = []
+            period_progress = []
+            for time_period in TimePeriod:
+                rows = await uow.goal.get_period_totals(
+                    time_period, user_uuid_from, user_uuid_to
+                )
+                evaluated += len(rows)
+
+                for row in rows:
+                    progress = self._get_progress_value(
+                        row.goal_type, row.distance, row.duration, row.runs
+                    )
+                    start_date, end_date, period_identifier = self._get_period_range(
+                        time_period, row.period_start
+                    )
+                    period_progress.append(
+                        {
+                            "goal_uuid": row.goal_uuid,
+                            "user_uuid": row.user_uuid,
+                            "time_period": time_period,
+                            "period": period_identifier,
+                            "period_start": start_date,
+                            "period_end": end_date,
+                            "value": progress,
+                            "target": row.target,
+                            "is_met": progress >= row.target,
+                            "is_closed": end_date <= now,
+                        }
                     )
 
-                    already_awarded = False
-                    for ach in achievements:
-                        if (
-                            ach.meta_data.get("goal_id") == str(goal.uuid)
-                            and ach.meta_data.get("period") == period_identifier
-                        ):
-                            already_awarded = True
-                            break
-
-                    if not already_awarded:
-                        # 6. Award achievement
-                        await uow.achievement.create_one(
-                            {
-                                "user_uuid": user_uuid,
-                                "title": f"{goal.time_period.value.title()} {goal.goal_type.value.title()} Goal Met",
-                                "description": f"You achieved your goal of {goal.target} {self._get_unit(goal.goal_type)}!",
-                                "earned_at": datetime.now(),
-                                "achievement_type": "GOAL_COMPLETION",
-                                "meta_data": {
-                                    "goal_id": str(goal.uuid),
-                                    "period": period_identifier,
-                                    "target": goal.target,
-                                    "achieved": progress,
-                                    "goal_type": goal.goal_type.value,
-                                    "time_period": goal.time_period.value,
-                                },
-                            }
+                    if progress < row.target:
+                        continue
+
+                    key = (str(row.goal_uuid), period_identifier)
+                    if key in awarded:
+                        continue
+
+                    awarded.add(key)
+                    new_achievements.append(
+                        self._build_goal_achievement(
+                            user_uuid=row.user_uuid,
+                            goal_uuid=row.goal_uuid,
+                            goal_type=row.goal_type,
+                            time_period=time_period,
+                            target=row.target,
+                            period_identifier=period_identifier,
+                            progress=progress,
+                            earned_at=row.last_run_at,
                         )
+                    )
+
+            for i in range(0, len(period_progress), BATCH_SIZE):
+                await uow.goal_progress.upsert_many(period_progress[i : i + BATCH_SIZE])
+            for i in range(0, len(new_achievements), BATCH_SIZE):
+                await uow.achievement.create_many(new_achievements[i : i + BATCH_SIZE])
+
+            return evaluated, len(new_achievements)
+
+    def _build_goal_achievement(
+        self,
+        user_uuid: UUID,
+        goal_uuid: UUID,
+        goal_type: GoalType,
+        time_period: TimePeriod,
+        target: int,
+        period_identifier: str,
+        progress: float,
+        earned_at: datetime,
+    ) -> dict:
+        return {
+            "user_uuid": user_uuid,
+            "title": f"{time_period.value.title()} {goal_type.value.title()} Goal Met",
+            "description": (
+                f"You achieved your goal of {target} {self._get_unit(goal_type)}!"
+            ),
+            "earned_at": earned_at,
+            "achievement_type": "GOAL_COMPLETION",
+            "meta_data": {
+                "goal_id": str(goal_uuid),
+                "period": period_identifier,
+                "target": target,
+                "achieved": progress,
+                "goal_type": goal_type.value,
+                "time_period": time_period.value,
+            },
+        }
+
+    def get_periods(
+        self, at: datetime | None = None
+    ) -> dict[TimePeriod, tuple[datetime, datetime, str]]:
+        """Returns the weekly, monthly and yearly periods containing `at` (now)."""
+        at = at or datetime.now(timezone.utc)
+        return {
+            time_period: self._get_period_range(time_period, at)
+            for time_period in TimePeriod
+        }
 
     def _get_period_range(
-        self, time_period: TimePeriod
+        self, time_period: TimePeriod, now: datetime | None = None
     ) -> tuple[datetime, datetime, str]:
-        now = datetime.now()
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            # asyncpg stores naive datetimes as UTC
+            now = now.replace(tzinfo=timezone.utc)
+        # Periods start at midnight in the configured zone, the boundaries are
+        # aware so they compare and bind as the same instants everywhere
+        now = now.astimezone(settings.app.zone)
         if time_period == TimePeriod.WEEKLY:
             # Monday start
             start_date = now - timedelta(days=now.weekday())
             start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
             end_date = start_date + timedelta(days=7)
-            period_identifier = f"{start_date.year}-W{start_date.isocalendar()[1]}"
         elif time_period == TimePeriod.MONTHLY:
             start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             # Next month calculation
             if now.month == 12:
-                end_date = now.replace(year=now.year + 1, month=1, day=1)
+                end_date = start_date.replace(year=now.year + 1, month=1)
             else:
-                end_date = now.replace(month=now.month + 1, day=1)
-            period_identifier = f"{start_date.year}-M{start_date.month}"
+                end_date = start_date.replace(month=now.month + 1)
         elif time_period == TimePeriod.YEARLY:
             start_date = now.replace(
                 month=1, day=1, hour=0, minute=0, second=0, microsecond=0
             )
-            end_date = now.replace(year=now.year + 1, month=1, day=1)
-            period_identifier = f"{start_date.year}"
+            end_date = start_date.replace(year=now.year + 1)
         else:
             raise ValueError(f"Unsupported time period: {time_period}")
 
+        period_identifier = self._get_period_identifier(time_period, start_date)
         return start_date, end_date, period_identifier
 
-    async def _calculate_progress(
+    def _get_period_identifier(
+        self, time_period: TimePeriod, start_date: datetime
+    ) -> str:
+        if time_period == TimePeriod.WEEKLY:
+            return f"{start_date.year}-W{start_date.isocalendar()[1]}"
+        elif time_period == TimePeriod.MONTHLY:
+            return f"{start_date.year}-M{start_date.month}"
+        elif time_period == TimePeriod.YEARLY:
+            return f"{start_date.year}"
+        raise ValueError(f"Unsupported time period: {time_period}")
+
+    def _get_progress_value(
         self,
-        uow: ABCUnitOfWork,
-        user_uuid: UUID,
         goal_type: GoalType,
-        start_date: datetime,
-        end_date: datetime,
+        distance: float | None,
+        duration: float | None,
+        runs: int | None,
     ) -> float:
-        # We can use SQL aggregation for efficiency
         if goal_type == GoalType.DISTANCE:
-            stmt = select(func.sum(Run.distance)).where(
-                Run.user_uuid == user_uuid,
-                Run.start_time >= start_date,
-                Run.start_time < end_date,
-            )
+            return distance or 0.0
         elif goal_type == GoalType.DURATION:
-            stmt = select(func.sum(Run.duration)).where(
-                Run.user_uuid == user_uuid,
-                Run.start_time >= start_date,
-                Run.start_time < end_date,
-            )
+            return duration or 0.0
         elif goal_type == GoalType.NUMBER_OF_RUNS:
-            stmt = select(func.count(Run.uuid)).where(
-                Run.user_uuid == user_uuid,
-                Run.start_time >= start_date,
-                Run.start_time < end_date,
-            )
-        else:
-            return 0.0
-
-        result = await uow.session.execute(stmt)
-        return result.scalar() or 0.0
+            return runs or 0
+        return 0.0
 
     def _get_unit(self, goal_type: GoalType) -> str:
         if goal_type == GoalType.DISTANCE:
@@ -138,12 +298,12 @@ class AchievementService:
         self, uow: ABCUnitOfWork, user_uuid: UUID, page: int = 1, limit: int = 10
     ) -> tuple[list[AchievementResponse], int]:
         async with uow:
-            achievements, total = await uow.achievement.get_many(
+            achievements, total = await uow.achievement.get_many_rows(
                 page=page, limit=limit, user_uuid=user_uuid
             )
-            responses = [
-                AchievementResponse.model_validate(ach) for ach in achievements
-            ]
+            responses = achievement_responses_adapter.validate_python(
+                achievements, from_attributes=True
+            )
             return responses, total
 
 
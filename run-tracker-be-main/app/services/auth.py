@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
 from fastapi import HTTPException, status
 
 from app.core.exc import InvalidCredentialsException, UserNotAuthenticatedException
@@ -13,8 +16,7 @@ from app.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
-    verify_password,
+    password_hasher,
 )
 
 
@@ -29,7 +31,7 @@ class AuthService:
                 )
 
             # Create new user
-            hashed_password = get_password_hash(data.password)
+            hashed_password = await password_hasher.hash(data.password)
             user_data = {
                 "email": data.email,
                 "hashed_password": hashed_password,
@@ -51,9 +53,16 @@ class AuthService:
                 raise InvalidCredentialsException()
 
             # Verify password
-            if not verify_password(data.password, user.hashed_password):
+            if not await password_hasher.verify(data.password, user.hashed_password):
                 raise InvalidCredentialsException()
 
+            # Upgrade the hash if the configured cost factor has changed
+            if password_hasher.needs_rehash(user.hashed_password):
+                hashed_password = await password_hasher.hash(data.password)
+                await uow.user.update_one(
+                    user.uuid, {"hashed_password": hashed_password}
+                )
+
             # Create tokens
             access_token = create_access_token(data={"sub": str(user.uuid)})
             refresh_token = create_refresh_token(data={"sub": str(user.uuid)})
@@ -66,16 +75,15 @@ class AuthService:
     async def refresh(
         self, uow: ABCUnitOfWork, data: RefreshTokenRequest
     ) -> TokenResponse:
-        payload = decode_token(data.refresh_token)
-        if payload is None:
-            raise UserNotAuthenticatedException()
-
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise UserNotAuthenticatedException()
+        user_uuid, jti, expires_at = self._get_refresh_claims(data.refresh_token)
 
         async with uow:
-            user = await uow.user.get_one(uuid=user_id)
+            # Refresh tokens are single use: of concurrent refreshes with the
+            # same token, on any worker, only the first one revokes it
+            if not await uow.revoked_token.revoke(jti, expires_at):
+                raise UserNotAuthenticatedException()
+
+            user = await uow.user.get_by_uuid(user_uuid)
             if user is None:
                 raise UserNotAuthenticatedException()
 
@@ -88,6 +96,35 @@ class AuthService:
                 refresh_token=refresh_token,
             )
 
+    async def sign_out(self, uow: ABCUnitOfWork, data: RefreshTokenRequest) -> None:
+        """
+        Revokes the refresh token of a session. Access tokens are not stored,
+        the session's last one stays valid until it expires.
+        """
+        _, jti, expires_at = self._get_refresh_claims(data.refresh_token)
+        async with uow:
+            await uow.revoked_token.revoke(jti, expires_at)
+
+    async def delete_expired_revocations(self, uow: ABCUnitOfWork) -> int:
+        """Deletes revocations of tokens that have expired since."""
+        async with uow:
+            return await uow.revoked_token.delete_expired(datetime.now(timezone.utc))
+
+    def _get_refresh_claims(self, refresh_token: str) -> tuple[UUID, UUID, datetime]:
+        """Returns the user uuid, jti and expiry of a valid refresh token."""
+        payload = decode_token(refresh_token, token_type="refresh")
+        if payload is None:
+            raise UserNotAuthenticatedException()
+
+        try:
+            return (
+                UUID(payload["sub"]),
+                UUID(payload["jti"]),
+                datetime.fromtimestamp(payload["exp"], timezone.utc),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise UserNotAuthenticatedException()
+
 
 def get_auth_service() -> AuthService:
     return AuthService()
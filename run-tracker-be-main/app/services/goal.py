@@ -1,11 +1,24 @@
+from datetime import datetime, timezone
 from uuid import UUID
 
 from app.core.exc import ObjectNotFoundException
 from app.core.unit_of_work import ABCUnitOfWork
-from app.schemas.goals import GoalCreateRequest, GoalResponse
+from app.enums.goal import TimePeriod
+from app.models.run import Run
+from app.schemas.goals import (
+    GoalCreateRequest,
+    GoalHistoryResponse,
+    GoalPeriodProgressResponse,
+    GoalResponse,
+    goal_responses_adapter,
+)
+from app.services.achievement import AchievementService, get_achievement_service
 
 
 class GoalService:
+    def __init__(self, achievement_service: AchievementService):
+        self.achievement_service = achievement_service
+
     async def create_goal(
         self, uow: ABCUnitOfWork, user_uuid: UUID, data: GoalCreateRequest
     ) -> GoalResponse:
@@ -13,16 +26,55 @@ class GoalService:
             goal_data = data.model_dump()
             goal_data["user_uuid"] = user_uuid
             goal = await uow.goal.create_one(goal_data)
-            return GoalResponse.model_validate(goal)
+
+            # Seed the history with the progress already made in the current period
+            progress = await self.achievement_service.get_goals_progress(
+                uow, user_uuid, [goal]
+            )
+            goal_progress = progress[goal.uuid]
+            await uow.goal_progress.create_many(
+                [
+                    {
+                        "goal_uuid": goal.uuid,
+                        "user_uuid": user_uuid,
+                        "time_period": goal.time_period,
+                        "period": goal_progress.period,
+                        "period_start": goal_progress.period_start,
+                        "period_end": goal_progress.period_end,
+                        "value": goal_progress.current,
+                        "target": goal.target,
+                        "is_met": goal_progress.is_met,
+                    }
+                ]
+            )
+
+            goal_response = GoalResponse.model_validate(goal)
+            goal_response.progress = goal_progress
+            return goal_response
 
     async def list_goals(
-        self, uow: ABCUnitOfWork, user_uuid: UUID, page: int = 1, limit: int = 10
+        self,
+        uow: ABCUnitOfWork,
+        user_uuid: UUID,
+        page: int = 1,
+        limit: int = 10,
+        with_progress: bool = False,
     ) -> tuple[list[GoalResponse], int]:
         async with uow:
-            goals, total = await uow.goal.get_many(
+            goals, total = await uow.goal.get_many_rows(
                 page=page, limit=limit, user_uuid=user_uuid
             )
-            goal_responses = [GoalResponse.model_validate(goal) for goal in goals]
+            goal_responses = goal_responses_adapter.validate_python(
+                goals, from_attributes=True
+            )
+
+            if with_progress:
+                progress = await self.achievement_service.get_goals_progress(
+                    uow, user_uuid, goals
+                )
+                for goal_response in goal_responses:
+                    goal_response.progress = progress[goal_response.uuid]
+
             return goal_responses, total
 
     async def get_goal(
@@ -34,17 +86,95 @@ class GoalService:
                 raise ObjectNotFoundException(goal_uuid, "Goal")
             return GoalResponse.model_validate(goal)
 
+    async def get_goal_history(
+        self, uow: ABCUnitOfWork, user_uuid: UUID, goal_uuid: UUID, limit: int = 12
+    ) -> GoalHistoryResponse:
+        async with uow:
+            history = await uow.goal_progress.get_history(user_uuid, goal_uuid, limit)
+            if not history:
+                goal = await uow.goal.get_one(uuid=goal_uuid, user_uuid=user_uuid)
+                if not goal:
+                    raise ObjectNotFoundException(goal_uuid, "Goal")
+
+            periods = [GoalPeriodProgressResponse.model_validate(p) for p in history]
+            return GoalHistoryResponse(
+                goal_uuid=goal_uuid,
+                periods=periods,
+                met=sum(period.is_met for period in periods),
+                total=len(periods),
+            )
+
+    async def record_run_progress(
+        self, uow: ABCUnitOfWork, user_uuid: UUID, run: Run
+    ) -> None:
+        """Adds a created run to the period progress of the user's active goals."""
+        periods = self.achievement_service.get_periods(run.start_time)
+        await uow.goal_progress.add_run(
+            user_uuid,
+            periods,
+            distance=run.distance,
+            duration=run.duration,
+            runs=1,
+        )
+
+    async def remove_run_progress(
+        self, uow: ABCUnitOfWork, user_uuid: UUID, run: Run
+    ) -> None:
+        """Removes a deleted run from the period progress of the user's goals."""
+        periods = self.achievement_service.get_periods(run.start_time)
+        await uow.goal_progress.remove_run(
+            user_uuid,
+            periods,
+            distance=run.distance,
+            duration=run.duration,
+            runs=1,
+        )
+
+    async def close_periods(self, uow: ABCUnitOfWork) -> tuple[int, int]:
+        """
+        Creates empty rows for goals without any run in the periods that ended
+        since their last closed period, so runs of the job missed around a
+        boundary are caught up, and marks all finished periods as closed.
+        Returns the number of created and of closed rows.
+        """
+        async with uow:
+            created = 0
+            for time_period, (
+                start_date,
+                _,
+                _,
+            ) in self.achievement_service.get_periods().items():
+                open_since = await uow.goal_progress.get_open_since(time_period)
+                if open_since is None:
+                    continue
+                created += await uow.goal_progress.create_missing_periods(
+                    time_period,
+                    self._get_ended_periods(time_period, open_since, start_date),
+                )
+
+            closed = await uow.goal_progress.close_periods(datetime.now(timezone.utc))
+            return created, closed
+
+    def _get_ended_periods(
+        self, time_period: TimePeriod, since: datetime, until: datetime
+    ) -> list[tuple[datetime, datetime, str]]:
+        """Periods from the one containing `since` to the one ending at `until`."""
+        periods = []
+        period = self.achievement_service.get_periods(since)[time_period]
+        while period[1] <= until:
+            periods.append(period)
+            period = self.achievement_service.get_periods(period[1])[time_period]
+        return periods
+
     async def delete_goal(
         self, uow: ABCUnitOfWork, user_uuid: UUID, goal_uuid: UUID
     ) -> GoalResponse:
         async with uow:
-            goal = await uow.goal.get_one(uuid=goal_uuid, user_uuid=user_uuid)
-            if not goal:
+            deleted_goal = await uow.goal.delete_one(goal_uuid, user_uuid=user_uuid)
+            if not deleted_goal:
                 raise ObjectNotFoundException(goal_uuid, "Goal")
-
-            deleted_goal = await uow.goal.delete_one(goal_uuid)
             return GoalResponse.model_validate(deleted_goal)
 
 
 def get_goal_service() -> GoalService:
-    return GoalService()
+    return GoalService(get_achievement_service())
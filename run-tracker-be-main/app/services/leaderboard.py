@@ -2,8 +2,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
+from app.core.config import settings
 from app.core.unit_of_work import ABCUnitOfWork
-from app.repositories.leaderboard import LeaderboardRepository
 from app.schemas.leaderboard import (
     LeaderboardEntry,
     LeaderboardMetric,
@@ -22,11 +22,10 @@ class LeaderboardService:
         limit: int = 50,
     ) -> LeaderboardResponse:
         async with uow:
-            repo = LeaderboardRepository(uow.session)
             start_date = self._get_start_date(period)
 
             # Get top N entries
-            raw_entries = await repo.get_leaderboard(
+            raw_entries = await uow.leaderboard.get_leaderboard(
                 metric, start_date=start_date, limit=limit
             )
 
@@ -52,7 +51,7 @@ class LeaderboardService:
                 )
             else:
                 # Fetch user's specific rank
-                raw_user_entry = await repo.get_user_entry(
+                raw_user_entry = await uow.leaderboard.get_user_entry(
                     current_user_uuid, metric, start_date=start_date
                 )
                 if raw_user_entry:
@@ -69,7 +68,8 @@ class LeaderboardService:
             )
 
     def _get_start_date(self, period: LeaderboardPeriod) -> Optional[datetime]:
-        now = datetime.now()
+        # Same boundaries as the goal periods
+        now = datetime.now(settings.app.zone)
         if period == LeaderboardPeriod.WEEK:
             # Start of current week (Monday)
             start_of_week = now - timedelta(days=now.weekday())
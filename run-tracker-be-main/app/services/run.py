@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 from uuid import UUID
 
@@ -6,13 +7,26 @@ from app.core.unit_of_work import ABCUnitOfWork
 from app.enums.run import RunSortBy, SortOrder
 from app.enums.statistics import StatisticsPeriod
 from app.models.run import Run
-from app.schemas.runs import RunCreateRequest, RunResponse, RunUpdateRequest
-from app.services.achievement import AchievementService, get_achievement_service
+from app.schemas.runs import (
+    RunCreateRequest,
+    RunResponse,
+    RunUpdateRequest,
+    run_responses_adapter,
+)
+from app.services.achievement import (
+    AchievementService,
+    achievement_lag_seconds,
+    get_achievement_service,
+)
+from app.services.goal import GoalService, get_goal_service
 
 
 class RunService:
-    def __init__(self, achievement_service: AchievementService):
+    def __init__(
+        self, achievement_service: AchievementService, goal_service: GoalService
+    ):
         self.achievement_service = achievement_service
+        self.goal_service = goal_service
 
     async def create_run(
         self, uow: ABCUnitOfWork, user_uuid: UUID, data: RunCreateRequest
@@ -21,9 +35,12 @@ class RunService:
             run_data = data.model_dump()
             run_data["user_uuid"] = user_uuid
             run = await uow.run.create_one(run_data)
+            stored_at = time.perf_counter()
+            await self.goal_service.record_run_progress(uow, user_uuid, run)
 
             # Check for achievements
             await self.achievement_service.check_and_award_achievements(uow, user_uuid)
+            achievement_lag_seconds.observe(time.perf_counter() - stored_at)
 
             return RunResponse.model_validate(run)
 
@@ -69,13 +86,15 @@ class RunService:
                 order_column.desc() if order == SortOrder.DESC else order_column.asc()
             )
 
-            runs, total = await uow.run.get_many(
+            runs, total = await uow.run.get_many_rows(
                 page=page,
                 limit=limit,
                 filters=filters,
                 order_by=[order_expr],
             )
-            run_responses = [RunResponse.model_validate(run) for run in runs]
+            run_responses = run_responses_adapter.validate_python(
+                runs, from_attributes=True
+            )
             return run_responses, total
 
     async def get_run(
@@ -95,25 +114,25 @@ class RunService:
         data: RunUpdateRequest,
     ) -> RunResponse:
         async with uow:
-            run = await uow.run.get_one(uuid=run_uuid, user_uuid=user_uuid)
-            if not run:
-                raise ObjectNotFoundException(run_uuid, "Run")
-
             update_data = data.model_dump(exclude_unset=True)
-            updated_run = await uow.run.update_one(run_uuid, update_data)
+            updated_run = await uow.run.update_one(
+                run_uuid, update_data, user_uuid=user_uuid
+            )
+            if not updated_run:
+                raise ObjectNotFoundException(run_uuid, "Run")
             return RunResponse.model_validate(updated_run)
 
     async def delete_run(
         self, uow: ABCUnitOfWork, user_uuid: UUID, run_uuid: UUID
     ) -> RunResponse:
         async with uow:
-            run = await uow.run.get_one(uuid=run_uuid, user_uuid=user_uuid)
+            run = await uow.run.delete_one(run_uuid, user_uuid=user_uuid)
             if not run:
                 raise ObjectNotFoundException(run_uuid, "Run")
 
-            await uow.run.delete_one(run_uuid)
+            await self.goal_service.remove_run_progress(uow, user_uuid, run)
             return RunResponse.model_validate(run)
 
 
 def get_run_service() -> RunService:
-    return RunService(get_achievement_service())
+    return RunService(get_achievement_service(), get_goal_service())
@@ -2,11 +2,8 @@ from datetime import datetime, timedelta
 from typing import List
 from uuid import UUID
 
-from sqlalchemy import desc, func, select
-
 from app.core.unit_of_work import ABCUnitOfWork
 from app.enums.statistics import StatisticsPeriod
-from app.models.run import Run
 from app.schemas.statistics import (
     PersonalRecords,
     StreakStats,
@@ -21,73 +18,27 @@ class StatisticsService:
         self, uow: ABCUnitOfWork, user_uuid: UUID
     ) -> UserStatisticsResponse:
         async with uow:
-            totals = await self._calculate_totals(uow, user_uuid)
-            personal_records = await self._calculate_personal_records(uow, user_uuid)
+            row = await uow.run.get_statistics(user_uuid)
             streaks = await self._calculate_streaks(uow, user_uuid)
             return UserStatisticsResponse(
-                totals=totals,
+                totals=TotalStats(
+                    total_distance=row.total_distance or 0.0,
+                    total_duration=row.total_duration or 0.0,
+                    total_workouts=row.total_workouts or 0,
+                ),
                 streaks=streaks,
-                personal_records=personal_records,
+                personal_records=PersonalRecords(
+                    # Pace (min/km) = duration / distance, lower is better
+                    fastest_pace=row.fastest_pace,
+                    longest_distance=row.longest_distance,
+                    longest_duration=row.longest_duration,
+                ),
             )
 
-    async def _calculate_totals(
-        self, uow: ABCUnitOfWork, user_uuid: UUID
-    ) -> TotalStats:
-        stmt = select(
-            func.sum(Run.distance),
-            func.sum(Run.duration),
-            func.count(Run.uuid),
-        ).where(Run.user_uuid == user_uuid)
-
-        result = await uow.session.execute(stmt)
-        distance, duration, count = result.one()
-
-        return TotalStats(
-            total_distance=distance or 0.0,
-            total_duration=duration or 0.0,
-            total_workouts=count or 0,
-        )
-
-    async def _calculate_personal_records(
-        self, uow: ABCUnitOfWork, user_uuid: UUID
-    ) -> PersonalRecords:
-        # Longest Distance
-        stmt_dist = select(func.max(Run.distance)).where(Run.user_uuid == user_uuid)
-        res_dist = await uow.session.execute(stmt_dist)
-        longest_dist = res_dist.scalar()
-
-        # Longest Duration
-        stmt_dur = select(func.max(Run.duration)).where(Run.user_uuid == user_uuid)
-        res_dur = await uow.session.execute(stmt_dur)
-        longest_dur = res_dur.scalar()
-
-        # Fastest Pace (min/km) - Lower is better.
-        # Pace = duration / distance. We need to handle division by zero.
-        # Let's fetch runs with distance > 0 and calculate in DB or Python.
-        # SQL: MIN(duration / distance)
-        stmt_pace = select(func.min(Run.duration / Run.distance)).where(
-            Run.user_uuid == user_uuid, Run.distance > 0
-        )
-        res_pace = await uow.session.execute(stmt_pace)
-        fastest_pace = res_pace.scalar()
-
-        return PersonalRecords(
-            fastest_pace=fastest_pace,
-            longest_distance=longest_dist,
-            longest_duration=longest_dur,
-        )
-
     async def _calculate_streaks(
         self, uow: ABCUnitOfWork, user_uuid: UUID
     ) -> StreakStats:
-        stmt = (
-            select(func.date(Run.start_time))
-            .where(Run.user_uuid == user_uuid)
-            .distinct()
-            .order_by(desc(func.date(Run.start_time)))
-        )
-        result = await uow.session.execute(stmt)
-        dates = [row[0] for row in result.all()]
+        dates = await uow.run.get_run_dates(user_uuid)
 
         if not dates:
             return StreakStats(current_streak=0, longest_streak=0)
@@ -169,34 +120,16 @@ class StatisticsService:
     async def _aggregate_runs(
         self, uow: ABCUnitOfWork, user_uuid: UUID, start_date: datetime, group_by: str
     ) -> List[VisualizationDataPoint]:
-        # This is DB specific (Postgres).
-        # We need to truncate date.
-
         if group_by == "day":
-            date_trunc = func.date_trunc("day", Run.start_time)
             label_fmt = "YYYY-MM-DD"
         elif group_by == "month":
-            date_trunc = func.date_trunc("month", Run.start_time)
             label_fmt = "YYYY-MM"
         elif group_by == "year":
-            date_trunc = func.date_trunc("year", Run.start_time)
             label_fmt = "YYYY"
         else:
             raise ValueError("Invalid group_by")
 
-        stmt = (
-            select(
-                func.to_char(date_trunc, label_fmt).label("label"),
-                func.sum(Run.distance).label("distance"),
-                func.sum(Run.duration).label("duration"),
-                func.count(Run.uuid).label("count"),
-            )
-            .where(Run.user_uuid == user_uuid, Run.start_time >= start_date)
-            .group_by("label")
-            .order_by("label")
-        )
-
-        result = await uow.session.execute(stmt)
+        rows = await uow.run.get_aggregates(user_uuid, start_date, group_by, label_fmt)
         db_points = {
             row.label: VisualizationDataPoint(
                 label=row.label,
@@ -204,7 +137,7 @@ class StatisticsService:
                 duration=row.duration or 0.0,
                 count=row.count or 0,
             )
-            for row in result.all()
+            for row in rows
         }
 
         points = []
@@ -1,16 +1,47 @@
 from uuid import UUID
 
+from app.core.config import settings
+from app.core.exc import ObjectNotFoundException
 from app.core.unit_of_work import ABCUnitOfWork
-from app.schemas.users import UserResponse, UserUpdateRequest
+from app.models import User
+from app.schemas.users import (
+    UserResponse,
+    UserUpdateRequest,
+    user_responses_adapter,
+)
+from app.utils.cache import TTLCache
+
+# Authenticated users by uuid, saves the users lookup on every request
+user_cache: TTLCache[UUID, User] = TTLCache(
+    maxsize=settings.auth.USER_CACHE_MAX_SIZE,
+    ttl=settings.auth.USER_CACHE_TTL_SECONDS,
+    name="user",
+)
 
 
 class UserService:
+    async def get_user(self, uow: ABCUnitOfWork, user_uuid: UUID) -> User | None:
+        """Returns the user from the cache, loading it on a miss."""
+        user = user_cache.get(user_uuid)
+        if user is not None:
+            return user
+
+        generation = user_cache.generation
+        async with uow:
+            user = await uow.user.get_by_uuid(user_uuid)
+
+        if user is not None:
+            user_cache.set(user_uuid, user, generation=generation)
+        return user
+
     async def list_users(
         self, uow: ABCUnitOfWork, page: int = 1, limit: int = 10
     ) -> tuple[list[UserResponse], int]:
         async with uow:
-            users, total = await uow.user.get_many(page=page, limit=limit)
-            user_responses = [UserResponse.model_validate(user) for user in users]
+            users, total = await uow.user.get_many_rows(page=page, limit=limit)
+            user_responses = user_responses_adapter.validate_python(
+                users, from_attributes=True
+            )
             return user_responses, total
 
     async def update_current_user(
@@ -27,7 +58,23 @@ class UserService:
             }
 
             user = await uow.user.update_one(user_uuid, filtered_data)
-            return UserResponse.model_validate(user)
+            if not user:
+                raise ObjectNotFoundException(user_uuid, "User")
+
+        # After the commit: a miss that read the old row before it sees the
+        # generation change and doesn't cache it
+        user_cache.invalidate(user_uuid)
+        return UserResponse.model_validate(user)
+
+    async def delete_user(self, uow: ABCUnitOfWork, user_uuid: UUID) -> UserResponse:
+        """Deletes the user along with their runs, goals and achievements."""
+        async with uow:
+            user = await uow.user.delete_one(user_uuid)
+            if not user:
+                raise ObjectNotFoundException(user_uuid, "User")
+
+        user_cache.invalidate(user_uuid)
+        return UserResponse.model_validate(user)
 
 
 def get_user_service() -> UserService:
@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+from app.core.metrics import Counter, Gauge
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Caches reported in the metrics, by name
+_caches: dict[str, "TTLCache"] = {}
+
+cache_hits = Counter(
+    "cache_hits_total",
+    "Lookups answered from an in-process cache",
+    labels=("cache",),
+    callback=lambda: {(name,): cache.hits for name, cache in _caches.items()},
+)
+cache_misses = Counter(
+    "cache_misses_total",
+    "Lookups of in-process caches that found no valid entry",
+    labels=("cache",),
+    callback=lambda: {(name,): cache.misses for name, cache in _caches.items()},
+)
+cache_hit_ratio = Gauge(
+    "cache_hit_ratio",
+    "Share of lookups answered from an in-process cache",
+    labels=("cache",),
+    callback=lambda: {(name,): cache.hit_rate for name, cache in _caches.items()},
+)
+cache_entries = Gauge(
+    "cache_entries",
+    "Entries held by an in-process cache",
+    labels=("cache",),
+    callback=lambda: {(name,): len(cache) for name, cache in _caches.items()},
+)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache with a bounded size whose entries expire after `ttl`
+    seconds. Meant to be used from the event loop thread only. Caches given a
+    `name` are reported in the metrics.
+
+    `generation` changes on every invalidation. A value loaded after reading
+    it is only stored if it hasn't changed since, so a load racing with an
+    invalidation can't put the old value back.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        if name is not None:
+            _caches[name] = self
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        if self.maxsize <= 0 or generation not in (None, self.generation):
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+        self.generation += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
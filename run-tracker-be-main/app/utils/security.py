@@ -1,11 +1,19 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
+from uuid import uuid4
 
 import bcrypt
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config.settings import settings
+from app.core.exc import PasswordHashQueueFullException
+from app.core.metrics import Gauge
+from app.utils.cache import TTLCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -22,15 +30,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int | None = None) -> str:
     if len(password.encode("utf-8")) > 72:
         password = password[:72]
 
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=rounds or settings.auth.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
+def get_password_hash_rounds(hashed_password: str) -> int | None:
+    """Extracts the cost factor from a "$2b$<rounds>$..." bcrypt hash."""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool so hashing never blocks the
+    event loop. bcrypt releases the GIL, so the pool uses real CPU parallelism.
+    When more than `max_pending` operations are queued new ones are rejected
+    instead of piling up behind each other.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int) -> None:
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return get_password_hash_rounds(hashed_password) != self.rounds
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise PasswordHashQueueFullException()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.auth.BCRYPT_ROUNDS,
+    workers=settings.auth.PASSWORD_HASH_WORKERS,
+    max_pending=settings.auth.PASSWORD_HASH_MAX_PENDING,
+)
+
+password_hash_pending = Gauge(
+    "password_hash_pending",
+    "bcrypt operations queued or running on the password hashing pool",
+    callback=lambda: {(): password_hasher.pending},
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -41,7 +107,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=settings.auth.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex, "type": "access"})
     encoded_jwt = jwt.encode(
         to_encode, settings.auth.SECRET_KEY, algorithm=settings.auth.ALGORITHM
     )
@@ -58,19 +124,43 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
             days=settings.auth.REFRESH_TOKEN_EXPIRE_DAYS
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex, "type": "refresh"})
     encoded_jwt = jwt.encode(
         to_encode, settings.auth.SECRET_KEY, algorithm=settings.auth.ALGORITHM
     )
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[dict]:
-    """Decode and validate JWT token."""
-    try:
-        payload = jwt.decode(
-            token, settings.auth.SECRET_KEY, algorithms=[settings.auth.ALGORITHM]
-        )
-        return payload
-    except JWTError:
+# Verified claims by token digest, every entry lives until the token expires
+token_cache: TTLCache[bytes, dict] = TTLCache(
+    maxsize=settings.auth.TOKEN_CACHE_MAX_SIZE, ttl=0, name="token"
+)
+
+
+def _get_token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def decode_token(token: str, token_type: str = "access") -> Optional[dict]:
+    """
+    Decode and validate JWT token, None unless it is a valid `token_type` token.
+    Verified claims are cached, so a token reused for its whole lifetime only
+    has its signature checked once. Callers must not modify the returned dict.
+    """
+    digest = _get_token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token, settings.auth.SECRET_KEY, algorithms=[settings.auth.ALGORITHM]
+            )
+        except JWTError:
+            return None
+
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            token_cache.set(digest, payload, ttl=expires_in)
+
+    if payload.get("type") != token_type:
         return None
+    return payload
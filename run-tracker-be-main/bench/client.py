@@ -0,0 +1,94 @@
+"""Minimal HTTP/1.1 keep-alive client on asyncio streams for the load benchmarks."""
+
+import asyncio
+import json
+from typing import Any
+from urllib.parse import urlsplit
+
+
+class HTTPClient:
+    """
+    One persistent connection, requests are sent one after another. A load
+    worker owns one client, like a browser tab keeping its connection open.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        url = urlsplit(base_url)
+        self.host = url.hostname or "localhost"
+        self.port = url.port or 80
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        token: str | None = None,
+        body: Any = None,
+    ) -> tuple[int, bytes]:
+        """Returns the status code and the body, reconnecting once if needed."""
+        try:
+            return await self._request(method, path, token, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The server closed an idle keep-alive connection
+            await self.close()
+            return await self._request(method, path, token, body)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        self._reader = self._writer = None
+
+    async def _request(
+        self, method: str, path: str, token: str | None, body: Any
+    ) -> tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+
+        content = b"" if body is None else json.dumps(body).encode()
+        head = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Content-Length: {len(content)}",
+        ]
+        if body is not None:
+            head.append("Content-Type: application/json")
+        if token is not None:
+            head.append(f"Authorization: Bearer {token}")
+        self._writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + content)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while (line := await self._reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            data = await self._read_chunked()
+        else:
+            data = await self._reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self._reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await self._reader.readline()
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readline()
@@ -0,0 +1,81 @@
+"""
+Compares two result files of bench.load, scenario by scenario, and exits with 1
+when a latency percentile grew (or the throughput dropped) by more than the
+threshold.
+
+Usage:
+    python -m bench.compare bench/results/<before>.json bench/results/<after>.json
+    python -m bench.compare before.json after.json --threshold 5
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Metrics compared, with True where higher is better
+METRICS = {
+    "throughput_rps": True,
+    "p50": False,
+    "p95": False,
+    "p99": False,
+}
+
+
+def _value(summary: dict, metric: str) -> float:
+    if metric in summary:
+        return summary[metric]
+    return summary["latency_ms"][metric]
+
+
+def _change(before: float, after: float) -> float:
+    if before == 0:
+        return 0.0 if after == 0 else float("inf")
+    return (after - before) / before * 100
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Change in percent counted as a regression",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+    print(f"before: {before['commit']} ({before['started_at']})")
+    print(f"after:  {after['commit']} ({after['started_at']})")
+
+    regressions = []
+    print(f"\n{'scenario':<14}{'metric':<16}{'before':>10}{'after':>10}{'change':>10}")
+    for name, summary in after["scenarios"].items():
+        if name not in before["scenarios"]:
+            print(f"{name:<14}not in {args.before}")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old = _value(before["scenarios"][name], metric)
+            new = _value(summary, metric)
+            change = _change(old, new)
+            regressed = (-change if higher_is_better else change) > args.threshold
+            if regressed:
+                regressions.append(f"{name} {metric}")
+            print(
+                f"{name:<14}{metric:<16}{old:>10.1f}{new:>10.1f}{change:>+9.1f}%"
+                + ("  regression" if regressed else "")
+            )
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
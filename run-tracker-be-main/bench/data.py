@@ -0,0 +1,167 @@
+"""Synthetic data shared by the benchmarks."""
+
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from app.enums.goal import GoalType, TimePeriod
+
+# Same circular route around Kyiv as the frontend's GeoSimulator
+START_LAT = 50.4501
+START_LNG = 30.5234
+RADIUS = 0.0025
+
+BENCH_PASSWORD = "bench-password"
+
+# Sensible targets per goal type and period: km, minutes or runs
+GOAL_TARGETS = {
+    GoalType.DISTANCE: {
+        TimePeriod.WEEKLY: 20,
+        TimePeriod.MONTHLY: 80,
+        TimePeriod.YEARLY: 800,
+    },
+    GoalType.DURATION: {
+        TimePeriod.WEEKLY: 120,
+        TimePeriod.MONTHLY: 500,
+        TimePeriod.YEARLY: 5000,
+    },
+    GoalType.NUMBER_OF_RUNS: {
+        TimePeriod.WEEKLY: 3,
+        TimePeriod.MONTHLY: 12,
+        TimePeriod.YEARLY: 120,
+    },
+}
+
+
+def make_route(
+    rng: random.Random, points: int, started_at: datetime
+) -> list[dict[str, Any]]:
+    """
+    Route points as the frontend records them, one per second:
+    latitude, longitude, accuracy, speed (m/s) and timestamp (ms).
+    """
+    route = []
+    angle = rng.uniform(0, 360)
+    timestamp = int(started_at.timestamp() * 1000)
+    for _ in range(points):
+        speed_kmh = 10 + (rng.random() - 0.5) * 1.6
+        angle += (speed_kmh * 1000 / 3600) / (RADIUS * 111000) * (360 / (2 * math.pi))
+        route.append(
+            {
+                "latitude": START_LAT + RADIUS * math.cos(math.radians(angle)),
+                "longitude": START_LNG + RADIUS * 1.5 * math.sin(math.radians(angle)),
+                "accuracy": 5,
+                "speed": speed_kmh / 3.6,
+                "timestamp": timestamp,
+            }
+        )
+        timestamp += 1000
+    return route
+
+
+def make_run(
+    rng: random.Random, user_uuid: UUID, start_time: datetime, route_points: int
+) -> dict[str, Any]:
+    """Values of a run for RunRepository.create_one / create_many."""
+    duration = rng.uniform(15, 90)
+    distance = duration / 60 * rng.uniform(8, 12)
+    return {
+        "user_uuid": user_uuid,
+        "name": f"Run {start_time:%Y-%m-%d}",
+        "start_time": start_time,
+        "end_time": start_time + timedelta(minutes=duration),
+        "duration": duration,
+        "distance": distance,
+        "calories": int(distance * 60),
+        "route": make_route(rng, route_points, start_time),
+    }
+
+
+def user_rng(seed: int, index: int) -> random.Random:
+    """Random generator of one user, so users can be generated independently."""
+    return random.Random(f"{seed}:{index}")
+
+
+def make_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def bench_email(index: int) -> str:
+    return f"bench-{index}@example.com"
+
+
+def bench_user_uuid(seed: int, index: int) -> UUID:
+    """The uuid `make_user` gives the user, without generating anything else."""
+    return make_uuid(user_rng(seed, index))
+
+
+def power_law_count(
+    rng: random.Random, alpha: float, minimum: int, maximum: int
+) -> int:
+    """
+    Pareto distributed count: most users have few runs, a handful have very many,
+    like the activity of real users.
+    """
+    return min(maximum, int(minimum * rng.paretovariate(alpha)))
+
+
+def make_user(rng: random.Random, index: int, hashed_password: str) -> dict[str, Any]:
+    """Values of a user, the first value taken from `rng` is its uuid."""
+    return {
+        "uuid": make_uuid(rng),
+        "email": bench_email(index),
+        "hashed_password": hashed_password,
+        "username": f"bench{index}",
+        "age": rng.randint(16, 70),
+        "gender": rng.choice(["male", "female"]),
+        "height": rng.randint(150, 200),
+        "weight": rng.randint(45, 110),
+    }
+
+
+def make_goal(rng: random.Random, user_uuid: UUID) -> dict[str, Any]:
+    goal_type = rng.choice(GoalType.members())
+    time_period = rng.choice(TimePeriod.members())
+    return {
+        "uuid": make_uuid(rng),
+        "user_uuid": user_uuid,
+        "goal_type": goal_type,
+        "time_period": time_period,
+        "target": GOAL_TARGETS[goal_type][time_period],
+        "is_active": True,
+    }
+
+
+def make_user_dataset(
+    seed: int,
+    index: int,
+    hashed_password: str,
+    today: datetime,
+    alpha: float,
+    min_runs: int,
+    max_runs: int,
+    max_goals: int,
+    route_points: int,
+) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Values of a bench user with Pareto distributed runs over the year before
+    `today` and a few goals, the same for the same arguments.
+    """
+    rng = user_rng(seed, index)
+    user = make_user(rng, index, hashed_password)
+
+    count = power_law_count(rng, alpha, min_runs, max_runs)
+    offsets = sorted(rng.uniform(0, 365 * 24) for _ in range(count))
+    runs = [
+        {
+            "uuid": make_uuid(rng),
+            **make_run(
+                rng, user["uuid"], today - timedelta(hours=offset), route_points
+            ),
+        }
+        for offset in offsets
+    ]
+    goals = [make_goal(rng, user["uuid"]) for _ in range(rng.randint(0, max_goals))]
+    return user, runs, goals
@@ -0,0 +1,146 @@
+"""
+Compares GET /api/runs/ responses rendered by FastAPI's default path (response
+model dumped to a dict, validated again, encoded by jsonable_encoder and the
+stdlib json module) with the app's JSONRoute and FastJSONResponse.
+
+Both apps serve the real runs router, only the service, the unit of work and
+the authentication are replaced, so no database is needed.
+
+Usage:
+    python -m bench.json_responses --limits 100 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, FastAPI
+
+from app.core.responses import FastJSONResponse
+from app.core.unit_of_work import ReadOnlyUnitOfWork
+from app.dependencies import get_current_user_uuid
+from app.routers.runs import router as runs_router
+from app.schemas.runs import RunResponse, run_responses_adapter
+from app.services.run import get_run_service
+from bench.data import make_run
+
+USER_UUID = uuid.uuid4()
+
+
+class StubRunService:
+    def __init__(self, runs: list[RunResponse]) -> None:
+        self.runs = runs
+
+    async def list_runs(
+        self, uow, user_uuid, page: int = 1, limit: int = 10, **kwargs
+    ) -> tuple[list[RunResponse], int]:
+        return self.runs[:limit], len(self.runs)
+
+
+def _make_runs(count: int, route_points: int) -> list[RunResponse]:
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        run = make_run(rng, USER_UUID, now - timedelta(hours=i), route_points)
+        rows.append({**run, "uuid": uuid.uuid4(), "created_at": now, "updated_at": now})
+    return run_responses_adapter.validate_python(rows)
+
+
+def _create_app(fast: bool, runs_list: list[RunResponse]) -> FastAPI:
+    if fast:
+        app = FastAPI(default_response_class=FastJSONResponse)
+        app.include_router(runs_router, prefix="/api/runs")
+    else:
+        # Same endpoints on FastAPI's default route and response classes
+        app = FastAPI()
+        router = APIRouter()
+        for route in runs_router.routes:
+            router.add_api_route(
+                route.path,
+                # JSONRoute's wrapper, functools.wraps keeps the original
+                route.endpoint.__wrapped__,
+                methods=list(route.methods),
+                response_model=route.response_model,
+                status_code=route.status_code,
+            )
+        app.include_router(router, prefix="/api/runs")
+
+    app.dependency_overrides[get_current_user_uuid] = lambda: USER_UUID
+    app.dependency_overrides[ReadOnlyUnitOfWork] = lambda: None
+    app.dependency_overrides[get_run_service] = lambda: StubRunService(runs_list)
+    return app
+
+
+async def _get(app: FastAPI, path: str, query: str) -> bytes:
+    """Calls the ASGI app directly, without a server or an HTTP client."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"GET {path}?{query}: {message['status']}")
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def _measure(app: FastAPI, limit: int, repeat: int) -> tuple[float, bytes]:
+    """Returns the median milliseconds of `repeat` requests and the last body."""
+    body = await _get(app, "/api/runs/", f"limit={limit}")
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await _get(app, "/api/runs/", f"limit={limit}")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), body
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--route-points", type=int, default=60)
+    args = parser.parse_args()
+
+    runs_list = _make_runs(max(args.limits), args.route_points)
+    default_app = _create_app(False, runs_list)
+    fast_app = _create_app(True, runs_list)
+
+    print(f"{'limit':>8}{'MB':>8}{'default ms':>12}{'fast ms':>10}{'speedup':>9}")
+    for limit in args.limits:
+        default_ms, default_body = await _measure(default_app, limit, args.repeat)
+        fast_ms, fast_body = await _measure(fast_app, limit, args.repeat)
+        if json.loads(default_body) != json.loads(fast_body):
+            raise RuntimeError(f"Responses differ at limit={limit}")
+        print(
+            f"{limit:>8}{len(fast_body) / 1e6:>8.1f}{default_ms:>12.1f}"
+            f"{fast_ms:>10.1f}{default_ms / fast_ms:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Compares the two read paths of the runs list at several sizes: ORM entities
+validated one by one with `model_validate`, versus plain rows from
+`get_many_rows` validated by the precompiled list TypeAdapter.
+
+Seeds a throwaway user with runs inside a transaction that is rolled back at
+the end, so it can be pointed at any database migrated to head.
+
+Usage:
+    python -m bench.list_read_path --rows 1000 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app.core.db import async_session, engine
+from app.models import Run, User
+from app.repositories.run import RunRepository
+from app.schemas.runs import RunResponse, run_responses_adapter
+from bench.data import make_run
+
+
+async def _orm_path(repo: RunRepository, user_uuid: uuid.UUID, limit: int) -> int:
+    runs, _ = await repo.get_many(
+        limit=limit, user_uuid=user_uuid, order_by=[Run.start_time.desc()]
+    )
+    responses = [RunResponse.model_validate(run) for run in runs]
+    # Start the next repetition without entities in the identity map
+    repo.session.expunge_all()
+    return len(responses)
+
+
+async def _row_path(repo: RunRepository, user_uuid: uuid.UUID, limit: int) -> int:
+    runs, _ = await repo.get_many_rows(
+        limit=limit, user_uuid=user_uuid, order_by=[Run.start_time.desc()]
+    )
+    responses = run_responses_adapter.validate_python(runs, from_attributes=True)
+    return len(responses)
+
+
+async def _measure(path, repo, user_uuid, limit: int, repeat: int) -> float:
+    """Returns the median milliseconds of `repeat` calls after a warm-up call."""
+    await path(repo, user_uuid, limit)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await path(repo, user_uuid, limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--route-points", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    session = async_session()
+    try:
+        await session.begin()
+        user_uuid = await session.scalar(
+            insert(User)
+            .values(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="-")
+            .returning(User.uuid)
+        )
+        now = datetime.now(timezone.utc)
+        runs = [
+            make_run(rng, user_uuid, now - timedelta(hours=i), args.route_points)
+            for i in range(max(args.rows))
+        ]
+        for i in range(0, len(runs), 1000):
+            await session.execute(insert(Run), runs[i : i + 1000])
+
+        repo = RunRepository(session)
+        print(f"{'rows':>8}{'ORM ms':>10}{'rows ms':>10}{'speedup':>9}")
+        for limit in args.rows:
+            orm_ms = await _measure(_orm_path, repo, user_uuid, limit, args.repeat)
+            row_ms = await _measure(_row_path, repo, user_uuid, limit, args.repeat)
+            print(f"{limit:>8}{orm_ms:>10.1f}{row_ms:>10.1f}{orm_ms / row_ms:>8.2f}x")
+    finally:
+        await session.rollback()
+        await session.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
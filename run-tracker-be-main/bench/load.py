@@ -0,0 +1,330 @@
+"""
+Runs load scenarios against a running app whose database was seeded by
+bench.seed, and writes throughput and p50/p95/p99 latencies as JSON.
+
+Every scenario keeps --concurrency workers, each with its own keep-alive
+connection and a seeded user, sending requests back to back for --duration
+seconds after --warmup seconds that are not measured. Access tokens are signed
+locally, so AUTH_SECRET_KEY must match the app's. The auth scenario signs in
+repeatedly; run the app with AUTH_RATE_LIMIT_ENABLED=false or expect 429s.
+
+Usage:
+    python -m bench.load --users 1000 --seed 42
+    python -m bench.load --scenarios runs statistics --concurrency 50 --duration 30
+    python -m bench.compare bench/results/<before>.json bench/results/<after>.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from app.utils.security import create_access_token, create_refresh_token
+from bench.client import HTTPClient
+from bench.data import BENCH_PASSWORD, bench_email, bench_user_uuid, make_run
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class BenchUser:
+    index: int
+    uuid: UUID
+    access_token: str
+    run_uuids: list[str] = field(default_factory=list)
+    goal_uuids: list[str] = field(default_factory=list)
+
+
+# (method, path, body) sent with the user's access token, or without it when
+# the body is a sign-in or refresh request
+Request = tuple[str, str, Any]
+RequestFactory = Callable[[BenchUser, random.Random], Request]
+
+
+def _list_runs(user: BenchUser, rng: random.Random) -> Request:
+    return "GET", f"/api/runs/?page={rng.randint(1, 3)}&limit=20", None
+
+
+def _filter_runs(user: BenchUser, rng: random.Random) -> Request:
+    period = rng.choice(["LAST_7_DAYS", "LAST_30_DAYS", "LAST_YEAR"])
+    sort_by = rng.choice(["DATE", "DISTANCE", "DURATION"])
+    return "GET", f"/api/runs/?period={period}&sort_by={sort_by}&min_distance=3", None
+
+
+def _get_run(user: BenchUser, rng: random.Random) -> Request:
+    if not user.run_uuids:
+        return _list_runs(user, rng)
+    return "GET", f"/api/runs/{rng.choice(user.run_uuids)}", None
+
+
+def _statistics(user: BenchUser, rng: random.Random) -> Request:
+    return "GET", "/api/statistics/", None
+
+
+def _visualization(user: BenchUser, rng: random.Random) -> Request:
+    period = rng.choice(["LAST_7_DAYS", "LAST_30_DAYS", "LAST_YEAR"])
+    return "GET", f"/api/statistics/visualization?period={period}", None
+
+
+def _leaderboard(user: BenchUser, rng: random.Random) -> Request:
+    metric = rng.choice(["distance", "duration", "runs"])
+    period = rng.choice(["week", "month", "all_time"])
+    return "GET", f"/api/leaderboard/?metric={metric}&period={period}", None
+
+
+def _list_goals(user: BenchUser, rng: random.Random) -> Request:
+    return "GET", "/api/goals/?with_progress=true", None
+
+
+def _goal_history(user: BenchUser, rng: random.Random) -> Request:
+    if not user.goal_uuids:
+        return _list_goals(user, rng)
+    return "GET", f"/api/goals/{rng.choice(user.goal_uuids)}/history", None
+
+
+def _list_achievements(user: BenchUser, rng: random.Random) -> Request:
+    return "GET", "/api/achievements/?limit=20", None
+
+
+def _sign_in(user: BenchUser, rng: random.Random) -> Request:
+    body = {"email": bench_email(user.index), "password": BENCH_PASSWORD}
+    return "POST", "/api/auth/sign-in", body
+
+
+def _refresh(user: BenchUser, rng: random.Random) -> Request:
+    # Refresh tokens are single use, each request gets a new one
+    refresh_token = create_refresh_token({"sub": str(user.uuid)})
+    return "POST", "/api/auth/refresh", {"refresh_token": refresh_token}
+
+
+def _create_run(user: BenchUser, rng: random.Random) -> Request:
+    started_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    run = make_run(rng, user.uuid, started_at, 300)
+    del run["user_uuid"]
+    return "POST", "/api/runs/", json.loads(json.dumps(run, default=str))
+
+
+# Weighted requests of each scenario, one per router
+SCENARIOS: dict[str, list[tuple[int, RequestFactory]]] = {
+    "runs": [(6, _list_runs), (2, _filter_runs), (2, _get_run)],
+    "statistics": [(1, _statistics), (1, _visualization)],
+    "leaderboard": [(1, _leaderboard)],
+    "goals": [(2, _list_goals), (1, _goal_history)],
+    "achievements": [(1, _list_achievements)],
+    "auth": [(1, _sign_in), (3, _refresh)],
+    # Adds runs to the seeded users, so it is only run when asked for
+    "runs-write": [(1, _create_run)],
+}
+DEFAULT_SCENARIOS = [name for name in SCENARIOS if name != "runs-write"]
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def summary(self, duration: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        else:
+            percentiles = latencies * 99 or [0.0] * 99
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "throughput_rps": round(len(latencies) / duration, 1),
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "p50": round(percentiles[49], 2),
+                "p95": round(percentiles[94], 2),
+                "p99": round(percentiles[98], 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+        }
+
+
+async def _prepare_users(
+    base_url: str, seed: int, users: int, sample: int
+) -> list[BenchUser]:
+    """Signs tokens for a sample of the seeded users and collects their ids."""
+    rng = random.Random(seed)
+    indexes = rng.sample(range(users), min(sample, users))
+    client = HTTPClient(base_url)
+    prepared = []
+    try:
+        for index in indexes:
+            user_uuid = bench_user_uuid(seed, index)
+            user = BenchUser(
+                index=index,
+                uuid=user_uuid,
+                access_token=create_access_token({"sub": str(user_uuid)}),
+            )
+            status, body = await client.request(
+                "GET", "/api/runs/?limit=50", user.access_token
+            )
+            if status != 200:
+                raise RuntimeError(
+                    f"GET /api/runs/ for bench user {index}: {status} {body[:200]!r}, "
+                    "is the database seeded with the same --seed?"
+                )
+            user.run_uuids = [run["uuid"] for run in json.loads(body)["runs"]]
+            status, body = await client.request("GET", "/api/goals/", user.access_token)
+            user.goal_uuids = [goal["uuid"] for goal in json.loads(body)["goals"]]
+            prepared.append(user)
+    finally:
+        await client.close()
+    return prepared
+
+
+async def _worker(
+    base_url: str,
+    requests: list[tuple[int, RequestFactory]],
+    user: BenchUser,
+    rng: random.Random,
+    measure_from: float,
+    stop_at: float,
+    result: ScenarioResult,
+) -> None:
+    weights = [weight for weight, _ in requests]
+    factories = [factory for _, factory in requests]
+    client = HTTPClient(base_url)
+    try:
+        while (now := time.perf_counter()) < stop_at:
+            factory = rng.choices(factories, weights)[0]
+            method, path, body = factory(user, rng)
+            # Sign-in and refresh are the only requests without a token
+            token = None if path.startswith("/api/auth/") else user.access_token
+            try:
+                status, _ = await client.request(method, path, token, body)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                status = None
+                await client.close()
+            if now < measure_from:
+                continue
+
+            latency = (time.perf_counter() - now) * 1000
+            if status is None:
+                result.errors += 1
+                continue
+            result.latencies.append(latency)
+            result.status_codes[status] += 1
+            if status >= 400:
+                result.errors += 1
+    finally:
+        await client.close()
+
+
+async def _run_scenario(
+    name: str, users: list[BenchUser], args: argparse.Namespace
+) -> dict[str, Any]:
+    result = ScenarioResult()
+    measure_from = time.perf_counter() + args.warmup
+    stop_at = measure_from + args.duration
+    await asyncio.gather(
+        *(
+            _worker(
+                args.base_url,
+                SCENARIOS[name],
+                users[i % len(users)],
+                random.Random(f"{args.seed}:{name}:{i}"),
+                measure_from,
+                stop_at,
+                result,
+            )
+            for i in range(args.concurrency)
+        )
+    )
+    return result.summary(args.duration)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=DEFAULT_SCENARIOS
+    )
+    parser.add_argument("--users", type=int, default=1000, help="As seeded")
+    parser.add_argument("--seed", type=int, default=42, help="As seeded")
+    parser.add_argument(
+        "--sample-users",
+        type=int,
+        default=100,
+        help="Seeded users the workers act as",
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Results file, by default bench/results/<time>-<commit>.json",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+    users = await _prepare_users(
+        args.base_url, args.seed, args.users, args.sample_users
+    )
+
+    started_at = datetime.now(timezone.utc)
+    results = {}
+    print(
+        f"{'scenario':<14}{'requests':>9}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for name in args.scenarios:
+        summary = await _run_scenario(name, users, args)
+        results[name] = summary
+        latency = summary["latency_ms"]
+        print(
+            f"{name:<14}{summary['requests']:>9}{summary['errors']:>8}"
+            f"{summary['throughput_rps']:>9.1f}{latency['p50']:>9.1f}"
+            f"{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+        )
+
+    commit = _git_commit()
+    output = args.output or RESULTS_DIR / (
+        f"{started_at:%Y%m%dT%H%M%S}-{(commit or 'unknown')[:8]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "started_at": started_at.isoformat(),
+                "arguments": {
+                    key: value for key, value in vars(args).items() if key != "output"
+                },
+                "scenarios": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
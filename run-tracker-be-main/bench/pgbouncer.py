@@ -0,0 +1,73 @@
+"""
+Integration check of the PgBouncer mode (DB_PGBOUNCER=true).
+
+Runs many concurrent units of work, each executing the same statements, through
+a PgBouncer in transaction pooling mode with fewer server connections than
+clients. Reusing asyncpg's named prepared statements fails here with
+"prepared statement ... does not exist / already exists"; in PgBouncer mode
+every unit of work has to succeed. Run against the `pgbouncer` compose profile:
+
+    DB_PGBOUNCER=true DB_HOST=localhost DB_PORT=6432 python -m bench.pgbouncer
+
+In CI it runs as the `pgbouncer` test in tests/test_pgbouncer.py.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from collections import Counter
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.unit_of_work import ReadOnlyUnitOfWork, UnitOfWork
+from app.schemas.leaderboard import LeaderboardMetric
+
+
+async def _unit_of_work(uow: UnitOfWork) -> None:
+    async with uow:
+        user_uuid = uuid.uuid4()
+        await uow.user.get_by_uuid(user_uuid)
+        await uow.run.get_statistics(user_uuid)
+        await uow.leaderboard.get_leaderboard(LeaderboardMetric.DISTANCE, limit=10)
+
+
+async def _client(iterations: int, errors: Counter) -> None:
+    for i in range(iterations):
+        uow = ReadOnlyUnitOfWork() if i % 2 else UnitOfWork()
+        try:
+            await _unit_of_work(uow)
+        except Exception as e:
+            errors[f"{type(e).__name__}: {str(e).splitlines()[0]}"] += 1
+
+
+async def run_clients(clients: int, iterations: int) -> Counter:
+    """Runs the clients concurrently and returns their errors by message."""
+    errors: Counter = Counter()
+    try:
+        await asyncio.gather(*(_client(iterations, errors) for _ in range(clients)))
+    finally:
+        await engine.dispose()
+    return errors
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    if not settings.db.PGBOUNCER:
+        print("DB_PGBOUNCER is not set, failures are expected behind PgBouncer")
+
+    errors = await run_clients(args.clients, args.iterations)
+
+    total = args.clients * args.iterations
+    print(f"{total - sum(errors.values())}/{total} units of work succeeded")
+    for error, count in errors.most_common():
+        print(f"{count:>6}  {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
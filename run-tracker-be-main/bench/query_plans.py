@@ -0,0 +1,272 @@
+"""
+Checks the plans of the repositories' per-user queries on a seeded database:
+every statement a query runs must be answered through the expected index,
+without a sequential scan, at an estimated cost below --max-cost. Exits with 1
+otherwise. In CI the same checks run as the `db` tests in tests/test_query_plans.py.
+
+The queries run as the services call them, for the seeded user with the most
+runs. Their statements are captured and explained with EXPLAIN (FORMAT JSON)
+and the same parameters; the tables are vacuumed and analyzed first, so the
+planner sees the seeded data.
+
+Usage:
+    python -m bench.seed --users 1000 --seed 42 --reset
+    python -m bench.query_plans
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import event, text
+
+from app.core.db import engine
+from app.core.unit_of_work import ABCUnitOfWork, UnitOfWork
+from app.enums.goal import TimePeriod
+from app.models import Run
+from app.services.achievement import get_achievement_service
+
+TABLES = ["users", "runs", "goals", "goal_period_progress", "achievements"]
+# Highest estimated total cost of a statement
+MAX_COST = 1000.0
+
+
+@dataclass
+class BenchUser:
+    uuid: Any
+    email: str
+    goal_uuid: Any
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    # Any of these indexes is fine
+    indexes: tuple[str, ...]
+    query: Callable[[ABCUnitOfWork, BenchUser], Awaitable[Any]]
+
+
+def _ranges() -> dict[TimePeriod, tuple[datetime, datetime]]:
+    periods = get_achievement_service().get_periods()
+    return {period: (start, end) for period, (start, end, _) in periods.items()}
+
+
+CHECKS = [
+    PlanCheck(
+        "user by uuid",
+        ("users_pkey",),
+        lambda uow, user: uow.user.get_by_uuid(user.uuid),
+    ),
+    PlanCheck(
+        "user by email",
+        ("ix_users_email",),
+        lambda uow, user: uow.user.get_by_email(user.email),
+    ),
+    PlanCheck(
+        "runs list",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_many_rows(
+            limit=20,
+            filters=[Run.user_uuid == user.uuid],
+            order_by=[Run.start_time.desc()],
+        ),
+    ),
+    PlanCheck(
+        "runs list, last 30 days",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_many_rows(
+            limit=20,
+            filters=[
+                Run.user_uuid == user.uuid,
+                Run.start_time >= datetime.now() - timedelta(days=30),
+            ],
+            order_by=[Run.start_time.desc()],
+        ),
+    ),
+    PlanCheck(
+        "run statistics",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_statistics(user.uuid),
+    ),
+    PlanCheck(
+        "run dates",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_run_dates(user.uuid),
+    ),
+    PlanCheck(
+        "run aggregates",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_aggregates(
+            user.uuid, datetime.now() - timedelta(days=365), "month", "YYYY-MM"
+        ),
+    ),
+    PlanCheck(
+        "goal period totals",
+        ("ix_runs_user_uuid_start_time",),
+        lambda uow, user: uow.run.get_totals_for_ranges(user.uuid, _ranges()),
+    ),
+    PlanCheck(
+        "active goals",
+        ("ix_goals_user_uuid_active",),
+        lambda uow, user: uow.goal.get_all(user_uuid=user.uuid, is_active=True),
+    ),
+    PlanCheck(
+        "goal history",
+        ("uq_goal_period_progress_goal_period",),
+        lambda uow, user: uow.goal_progress.get_history(user.uuid, user.goal_uuid, 12),
+    ),
+    PlanCheck(
+        "awarded goal periods",
+        # Both narrow it down to the user's goal completions, equally costed
+        ("ix_achievements_user_uuid", "uq_achievements_goal_period"),
+        lambda uow, user: uow.achievement.get_awarded_goal_periods(user_uuid=user.uuid),
+    ),
+    PlanCheck(
+        "achievements list",
+        ("ix_achievements_user_uuid",),
+        lambda uow, user: uow.achievement.get_many_rows(limit=20, user_uuid=user.uuid),
+    ),
+]
+
+
+def _iter_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _iter_nodes(child)
+
+
+async def busiest_user() -> BenchUser:
+    """The user with the most runs who has a goal with history."""
+    async with engine.connect() as conn:
+        row = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT u.uuid, u.email, (
+                        SELECT goal_uuid FROM goal_period_progress AS p
+                        WHERE p.user_uuid = u.uuid LIMIT 1
+                    )
+                    FROM users AS u
+                    JOIN (
+                        SELECT user_uuid, count(*) AS runs FROM runs GROUP BY user_uuid
+                    ) AS r ON r.user_uuid = u.uuid
+                    WHERE EXISTS (
+                        SELECT FROM goal_period_progress AS p WHERE p.user_uuid = u.uuid
+                    )
+                    ORDER BY r.runs DESC
+                    LIMIT 1
+                    """
+                )
+            )
+        ).one_or_none()
+    if row is None:
+        raise RuntimeError("No user with runs and goal history, run bench.seed first")
+    return BenchUser(*row)
+
+
+async def vacuum_analyze() -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql(f"VACUUM (ANALYZE) {', '.join(TABLES)}")
+
+
+async def capture(check: PlanCheck, user: BenchUser) -> list[tuple[str, Any]]:
+    """Runs the query and returns the statements it executed."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        async with UnitOfWork() as uow:
+            await check.query(uow, user)
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+    # BEGIN and COMMIT aren't statements of the query
+    return [(s, p) for s, p in statements if s.lstrip()[:6].upper() == "SELECT"]
+
+
+async def explain(statement: str, parameters: Any) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def find_problems(check: PlanCheck, plan: dict, max_cost: float) -> list[str]:
+    nodes = list(_iter_nodes(plan))
+    problems = [
+        f"sequential scan on {node['Relation Name']}"
+        for node in nodes
+        if node["Node Type"] == "Seq Scan"
+    ]
+    if not any(node.get("Index Name") in check.indexes for node in nodes):
+        used = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+        problems.append(
+            f"{' or '.join(check.indexes)} not used ({', '.join(used) or 'no index'})"
+        )
+    if plan["Total Cost"] > max_cost:
+        problems.append(f"cost {plan['Total Cost']:.0f} over {max_cost:.0f}")
+    return problems
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        default=MAX_COST,
+        help="Highest estimated total cost of a statement",
+    )
+    parser.add_argument(
+        "--no-vacuum",
+        action="store_true",
+        help="Skip VACUUM (ANALYZE) of the tables",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args()
+    failed = 0
+    try:
+        if not args.no_vacuum:
+            await vacuum_analyze()
+        user = await busiest_user()
+
+        print(f"{'query':<26}{'cost':>10}  plan")
+        for check in CHECKS:
+            for statement, parameters in await capture(check, user):
+                plan = await explain(statement, parameters)
+                problems = find_problems(check, plan, args.max_cost)
+                failed += bool(problems)
+                scans = ", ".join(
+                    f"{node['Node Type']} {node.get('Index Name', '')}".strip()
+                    for node in _iter_nodes(plan)
+                    if "Relation Name" in node or "Index Name" in node
+                )
+                print(f"{check.name:<26}{plan['Total Cost']:>10.1f}  {scans}")
+                for problem in problems:
+                    print(f"{'':<38}FAIL: {problem}")
+    finally:
+        await engine.dispose()
+
+    if failed:
+        print(f"\n{failed} statement(s) without the expected plan")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Seeds the configured database with a deterministic synthetic dataset for the
+load benchmarks: users with Pareto distributed numbers of runs spread over the
+last year, GPS routes like the frontend's GeoSimulator records and a few goals
+each, then rebuilds goal progress and achievements.
+
+The same arguments always give the same rows (uuids included, times relative
+to the day of seeding), and bench.load derives the users' uuids from the same
+--seed. Users sign in as bench-<index>@example.com with "bench-password".
+
+Usage:
+    python -m bench.seed --users 1000 --seed 42 --reset
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, insert
+
+from app.core.db import async_session, engine
+from app.core.unit_of_work import UnitOfWork
+from app.models import Goal, Run, User
+from app.services.achievement import get_achievement_service
+from app.utils.security import get_password_hash
+from bench.data import BENCH_PASSWORD, make_user_dataset
+
+# Rows per multi-row INSERT, keeps the statement below the bind parameter limit
+BATCH_SIZE = 1000
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=1.2,
+        help="Pareto shape of runs per user, lower means a heavier tail",
+    )
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=2000)
+    parser.add_argument("--max-goals", type=int, default=3)
+    parser.add_argument(
+        "--route-points",
+        type=int,
+        default=300,
+        help="GPS points per run, one per second",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete the bench users (and their data) before seeding",
+    )
+    return parser.parse_args()
+
+
+async def _insert(session, model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), BATCH_SIZE):
+        await session.execute(insert(model), rows[i : i + BATCH_SIZE])
+
+
+async def main() -> None:
+    args = _parse_args()
+    started = time.perf_counter()
+    # One bcrypt hash shared by all users, hashing each would take minutes
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    # Runs are placed relative to the start of the day, so that the weekly and
+    # monthly windows of the queries always contain data
+    today = datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+    total_runs = 0
+    try:
+        async with async_session() as session, session.begin():
+            if args.reset:
+                await session.execute(
+                    delete(User).where(User.email.like("bench-%@example.com"))
+                )
+
+            for index in range(args.users):
+                user, runs, goals = make_user_dataset(
+                    args.seed,
+                    index,
+                    hashed_password,
+                    today,
+                    args.alpha,
+                    args.min_runs,
+                    args.max_runs,
+                    args.max_goals,
+                    args.route_points,
+                )
+                await session.execute(insert(User).values(user))
+                await _insert(session, Run, runs)
+                await _insert(session, Goal, goals)
+                total_runs += len(runs)
+
+                if (index + 1) % 100 == 0:
+                    print(f"{index + 1}/{args.users} users, {total_runs} runs")
+
+        print("Rebuilding goal progress and achievements")
+        evaluated, awarded = await get_achievement_service().recompute_achievements(
+            UnitOfWork()
+        )
+    finally:
+        await engine.dispose()
+
+    print(
+        f"Seeded {args.users} users, {total_runs} runs, {evaluated} goal periods, "
+        f"{awarded} achievements in {time.perf_counter() - started:.0f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+"""
+Measures the pure Python cost of the services, separate from database latency:
+the statistics, achievement, leaderboard and run services run on an
+InMemoryUnitOfWork holding the dataset of bench.seed, and their responses are
+serialized the way JSONRoute does.
+
+Service numbers include the in-memory repositories, which do in Python what
+Postgres does for the real ones (filtering, aggregating); compare runs of this
+benchmark with each other, not with request latencies.
+
+Usage:
+    python -m bench.services --users 200 --iterations 200
+    python -m bench.services --scenarios statistics leaderboard-month
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.enums.statistics import StatisticsPeriod
+from app.repositories.memory import InMemoryStore, InMemoryUnitOfWork
+from app.schemas.leaderboard import LeaderboardMetric, LeaderboardPeriod
+from app.schemas.runs import RunListResponse
+from app.schemas.statistics import VisualizationResponse
+from app.services.achievement import get_achievement_service
+from app.services.leaderboard import get_leaderboard_service
+from app.services.run import get_run_service
+from app.services.statistics import get_statistics_service
+from bench.data import make_user_dataset
+
+Scenario = Callable[[], Awaitable[Any]]
+
+
+def _make_store(args: argparse.Namespace) -> InMemoryStore:
+    store = InMemoryStore()
+    today = datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    for index in range(args.users):
+        user, runs, goals = make_user_dataset(
+            args.seed,
+            index,
+            "not-a-hash",
+            today,
+            args.alpha,
+            args.min_runs,
+            args.max_runs,
+            args.max_goals,
+            args.route_points,
+        )
+        store.users.insert(user)
+        for run in runs:
+            store.runs.insert(run)
+        for goal in goals:
+            store.goals.insert(goal)
+    return store
+
+
+def _scenarios(store: InMemoryStore, user_uuid) -> dict[str, Scenario]:
+    uow = InMemoryUnitOfWork(store)
+    statistics_service = get_statistics_service()
+    achievement_service = get_achievement_service()
+    leaderboard_service = get_leaderboard_service()
+    run_service = get_run_service()
+    goals = store.goals.group(user_uuid)
+
+    async def visualization(period: StatisticsPeriod) -> VisualizationResponse:
+        data = await statistics_service.get_visualization_data(uow, user_uuid, period)
+        return VisualizationResponse(data=data)
+
+    async def runs_list() -> RunListResponse:
+        runs, total = await run_service.list_runs(
+            uow, user_uuid, limit=100, period=StatisticsPeriod.LAST_YEAR
+        )
+        return RunListResponse(
+            runs=runs, total=total, page=1, limit=100, total_pages=-(-total // 100)
+        )
+
+    return {
+        "statistics": lambda: statistics_service.get_user_statistics(uow, user_uuid),
+        "visualization-30d": lambda: visualization(StatisticsPeriod.LAST_30_DAYS),
+        "visualization-year": lambda: visualization(StatisticsPeriod.LAST_YEAR),
+        "goals-progress": lambda: achievement_service.get_goals_progress(
+            uow, user_uuid, goals
+        ),
+        "check-achievements": lambda: achievement_service.check_and_award_achievements(
+            uow, user_uuid
+        ),
+        "recompute-achievements": lambda: achievement_service.recompute_achievements(
+            uow
+        ),
+        "leaderboard-month": lambda: leaderboard_service.get_leaderboard(
+            uow, LeaderboardMetric.DISTANCE, LeaderboardPeriod.MONTH, user_uuid
+        ),
+        "leaderboard-all-time": lambda: leaderboard_service.get_leaderboard(
+            uow, LeaderboardMetric.RUNS, LeaderboardPeriod.ALL_TIME, user_uuid
+        ),
+        "runs-list": runs_list,
+    }
+
+
+def _serialize(result: Any) -> bytes | None:
+    """Renders a response model like JSONRoute, other results are not responses."""
+    if isinstance(result, BaseModel):
+        return result.model_dump_json().encode()
+    return None
+
+
+async def _measure(
+    scenario: Scenario, iterations: int
+) -> tuple[list[float], list[float] | None]:
+    """Returns microseconds per call of the service and of the serialization."""
+    # Warm up, this also awards the achievements so the checks hit steady state
+    result = await scenario()
+    service_us = []
+    serialization_us = [] if _serialize(result) is not None else None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = await scenario()
+        service_us.append((time.perf_counter() - started) * 1_000_000)
+        if serialization_us is not None:
+            started = time.perf_counter()
+            _serialize(result)
+            serialization_us.append((time.perf_counter() - started) * 1_000_000)
+    return service_us, serialization_us
+
+
+def _parse_args(scenarios: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=scenarios, default=scenarios)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--alpha", type=float, default=1.2)
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=2000)
+    parser.add_argument("--max-goals", type=int, default=3)
+    parser.add_argument("--route-points", type=int, default=60)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = _parse_args(list(_scenarios(InMemoryStore(), None)))
+    store = _make_store(args)
+    # The user with the most runs, the costliest to serve
+    user_uuid = max(store.users.rows, key=lambda uuid_: len(store.runs.group(uuid_)))
+    print(
+        f"{args.users} users, {len(store.runs.rows)} runs, "
+        f"{len(store.runs.group(user_uuid))} of the measured user\n"
+    )
+
+    scenarios = _scenarios(store, user_uuid)
+    print(f"{'scenario':<24}{'service µs':>12}{'p95 µs':>10}{'serialize µs':>14}")
+    for name in args.scenarios:
+        # Recomputing walks all users, a few iterations are enough
+        iterations = (
+            max(args.iterations // 20, 3) if "recompute" in name else args.iterations
+        )
+        service_us, serialization_us = await _measure(scenarios[name], iterations)
+        serialization = (
+            f"{statistics.median(serialization_us):>14.1f}"
+            if serialization_us
+            else f"{'-':>14}"
+        )
+        print(
+            f"{name:<24}{statistics.median(service_us):>12.1f}"
+            f"{statistics.quantiles(service_us, n=20)[-1]:>10.1f}{serialization}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
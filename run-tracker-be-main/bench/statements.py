@@ -0,0 +1,136 @@
+"""
+Measures the CPU spent in SQLAlchemy per execution of the hot queries, comparing
+statements built on every call with the statement templates of the repositories.
+
+Each iteration does what `session.execute` does before talking to the database:
+builds the statement (ad hoc only), generates its cache key and fetches the
+compiled SQL from the compiled cache. No database is needed.
+
+Usage:
+    python -m bench.statements --iterations 20000
+"""
+
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import Select, and_, desc, func, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.util import LRUCache
+
+from app.models import Run, User
+from app.repositories.leaderboard import _leaderboard_statement
+from app.repositories.run import RUN_DATES, STATISTICS, _aggregates_statement
+from app.repositories.user import GET_BY_UUID
+from app.schemas.leaderboard import LeaderboardMetric
+
+USER_UUID = uuid.uuid4()
+START_DATE = datetime.now() - timedelta(days=7)
+
+
+def adhoc_user() -> Select:
+    return select(User).filter_by(uuid=USER_UUID)
+
+
+def adhoc_leaderboard() -> Select:
+    value_expr = func.coalesce(func.sum(Run.distance), 0)
+    join_conditions = [User.uuid == Run.user_uuid, Run.start_time >= START_DATE]
+    return (
+        select(
+            User.uuid.label("user_uuid"),
+            User.username,
+            value_expr.label("value"),
+            func.rank().over(order_by=desc(value_expr)).label("rank"),
+        )
+        .outerjoin(Run, and_(*join_conditions))
+        .group_by(User.uuid, User.username)
+        .order_by(desc("value"))
+        .limit(50)
+    )
+
+
+def adhoc_statistics() -> list[Select]:
+    """The five statements user statistics used to issue."""
+    return [
+        select(
+            func.sum(Run.distance), func.sum(Run.duration), func.count(Run.uuid)
+        ).where(Run.user_uuid == USER_UUID),
+        select(func.max(Run.distance)).where(Run.user_uuid == USER_UUID),
+        select(func.max(Run.duration)).where(Run.user_uuid == USER_UUID),
+        select(func.min(Run.duration / Run.distance)).where(
+            Run.user_uuid == USER_UUID, Run.distance > 0
+        ),
+        select(func.date(Run.start_time))
+        .where(Run.user_uuid == USER_UUID)
+        .distinct()
+        .order_by(desc(func.date(Run.start_time))),
+    ]
+
+
+def adhoc_visualization() -> Select:
+    date_trunc = func.date_trunc("day", Run.start_time)
+    return (
+        select(
+            func.to_char(date_trunc, "YYYY-MM-DD").label("label"),
+            func.sum(Run.distance).label("distance"),
+            func.sum(Run.duration).label("duration"),
+            func.count(Run.uuid).label("count"),
+        )
+        .where(Run.user_uuid == USER_UUID, Run.start_time >= START_DATE)
+        .group_by("label")
+        .order_by("label")
+    )
+
+
+SCENARIOS: dict[str, tuple[Callable[[], list[Select]], Callable[[], list[Select]]]] = {
+    "user by uuid": (lambda: [adhoc_user()], lambda: [GET_BY_UUID]),
+    "leaderboard": (
+        lambda: [adhoc_leaderboard()],
+        lambda: [_leaderboard_statement(LeaderboardMetric.DISTANCE, True, False)],
+    ),
+    "statistics": (adhoc_statistics, lambda: [STATISTICS, RUN_DATES]),
+    "visualization": (
+        lambda: [adhoc_visualization()],
+        lambda: [_aggregates_statement("day", "YYYY-MM-DD")],
+    ),
+}
+
+
+def measure(build: Callable[[], list[Select]], iterations: int) -> float:
+    """Returns CPU microseconds per call."""
+    dialect = PGDialect_asyncpg()
+    compiled_cache = LRUCache(500)
+
+    def run() -> None:
+        for stmt in build():
+            # Same call Connection.execute makes to get the compiled SQL
+            stmt._compile_w_cache(
+                dialect, compiled_cache=compiled_cache, column_keys=[]
+            )
+
+    run()  # warm the compiled cache
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'query':<16}{'ad hoc µs':>12}{'template µs':>14}{'saved µs':>12}")
+    for name, (adhoc, template) in SCENARIOS.items():
+        adhoc_us = measure(adhoc, args.iterations)
+        template_us = measure(template, args.iterations)
+        print(
+            f"{name:<16}{adhoc_us:>12.1f}{template_us:>14.1f}"
+            f"{adhoc_us - template_us:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+#!/bin/sh
+# Clones the primary on the first start and follows it as a hot standby
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_basebackup -h postgres -U "$DB_USER" -D "$PGDATA" -R -X stream; do
+        echo "Waiting for the primary..."
+        sleep 1
+    done
+    chmod 700 "$PGDATA"
+fi
+exec postgres
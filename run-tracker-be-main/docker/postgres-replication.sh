@@ -0,0 +1,4 @@
+#!/bin/sh
+# Allows streaming replication connections, runs on the first start of the primary
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,22 @@
+"""
+Concurrent units of work through PgBouncer in transaction pooling mode, see
+bench/pgbouncer.py. Run with DB_PGBOUNCER=true against the `pgbouncer` compose
+profile.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from bench.pgbouncer import run_clients
+
+pytestmark = [
+    pytest.mark.pgbouncer,
+    pytest.mark.skipif(not settings.db.PGBOUNCER, reason="DB_PGBOUNCER is not set"),
+]
+
+
+def test_concurrent_units_of_work() -> None:
+    errors = asyncio.run(run_clients(clients=20, iterations=50))
+    assert not errors
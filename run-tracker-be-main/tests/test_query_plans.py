@@ -0,0 +1,50 @@
+"""
+Plans of the repositories' per-user queries on a seeded database, see
+bench/query_plans.py. Needs the migrations and bench.seed applied first.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.db import engine
+from bench.query_plans import (
+    CHECKS,
+    MAX_COST,
+    PlanCheck,
+    busiest_user,
+    capture,
+    explain,
+    find_problems,
+    vacuum_analyze,
+)
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict[str, list[dict]]:
+    """Plans of the statements of every check, explained in one event loop."""
+
+    async def explain_all() -> dict[str, list[dict]]:
+        try:
+            await vacuum_analyze()
+            user = await busiest_user()
+            return {
+                check.name: [
+                    await explain(statement, parameters)
+                    for statement, parameters in await capture(check, user)
+                ]
+                for check in CHECKS
+            }
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(explain_all())
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=lambda check: check.name)
+def test_query_plan(plans: dict[str, list[dict]], check: PlanCheck) -> None:
+    assert plans[check.name], "the query ran no SELECT"
+    for plan in plans[check.name]:
+        assert find_problems(check, plan, MAX_COST) == []